@@ -5,4 +5,57 @@ load_dotenv()
 
 DATABASE_URL = os.getenv("DATABASE_URL")
 if not DATABASE_URL:
-    raise ValueError("DATABASE_URL is not set in .env")
\ No newline at end of file
+    raise ValueError("DATABASE_URL is not set in .env")
+
+# How long a compiled curriculum snapshot is served from memory before
+# it is reloaded (covers admin edits made through another worker).
+CURRICULUM_SNAPSHOT_TTL_SECONDS = int(os.getenv("CURRICULUM_SNAPSHOT_TTL_SECONDS", "300"))
+
+# Async request path (asyncpg). Defaults to DATABASE_URL with the driver swapped.
+ASYNC_DATABASE_URL = os.getenv("ASYNC_DATABASE_URL") or DATABASE_URL.replace(
+    "postgresql+psycopg2://", "postgresql+asyncpg://"
+).replace("postgresql://", "postgresql+asyncpg://")
+
+# Cohort (batch) evaluation: process pool size and sessions per task
+COHORT_WORKERS = int(os.getenv("COHORT_WORKERS", str(os.cpu_count() or 1)))
+COHORT_CHUNK_SIZE = int(os.getenv("COHORT_CHUNK_SIZE", "250"))
+
+# Recommendation results kept in memory (LRU entries, 0 disables the cache)
+RECOMMENDATION_CACHE_SIZE = int(os.getenv("RECOMMENDATION_CACHE_SIZE", "2048"))
+
+# Candidate classification engine: "python" (plain loop) or "numpy"
+# (vectorized EligibilityIndex, needs numpy). The loop is faster for a
+# single small curriculum; numpy pays off for large catalogs and batches.
+ELIGIBILITY_ENGINE = os.getenv("ELIGIBILITY_ENGINE", "python").lower()
+
+# Registrar bulk import: rows per transaction, row errors kept in the report
+IMPORT_CHUNK_SIZE = int(os.getenv("IMPORT_CHUNK_SIZE", "5000"))
+IMPORT_MAX_ERRORS = int(os.getenv("IMPORT_MAX_ERRORS", "1000"))
+
+# Connection pools (applied to every engine). DB_STATEMENT_TIMEOUT_MS is
+# sent as the Postgres statement_timeout of each new connection; 0 = none.
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+DB_POOL_TIMEOUT_SECONDS = int(os.getenv("DB_POOL_TIMEOUT_SECONDS", "30"))
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true").lower() in ("1", "true", "yes")
+DB_POOL_RECYCLE_SECONDS = int(os.getenv("DB_POOL_RECYCLE_SECONDS", "1800"))
+DB_STATEMENT_TIMEOUT_MS = int(os.getenv("DB_STATEMENT_TIMEOUT_MS", "0"))
+
+# Optional read replica for read-only endpoints (recommendations, audit,
+# dashboard, roadmap, what-if, cohort batch and forecast). The admin course
+# listing stays on the primary. Clients pass the transcript_version of
+# their last upload as ?min_version= so a lagging replica falls back to
+# the primary. Unset = reads go to DATABASE_URL.
+READ_DATABASE_URL = os.getenv("READ_DATABASE_URL") or None
+ASYNC_READ_DATABASE_URL = os.getenv("ASYNC_READ_DATABASE_URL") or (
+    READ_DATABASE_URL.replace("postgresql+psycopg2://", "postgresql+asyncpg://").replace("postgresql://", "postgresql+asyncpg://")
+    if READ_DATABASE_URL else None
+)
+
+# asyncpg prepares every statement server-side and keeps this many
+# prepared statements per connection (0 disables the cache).
+ASYNC_PREPARED_STATEMENT_CACHE_SIZE = int(os.getenv("ASYNC_PREPARED_STATEMENT_CACHE_SIZE", "256"))
+
+# Responses at least this large (bytes) are gzip-compressed when the
+# client accepts it.
+GZIP_MINIMUM_SIZE = int(os.getenv("GZIP_MINIMUM_SIZE", "1000"))
@@ -1,14 +1,156 @@
-from sqlalchemy import create_engine
+import time
+
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker, declarative_base
-from .config import DATABASE_URL
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
+from .config import (
+    DATABASE_URL,
+    ASYNC_DATABASE_URL,
+    READ_DATABASE_URL,
+    ASYNC_READ_DATABASE_URL,
+    DB_POOL_SIZE,
+    DB_MAX_OVERFLOW,
+    DB_POOL_TIMEOUT_SECONDS,
+    DB_POOL_PRE_PING,
+    DB_POOL_RECYCLE_SECONDS,
+    DB_STATEMENT_TIMEOUT_MS,
+    ASYNC_PREPARED_STATEMENT_CACHE_SIZE,
+)
+from .metrics import statement_name, record_statement
+
+
+def _engine_options(is_async: bool) -> dict:
+    """
+    Pool settings shared by every engine, plus the per-connection
+    statement_timeout in the form the driver expects. Async engines also
+    get asyncpg's prepared statement cache, so the module-level SQL
+    constants are parsed and planned once per pooled connection.
+    """
+    options = {
+        "pool_size": DB_POOL_SIZE,
+        "max_overflow": DB_MAX_OVERFLOW,
+        "pool_timeout": DB_POOL_TIMEOUT_SECONDS,
+        "pool_pre_ping": DB_POOL_PRE_PING,
+        "pool_recycle": DB_POOL_RECYCLE_SECONDS,
+    }
+    connect_args = {}
+    if is_async:
+        connect_args["prepared_statement_cache_size"] = ASYNC_PREPARED_STATEMENT_CACHE_SIZE
+    if DB_STATEMENT_TIMEOUT_MS > 0:
+        if is_async:
+            connect_args["server_settings"] = {"statement_timeout": str(DB_STATEMENT_TIMEOUT_MS)}
+        else:
+            connect_args["options"] = f"-c statement_timeout={DB_STATEMENT_TIMEOUT_MS}"
+    if connect_args:
+        options["connect_args"] = connect_args
+    return options
 
-engine = create_engine(DATABASE_URL, future=True)
+
+engine = create_engine(DATABASE_URL, future=True, **_engine_options(False))
 SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False, future=True)
 Base = declarative_base()
 
+# Async engine for the non-blocking request path
+async_engine = create_async_engine(ASYNC_DATABASE_URL, **_engine_options(True))
+AsyncSessionLocal = async_sessionmaker(bind=async_engine, autoflush=False, expire_on_commit=False, class_=AsyncSession)
+
+# Read-only engines (replica when READ_DATABASE_URL is set, else the primary).
+# Writes (transcripts, concentration, admin edits, imports) never use them.
+read_engine = create_engine(READ_DATABASE_URL, future=True, **_engine_options(False)) if READ_DATABASE_URL else engine
+ReadSessionLocal = sessionmaker(bind=read_engine, autoflush=False, autocommit=False, future=True) if READ_DATABASE_URL else SessionLocal
+async_read_engine = create_async_engine(ASYNC_READ_DATABASE_URL, **_engine_options(True)) if ASYNC_READ_DATABASE_URL else async_engine
+
+# ----------------------------
+# Statement instrumentation
+# ----------------------------
+# Every statement is timed and reported to app.metrics under its
+# query_name execution option (see metrics.statement_name).
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - conn.info["query_start"].pop()
+    options = context.execution_options if context is not None else {}
+    record_statement(statement_name(statement, options), elapsed)
+
+
+def _handle_error(exception_context):
+    starts = exception_context.connection.info.get("query_start") if exception_context.connection is not None else None
+    if starts:
+        starts.pop()
+
+
+for _sync_engine in {engine, async_engine.sync_engine, read_engine, async_read_engine.sync_engine}:
+    event.listen(_sync_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(_sync_engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(_sync_engine, "handle_error", _handle_error)
+
+
 def get_db():
     db = SessionLocal()
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+
+def get_read_db():
+    """
+    Session on the read engine, for endpoints that never write.
+    """
+    db = ReadSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+# ----------------------------
+# Concurrent read helpers
+# ----------------------------
+# A single AsyncSession cannot run statements concurrently, so each helper
+# checks out its own pooled connection. Use them with asyncio.gather to
+# fan independent queries out in parallel. The fetch helpers read from
+# async_read_engine, or from the primary with primary=True (read-your-
+# writes when the replica lags, see session_context). Writes go through
+# the sync sessions.
+
+def _fetch_engine(primary: bool):
+    return async_engine if primary else async_read_engine
+
+
+async def async_fetch_all(stmt, params=None, primary=False):
+    async with _fetch_engine(primary).connect() as conn:
+        result = await conn.execute(stmt, params or {})
+        return result.mappings().all()
+
+
+async def async_fetch_first(stmt, params=None, primary=False):
+    async with _fetch_engine(primary).connect() as conn:
+        result = await conn.execute(stmt, params or {})
+        return result.mappings().first()
+
+
+async def async_fetch_scalar(stmt, params=None, primary=False):
+    async with _fetch_engine(primary).connect() as conn:
+        result = await conn.execute(stmt, params or {})
+        return result.scalar()
+
+
+async def async_fetch_batch(stmts, params=None, primary=False):
+    """
+    {name: rows} for a dict of statements, run one after another on a
+    single pooled connection (for loads too wide to fan out).
+    """
+    async with _fetch_engine(primary).connect() as conn:
+        results = {}
+        for name, stmt in stmts.items():
+            results[name] = (await conn.execute(stmt, params or {})).mappings().all()
+        return results
@@ -1,19 +1,64 @@
-from fastapi import FastAPI, Depends, HTTPException
+import codecs
+from typing import Optional
+from fastapi import FastAPI, Depends, HTTPException, Request, Query, Response
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse, PlainTextResponse, JSONResponse
 from sqlalchemy.orm import Session
-from sqlalchemy import text
+from sqlalchemy import text, bindparam, BigInteger, Integer, Boolean, Text
 from fastapi.middleware.cors import CORSMiddleware
-from app.services.graduation_audit import run_graduation_audit
-from app.services.grading import is_passing
-from .db import get_db
-from .models import AdvisingSession, SessionCourseAttempt
+from fastapi.middleware.gzip import GZipMiddleware
+from app.services.graduation_audit import run_graduation_audit_async
+from .config import GZIP_MINIMUM_SIZE
+from .db import get_db, get_read_db
+from .metrics import MetricsMiddleware, render_metrics
+from .models import AdvisingSession
+from .responses import FastJSONResponse, dumps
 from .schemas import (
     CreateSessionRequest,
     CreateSessionResponse,
     TranscriptRow,
     TrackSelectRequest,
     RecommendationRequest,   # ← added
+    CohortRecommendationRequest,
+    DemandForecastRequest,
+    RoadmapRequest,
+    WhatIfRequest,
+    TermOfferingsUpdate,
+    TranscriptDelta,
+    RecommendationResponse,
+    GraduationAuditResponse,
+    DashboardResponse,
 )
-from .services.advising import build_recommendations
+from .services.advising import build_recommendations_async
+from .services.compact import shape_recommendations, unknown_fields
+from .services.dashboard import build_dashboard_async
+from .services.what_if import simulate_what_if_async
+from .services.term_offerings import (
+    normalize_term,
+    get_term_offerings,
+    invalidate_term_offerings,
+    list_terms,
+    load_term_course_codes,
+    replace_term_offerings,
+    delete_term_offerings,
+)
+from .services.cohort import resolve_cohort_session_ids, load_cohort_inputs, iter_cohort_recommendations
+from .services.demand_forecast import build_demand_forecast
+from .services.planner import build_graduation_roadmap_async
+from .services.course_catalog import (
+    catalog_version,
+    catalog_etag,
+    etag_matches,
+    bump_catalog_version,
+    load_courses_page,
+)
+from .services.curriculum_ranges import resolve_curriculum_id
+from .services.curriculum_snapshot import invalidate_curriculum_snapshots
+from .services.transcript import replace_session_attempts, apply_transcript_delta
+from .services.result_cache import invalidate_recommendation_cache
+from .services.progress_summary import invalidate_progress_for_course
+from .services.grade_ranks import check_grade_rank_consistency
+from .services.registrar_import import RegistrarImport, FORMATS
 
 
 app = FastAPI(title="Curriculum Advisor API")
@@ -25,6 +70,85 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+app.add_middleware(GZipMiddleware, minimum_size=GZIP_MINIMUM_SIZE)
+# added last = outermost: timings include compression
+app.add_middleware(MetricsMiddleware)
+
+
+# ============================================================
+# SQL statements (built once, typed binds)
+# ============================================================
+
+SESSION_CURRICULUM_SQL = text("""
+    SELECT curriculum_id FROM advising_sessions WHERE session_id = :sid
+""").bindparams(
+    bindparam("sid", type_=BigInteger)
+).execution_options(query_name="main.session_curriculum")
+
+GROUP_IN_CURRICULUM_SQL = text("""
+    SELECT 1
+    FROM major_elective_groups
+    WHERE group_id = :gid AND curriculum_id = :cid
+    LIMIT 1
+""").bindparams(
+    bindparam("gid", type_=Integer),
+    bindparam("cid", type_=Integer)
+).execution_options(query_name="main.group_in_curriculum")
+
+UPSERT_CONCENTRATION_SQL = text("""
+    INSERT INTO session_concentration_selection (session_id, group_id)
+    VALUES (:sid, :gid)
+    ON CONFLICT (session_id) DO UPDATE
+    SET group_id = EXCLUDED.group_id,
+        selected_at = NOW()
+""").bindparams(
+    bindparam("sid", type_=BigInteger),
+    bindparam("gid", type_=Integer)
+).execution_options(query_name="main.upsert_concentration")
+
+_COURSE_BINDS = (
+    bindparam("name", type_=Text),
+    bindparam("credits", type_=Integer),
+    bindparam("seminar", type_=Boolean),
+    bindparam("active", type_=Boolean),
+)
+
+INSERT_COURSE_SQL = text("""
+    INSERT INTO courses (
+        course_name,
+        credits,
+        is_ethics_seminar,
+        is_active
+    )
+    VALUES (
+        :name,
+        :credits,
+        :seminar,
+        :active
+    )
+    RETURNING course_id
+""").bindparams(*_COURSE_BINDS).execution_options(query_name="main.insert_course")
+
+UPDATE_COURSE_SQL = text("""
+    UPDATE courses
+    SET
+        course_name = :name,
+        credits = :credits,
+        is_ethics_seminar = :seminar,
+        is_active = :active
+    WHERE course_id = :cid
+""").bindparams(
+    *_COURSE_BINDS,
+    bindparam("cid", type_=Integer)
+).execution_options(query_name="main.update_course")
+
+
+# ----------------------------
+# Metrics (Prometheus text format)
+# ----------------------------
+@app.get("/metrics", response_class=PlainTextResponse)
+def metrics():
+    return PlainTextResponse(render_metrics(), media_type="text/plain; version=0.0.4")
 
 
 # ----------------------------
@@ -32,12 +156,7 @@ app.add_middleware(
 # ----------------------------
 @app.post("/advising-session", response_model=CreateSessionResponse)
 def create_advising_session(payload: CreateSessionRequest, db: Session = Depends(get_db)):
-    curriculum_id = db.execute(text("""
-        SELECT curriculum_id
-        FROM curriculum_id_ranges
-        WHERE :sid BETWEEN id_start AND id_end
-        LIMIT 1
-    """), {"sid": payload.student_id_number}).scalar()
+    curriculum_id = resolve_curriculum_id(payload.student_id_number, db)
 
     if not curriculum_id:
         raise HTTPException(status_code=404, detail="No curriculum found for this student_id_number")
@@ -63,163 +182,73 @@ def upload_transcript(session_id: int, rows: list[TranscriptRow], db: Session =
     if not session_row:
         raise HTTPException(status_code=404, detail="Session not found")
 
-    # Clear previous attempts (optional but recommended)
-    db.execute(
-        text("DELETE FROM session_course_attempts WHERE session_id = :sid"),
-        {"sid": session_id}
+    # Resolve all codes in one query, then replace attempts with one bulk insert
+    result = replace_session_attempts(
+        session_id=session_id,
+        curriculum_id=session_row.curriculum_id,
+        rows=rows,
+        db=db
     )
 
-    total_earned = 0
-
-    for r in rows:
-
-        # 1️⃣ Find course_code_id + official credits + seminar flag
-        course_row = db.execute(text("""
-            SELECT 
-                cc.course_code_id,
-                c.course_id,
-                c.credits,
-                c.is_ethics_seminar
-            FROM course_codes cc
-            JOIN courses c ON c.course_id = cc.course_id
-            WHERE cc.course_code = :code
-        """), {"code": r.course_code}).mappings().first()
-
-        if not course_row:
-
-            free_row = db.execute(text("""
-                SELECT cc.course_code_id, c.credits
-                FROM course_codes cc
-                JOIN courses c ON c.course_id = cc.course_id
-                WHERE cc.course_code = 'FREE_ELECTIVE'
-                LIMIT 1
-            """)).mappings().first()
-
-            if not free_row:
-                raise HTTPException(status_code=500, detail="FREE_ELECTIVE not configured")
-
-            grade = r.grade.strip().upper()
-            earned = 0
-
-            if grade not in ["F", "W", "IP"]:
-                earned = int(free_row["credits"])
-
-            db.add(SessionCourseAttempt(
-                session_id=session_id,
-                course_code_id=free_row["course_code_id"],
-                grade=grade,
-                credits_earned=earned,
-                term=r.term
-            ))
-
-            total_earned += earned
-            continue
-        course_code_id = course_row["course_code_id"]
-        official_credits = int(course_row["credits"])
-        is_seminar = course_row["is_ethics_seminar"]
-
-        grade = r.grade.strip().upper()
-
-        earned = 0
-
-        # 2️⃣ Seminar rule
-        if is_seminar:
-            if grade == "S":
-                earned = 0  # seminar gives 0 credits
-            else:
-                earned = 0
-
-        # 3️⃣ TR always pass
-        elif grade == "TR":
-            earned = official_credits
-
-        # 4️⃣ IP / W / F do not count
-        elif grade in ["IP", "W", "F"]:
-            earned = 0
-
-        # 5️⃣ Normal grade logic (A B C D)
-        else:
-            # get required minimum grade from DB
-            required_row = db.execute(text("""
-                SELECT COALESCE(min_required_grade::text, 'D') AS required_grade
-                FROM curriculum_course_min_grades
-                WHERE curriculum_id = :cid
-                  AND course_id = :course_id
-            """), {
-                "cid": session_row.curriculum_id,
-                "course_id": course_row["course_id"]
-            }).mappings().first()
-
-            required_grade = required_row["required_grade"] if required_row else "D"
-
-            # Use your existing helper
-            if is_passing(grade, required_grade):
-                earned = official_credits
-            else:
-                earned = 0
-
-        # 6️⃣ Store attempt
-        db.add(SessionCourseAttempt(
-            session_id=session_id,
-            course_code_id=course_code_id,
-            grade=grade,
-            credits_earned=earned,
-            term=r.term
-        ))
-
-        total_earned += earned
-
-    # 7️⃣ Update session total credits
-    db.execute(text("""
-        UPDATE advising_sessions
-        SET earned_credits = :total
-        WHERE session_id = :sid
-    """), {
-        "total": total_earned,
-        "sid": session_id
-    })
+    if "error" in result:
+        raise HTTPException(status_code=500, detail=result["error"])
 
     db.commit()
+    invalidate_recommendation_cache(session_id)
 
     return {
         "session_id": session_id,
         "rows_inserted": len(rows),
-        "total_earned_credits": total_earned
+        "total_earned_credits": result["total_earned_credits"],
+        "transcript_version": result["transcript_version"]
     }
 
 
+# Delta upload (e.g. end-of-term grades): only changed attempts are written
+@app.patch("/advising-session/{session_id}/transcript")
+def upload_transcript_delta(session_id: int, payload: TranscriptDelta, db: Session = Depends(get_db)):
+    result = apply_transcript_delta(
+        session_id=session_id,
+        rows=payload.attempts,
+        remove_courses=payload.remove_courses,
+        db=db
+    )
+
+    if "error" in result:
+        db.rollback()
+        if result["error"] == "Session not found":
+            raise HTTPException(status_code=404, detail=result["error"])
+        if "unknown_courses" in result:
+            raise HTTPException(status_code=422, detail=result)
+        status = 500 if result["error"] == "FREE_ELECTIVE not configured" else 400
+        raise HTTPException(status_code=status, detail=result["error"])
+
+    db.commit()
+    if result["rows_upserted"] or result["rows_deleted"]:
+        invalidate_recommendation_cache(session_id)
+
+    return {"session_id": session_id, **result}
+
+
 # ----------------------------
 # Set Concentration
 # ----------------------------
 @app.post("/advising-session/{session_id}/concentration")
 def set_concentration(session_id: int, payload: TrackSelectRequest, db: Session = Depends(get_db)):
-    curriculum_id = db.execute(
-        text("SELECT curriculum_id FROM advising_sessions WHERE session_id = :sid"),
-        {"sid": session_id}
-    ).scalar()
+    curriculum_id = db.execute(SESSION_CURRICULUM_SQL, {"sid": session_id}).scalar()
 
     if not curriculum_id:
         raise HTTPException(status_code=404, detail="Session not found")
 
-    ok = db.execute(text("""
-        SELECT 1
-        FROM major_elective_groups
-        WHERE group_id = :gid AND curriculum_id = :cid
-        LIMIT 1
-    """), {"gid": payload.group_id, "cid": curriculum_id}).scalar()
+    ok = db.execute(GROUP_IN_CURRICULUM_SQL, {"gid": payload.group_id, "cid": curriculum_id}).scalar()
 
     if not ok:
         raise HTTPException(status_code=400, detail="Invalid group_id for this curriculum")
 
-    db.execute(text("""
-        INSERT INTO session_concentration_selection (session_id, group_id)
-        VALUES (:sid, :gid)
-        ON CONFLICT (session_id) DO UPDATE
-        SET group_id = EXCLUDED.group_id,
-            selected_at = NOW()
-    """), {"sid": session_id, "gid": payload.group_id})
+    db.execute(UPSERT_CONCENTRATION_SQL, {"sid": session_id, "gid": payload.group_id})
 
     db.commit()
+    invalidate_recommendation_cache(session_id)
 
     return {
         "session_id": session_id,
@@ -230,31 +259,225 @@ def set_concentration(session_id: int, payload: TrackSelectRequest, db: Session
 # ----------------------------
 # Get Recommendations + Semester Plan
 # ----------------------------
-@app.post("/advising-session/{session_id}/recommendations")
-def get_recommendations(
+def check_recommendation_fields(fields):
+    unknown = unknown_fields(fields)
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(unknown)}")
+
+
+# Full results go through the typed model (serialized by pydantic);
+# compact / field-selected views are returned as FastJSONResponse.
+#
+# Session reads below use the read replica. min_version is the
+# transcript_version returned by the client's last upload: a replica that
+# has not caught up with it is bypassed for the primary.
+@app.post(
+    "/advising-session/{session_id}/recommendations",
+    response_model=RecommendationResponse,
+    response_model_exclude_unset=True
+)
+async def get_recommendations(
     session_id: int,
     payload: RecommendationRequest,
-    db: Session = Depends(get_db)
+    min_version: Optional[int] = Query(None, ge=0)
 ):
-    result = build_recommendations(
+    check_recommendation_fields(payload.fields)
+
+    # async path: independent queries run concurrently on the async read engine
+    result = await build_recommendations_async(
         session_id=session_id,
-        db=db,
         max_credits=payload.max_credits,
-        offered_courses=payload.offered_courses
+        offered_courses=payload.offered_courses,
+        term=payload.term,
+        min_version=min_version
     )
 
     if "error" in result:
         raise HTTPException(status_code=404, detail=result["error"])
 
+    if payload.compact or payload.fields:
+        return FastJSONResponse(shape_recommendations(result, payload.compact, payload.fields))
+
     return result
 
 
+# ----------------------------
+# Path-to-Graduation Roadmap (multi-semester planner)
+# ----------------------------
+@app.post("/advising-session/{session_id}/roadmap")
+async def get_graduation_roadmap(
+    session_id: int,
+    payload: RoadmapRequest,
+    min_version: Optional[int] = Query(None, ge=0)
+):
+    result = await build_graduation_roadmap_async(
+        session_id=session_id,
+        max_credits=payload.max_credits,
+        max_terms=payload.max_terms,
+        min_version=min_version
+    )
+
+    if "error" in result:
+        raise HTTPException(status_code=404, detail=result["error"])
+
+    return FastJSONResponse(result)
+
+
+# ----------------------------
+# Cohort (batch) Recommendations
+# ----------------------------
+@app.post("/advising-sessions/recommendations/batch")
+def get_cohort_recommendations(payload: CohortRecommendationRequest, db: Session = Depends(get_read_db)):
+    if not payload.session_ids and payload.curriculum_id is None:
+        raise HTTPException(status_code=400, detail="Provide session_ids or curriculum_id")
+    check_recommendation_fields(payload.fields)
+
+    sessions = resolve_cohort_session_ids(
+        db,
+        session_ids=payload.session_ids,
+        curriculum_id=payload.curriculum_id,
+        student_id_start=payload.student_id_start,
+        student_id_end=payload.student_id_end
+    )
+    offerings = None
+    if payload.term:
+        offerings = get_term_offerings(payload.term, db)
+        if offerings is None:
+            raise HTTPException(status_code=404, detail="Unknown term")
+
+    inputs = load_cohort_inputs(sessions, db, requested_session_ids=payload.session_ids)
+
+    results = iter_cohort_recommendations(
+        inputs,
+        max_credits=payload.max_credits,
+        offered_courses=payload.offered_courses,
+        offered_course_code_ids=offerings.course_code_ids if offerings else None
+    )
+
+    if payload.compact or payload.fields:
+        results = (shape_recommendations(r, payload.compact, payload.fields) for r in results)
+
+    # NDJSON stream: one line per session as soon as its chunk is done
+    if payload.stream:
+        return StreamingResponse(
+            (dumps(r) + b"\n" for r in results),
+            media_type="application/x-ndjson"
+        )
+
+    results = list(results)
+    return FastJSONResponse({
+        "count": len(results),
+        "results": results
+    })
+
+
+# ----------------------------
+# Course demand forecast (next term)
+# ----------------------------
+@app.post("/admin/curricula/{curriculum_id}/demand-forecast")
+def get_demand_forecast(curriculum_id: int, payload: DemandForecastRequest, db: Session = Depends(get_read_db)):
+    sessions = resolve_cohort_session_ids(
+        db,
+        curriculum_id=curriculum_id,
+        student_id_start=payload.student_id_start,
+        student_id_end=payload.student_id_end
+    )
+    offerings = None
+    if payload.term:
+        offerings = get_term_offerings(payload.term, db)
+        if offerings is None:
+            raise HTTPException(status_code=404, detail="Unknown term")
+
+    forecast = build_demand_forecast(
+        load_cohort_inputs(sessions, db),
+        max_credits=payload.max_credits,
+        offered_courses=payload.offered_courses,
+        offered_course_code_ids=offerings.course_code_ids if offerings else None
+    )
+    return FastJSONResponse({
+        "curriculum_id": curriculum_id,
+        "term": offerings.term if offerings else None,
+        **forecast
+    })
+
+
 # ----------------------------
 # Graduation Audit
 # ----------------------------
-@app.get("/advising-session/{session_id}/graduation-audit")
-def graduation_audit(session_id: int, db: Session = Depends(get_db)):
-    return run_graduation_audit(session_id=session_id, db=db)
+@app.get(
+    "/advising-session/{session_id}/graduation-audit",
+    response_model=GraduationAuditResponse,
+    response_model_exclude_unset=True
+)
+async def graduation_audit(session_id: int, min_version: Optional[int] = Query(None, ge=0)):
+    result = await run_graduation_audit_async(session_id=session_id, min_version=min_version)
+
+    # unknown sessions answer {"error": ...} with 200 (as before the model)
+    if "error" in result:
+        return JSONResponse(result)
+
+    return result
+
+
+# ----------------------------
+# What-if simulation (no writes)
+# ----------------------------
+@app.post("/advising-session/{session_id}/what-if")
+async def simulate_what_if(
+    session_id: int,
+    payload: WhatIfRequest,
+    min_version: Optional[int] = Query(None, ge=0)
+):
+    result = await simulate_what_if_async(
+        session_id=session_id,
+        changes=payload.attempts,
+        remove_courses=payload.remove_courses,
+        max_credits=payload.max_credits,
+        offered_courses=payload.offered_courses,
+        term=payload.term,
+        min_version=min_version
+    )
+
+    if "error" in result:
+        status = 500 if result["error"] == "FREE_ELECTIVE not configured" else 404
+        raise HTTPException(status_code=status, detail=result["error"])
+
+    return FastJSONResponse(result)
+
+
+# ----------------------------
+# Student Dashboard (recommendations + audit, one data load)
+# ----------------------------
+@app.post(
+    "/advising-session/{session_id}/dashboard",
+    response_model=DashboardResponse,
+    response_model_exclude_unset=True
+)
+async def get_dashboard(
+    session_id: int,
+    payload: RecommendationRequest,
+    min_version: Optional[int] = Query(None, ge=0)
+):
+    check_recommendation_fields(payload.fields)
+
+    result = await build_dashboard_async(
+        session_id=session_id,
+        max_credits=payload.max_credits,
+        offered_courses=payload.offered_courses,
+        term=payload.term,
+        min_version=min_version
+    )
+
+    if "error" in result:
+        raise HTTPException(status_code=404, detail=result["error"])
+
+    if payload.compact or payload.fields:
+        return FastJSONResponse({
+            **result,
+            "recommendations": shape_recommendations(result["recommendations"], payload.compact, payload.fields)
+        })
+
+    return result
 
 # ============================================================
 # ADMIN COURSE CRUD
@@ -286,20 +509,29 @@ class CourseUpdate(BaseModel):
 # Get All Courses
 # ----------------------------
 
+# stays on the primary: the admin page reloads it right after an edit.
+# Keyset pages (after = last course_id seen); the ETag is the catalog
+# version, so an unchanged catalog answers 304 without reading courses.
 @app.get("/admin/courses")
-def get_all_courses(db: Session = Depends(get_db)):
-    rows = db.execute(text("""
-        SELECT 
-            course_id,
-            course_name,
-            credits,
-            is_ethics_seminar,
-            is_active
-        FROM courses
-        ORDER BY course_id
-    """)).mappings().all()
+def get_all_courses(
+    request: Request,
+    after: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=500),
+    active: Optional[bool] = None,
+    seminar: Optional[bool] = None,
+    q: Optional[str] = None,
+    db: Session = Depends(get_db)
+):
+    version = catalog_version(db)
+    etag = catalog_etag(version)
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
 
-    return rows
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+
+    page = load_courses_page(db, after=after, limit=limit, active=active, seminar=seminar, prefix=q)
+
+    return JSONResponse({"catalog_version": version, **page}, headers=headers)
 
 
 # ----------------------------
@@ -308,28 +540,17 @@ def get_all_courses(db: Session = Depends(get_db)):
 
 @app.post("/admin/courses")
 def create_course(payload: CourseCreate, db: Session = Depends(get_db)):
-    new_id = db.execute(text("""
-        INSERT INTO courses (
-            course_name,
-            credits,
-            is_ethics_seminar,
-            is_active
-        )
-        VALUES (
-            :name,
-            :credits,
-            :seminar,
-            :active
-        )
-        RETURNING course_id
-    """), {
+    new_id = db.execute(INSERT_COURSE_SQL, {
         "name": payload.course_name,
         "credits": payload.credits,
         "seminar": payload.is_ethics_seminar,
         "active": payload.is_active
     }).scalar()
+    bump_catalog_version(db)
 
     db.commit()
+    invalidate_curriculum_snapshots()
+    invalidate_recommendation_cache()
 
     return {
         "message": "Course created successfully",
@@ -343,15 +564,7 @@ def create_course(payload: CourseCreate, db: Session = Depends(get_db)):
 
 @app.put("/admin/courses/{course_id}")
 def update_course(course_id: int, payload: CourseUpdate, db: Session = Depends(get_db)):
-    db.execute(text("""
-        UPDATE courses
-        SET
-            course_name = :name,
-            credits = :credits,
-            is_ethics_seminar = :seminar,
-            is_active = :active
-        WHERE course_id = :cid
-    """), {
+    db.execute(UPDATE_COURSE_SQL, {
         "cid": course_id,
         "name": payload.course_name,
         "credits": payload.credits,
@@ -359,6 +572,93 @@ def update_course(course_id: int, payload: CourseUpdate, db: Session = Depends(g
         "active": payload.is_active
     })
 
+    # credits / seminar flag feed the stored progress summaries
+    invalidate_progress_for_course(course_id, db)
+    bump_catalog_version(db)
+
+    db.commit()
+    invalidate_curriculum_snapshots()
+    invalidate_recommendation_cache()
+
+    return {"message": "Course updated successfully"}
+
+
+# ----------------------------
+# Term Offerings (term -> offered course codes)
+# ----------------------------
+
+@app.get("/admin/term-offerings")
+def get_terms(db: Session = Depends(get_db)):
+    return list_terms(db)
+
+
+@app.get("/admin/term-offerings/{term:path}")
+def get_term_offering_codes(term: str, db: Session = Depends(get_db)):
+    codes = load_term_course_codes(term, db)
+    if not codes:
+        raise HTTPException(status_code=404, detail="Unknown term")
+
+    return {"term": normalize_term(term), "course_codes": codes}
+
+
+@app.put("/admin/term-offerings/{term:path}")
+def put_term_offerings(term: str, payload: TermOfferingsUpdate, db: Session = Depends(get_db)):
+    result = replace_term_offerings(term, payload.course_codes, db)
+
+    if "error" in result:
+        db.rollback()
+        raise HTTPException(status_code=400, detail=result)
+
+    db.commit()
+    invalidate_term_offerings(term)
+
+    return result
+
+
+@app.delete("/admin/term-offerings/{term:path}")
+def remove_term_offerings(term: str, db: Session = Depends(get_db)):
+    removed = delete_term_offerings(term, db)
+    if not removed:
+        raise HTTPException(status_code=404, detail="Unknown term")
+
     db.commit()
+    invalidate_term_offerings(term)
+
+    return {"term": normalize_term(term), "removed": removed}
+
+
+# ----------------------------
+# Grading consistency (Python is_passing vs grade_is_passing() in SQL)
+# ----------------------------
+
+@app.get("/admin/grading/consistency")
+def grading_consistency(sample_sessions: int = Query(50, ge=0, le=500), db: Session = Depends(get_read_db)):
+    return check_grade_rank_consistency(db, sample_sessions=sample_sessions)
+
+
+# ----------------------------
+# Registrar Bulk Import (CSV / NDJSON body, streamed)
+# ----------------------------
+
+@app.post("/admin/registrar-import")
+async def registrar_import(request: Request, format: str | None = None):
+    content_type = request.headers.get("content-type", "")
+    fmt = format or ("ndjson" if "ndjson" in content_type or "jsonl" in content_type else "csv")
+    if fmt not in FORMATS:
+        raise HTTPException(status_code=400, detail=f"format must be one of {list(FORMATS)}")
+
+    importer = RegistrarImport(fmt)
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    buffer = ""
+
+    # body is consumed as it arrives; full chunks are written off the event loop
+    async for data in request.stream():
+        buffer += decoder.decode(data)
+        *lines, buffer = buffer.split("\n")
+        if importer.feed_lines(lines):
+            await run_in_threadpool(importer.flush)
+
+    buffer += decoder.decode(b"", final=True)
+    importer.feed_lines(buffer.split("\n"))
 
-    return {"message": "Course updated successfully"}
\ No newline at end of file
+    return await run_in_threadpool(importer.finish)
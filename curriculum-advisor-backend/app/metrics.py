@@ -0,0 +1,215 @@
+# app/metrics.py
+
+from __future__ import annotations
+
+import re
+import threading
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Optional, Dict, List, Tuple
+
+
+# ============================================================
+# In-process metrics (Prometheus text exposition, no client library)
+# ============================================================
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+STATEMENT_COUNT_BUCKETS = (0, 1, 2, 4, 8, 16, 32, 64, 128, 256)
+
+
+class Histogram:
+    """
+    Cumulative-bucket histogram; one instance per label set.
+    """
+
+    def __init__(self, buckets: Tuple[float, ...]):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def lines(self, name: str, labels: str) -> List[str]:
+        out = []
+        running = 0
+        for bound, n in zip(self.buckets, self.counts):
+            running += n
+            out.append(f'{name}_bucket{{{labels},le="{bound:g}"}} {running}')
+        out.append(f'{name}_bucket{{{labels},le="+Inf"}} {self.count}')
+        out.append(f"{name}_sum{{{labels}}} {self.sum:.6f}")
+        out.append(f"{name}_count{{{labels}}} {self.count}")
+        return out
+
+
+@dataclass
+class RequestStats:
+    """
+    SQL activity of the request currently being served (set per request).
+    """
+    statements: int = 0
+    db_seconds: float = 0.0
+    slowest_seconds: float = 0.0
+    slowest_name: str = ""
+
+
+_current: ContextVar[Optional[RequestStats]] = ContextVar("request_stats", default=None)
+_lock = threading.Lock()
+
+_request_latency: Dict[str, Histogram] = {}
+_request_statements: Dict[str, Histogram] = {}
+_request_db_seconds: Dict[str, Histogram] = {}
+# endpoint -> (seconds, query name) of the slowest statement seen
+_slowest_statement: Dict[str, Tuple[float, str]] = {}
+_statement_seconds: Dict[str, Histogram] = {}
+_responses: Dict[Tuple[str, int], int] = {}
+
+
+# ----------------------------
+# Statement names
+# ----------------------------
+# Statements are tagged with text(...).execution_options(query_name="...");
+# anything untagged (ORM queries) gets "<verb>:<first table>".
+
+_TABLE = re.compile(r"\b(?:FROM|INTO|UPDATE)\s+([A-Za-z_][A-Za-z0-9_.]*)", re.IGNORECASE)
+_fallback_names: Dict[str, str] = {}
+
+
+def statement_name(statement: str, execution_options) -> str:
+    name = execution_options.get("query_name")
+    if name:
+        return name
+
+    cached = _fallback_names.get(statement)
+    if cached:
+        return cached
+
+    words = statement.split(None, 1)
+    m = _TABLE.search(statement)
+    name = f"{words[0].lower() if words else 'other'}:{m.group(1).lower() if m else '-'}"
+    if len(_fallback_names) < 1000:
+        _fallback_names[statement] = name
+    return name
+
+
+def record_statement(name: str, seconds: float) -> None:
+    """
+    Called from the engine hooks in db.py after every statement.
+    """
+    with _lock:
+        hist = _statement_seconds.get(name)
+        if hist is None:
+            hist = _statement_seconds[name] = Histogram(LATENCY_BUCKETS)
+        hist.observe(seconds)
+
+    stats = _current.get()
+    if stats is not None:
+        stats.statements += 1
+        stats.db_seconds += seconds
+        if seconds > stats.slowest_seconds:
+            stats.slowest_seconds = seconds
+            stats.slowest_name = name
+
+
+def record_request(endpoint: str, status: int, seconds: float, stats: RequestStats) -> None:
+    with _lock:
+        for registry, buckets, value in (
+            (_request_latency, LATENCY_BUCKETS, seconds),
+            (_request_statements, STATEMENT_COUNT_BUCKETS, stats.statements),
+            (_request_db_seconds, LATENCY_BUCKETS, stats.db_seconds),
+        ):
+            hist = registry.get(endpoint)
+            if hist is None:
+                hist = registry[endpoint] = Histogram(buckets)
+            hist.observe(value)
+
+        if stats.slowest_seconds > _slowest_statement.get(endpoint, (0.0, ""))[0]:
+            _slowest_statement[endpoint] = (stats.slowest_seconds, stats.slowest_name)
+
+        _responses[(endpoint, status)] = _responses.get((endpoint, status), 0) + 1
+
+
+# ----------------------------
+# ASGI middleware
+# ----------------------------
+
+class MetricsMiddleware:
+    """
+    Times every HTTP request, counts its SQL statements and adds a
+    Server-Timing header (db, total). Endpoints are labelled by route
+    template, e.g. "POST /advising-session/{session_id}/recommendations".
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats()
+        token = _current.set(stats)
+        start = time.perf_counter()
+        status = 500
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                elapsed = time.perf_counter() - start
+                timing = f"db;dur={stats.db_seconds * 1000:.2f};desc=\"{stats.statements} statements\", app;dur={elapsed * 1000:.2f}"
+                message["headers"] = list(message.get("headers", [])) + [(b"server-timing", timing.encode())]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            route = scope.get("route")
+            path = getattr(route, "path", None) or "unmatched"
+            record_request(f"{scope['method']} {path}", status, time.perf_counter() - start, stats)
+            _current.reset(token)
+
+
+# ----------------------------
+# Exposition
+# ----------------------------
+
+def _label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def render_metrics() -> str:
+    out: List[str] = []
+
+    def histograms(name: str, help_text: str, label: str, registry: Dict[str, Histogram]):
+        out.append(f"# HELP {name} {help_text}")
+        out.append(f"# TYPE {name} histogram")
+        for key, hist in sorted(registry.items()):
+            out.extend(hist.lines(name, f'{label}="{_label(key)}"'))
+
+    with _lock:
+        histograms("advisor_request_duration_seconds", "End-to-end request latency.", "endpoint", _request_latency)
+        histograms("advisor_request_db_statements", "SQL statements executed per request.", "endpoint", _request_statements)
+        histograms("advisor_request_db_duration_seconds", "Summed SQL time per request (exceeds wall time when queries run concurrently).", "endpoint", _request_db_seconds)
+
+        out.append("# HELP advisor_request_slowest_statement_seconds Slowest SQL statement seen per endpoint.")
+        out.append("# TYPE advisor_request_slowest_statement_seconds gauge")
+        for endpoint, (seconds, name) in sorted(_slowest_statement.items()):
+            out.append(
+                f'advisor_request_slowest_statement_seconds{{endpoint="{_label(endpoint)}",query_name="{_label(name)}"}} {seconds:.6f}'
+            )
+
+        out.append("# HELP advisor_responses_total Responses by endpoint and status.")
+        out.append("# TYPE advisor_responses_total counter")
+        for (endpoint, status), n in sorted(_responses.items()):
+            out.append(f'advisor_responses_total{{endpoint="{_label(endpoint)}",status="{status}"}} {n}')
+
+        histograms("advisor_db_statement_duration_seconds", "SQL statement latency by query name.", "query_name", _statement_seconds)
+
+    return "\n".join(out) + "\n"
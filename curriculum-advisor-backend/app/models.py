@@ -1,4 +1,5 @@
-from sqlalchemy import Column, BigInteger, Integer, Text, TIMESTAMP
+from sqlalchemy import Column, BigInteger, Boolean, Integer, Text, TIMESTAMP
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.sql import func
 from .db import Base
 
@@ -12,6 +13,8 @@ class AdvisingSession(Base):
     curriculum_id = Column(Integer, nullable=False, index=True)
 
     earned_credits = Column(Integer, nullable=False, server_default="0")
+    # bumped whenever the session's attempts are rewritten (cache key)
+    transcript_version = Column(BigInteger, nullable=False, server_default="0")
     notes = Column(Text, nullable=True)
 
 
@@ -36,4 +39,34 @@ class SessionConcentrationSelection(Base):
     session_id = Column(BigInteger, primary_key=True)
     group_id = Column(Integer, nullable=False)
 
-    selected_at = Column(TIMESTAMP(timezone=True), server_default=func.now(), nullable=False)
\ No newline at end of file
+    selected_at = Column(TIMESTAMP(timezone=True), server_default=func.now(), nullable=False)
+
+
+class SessionProgressSummary(Base):
+    __tablename__ = "session_progress_summary"
+
+    session_id = Column(BigInteger, primary_key=True)
+    # advising_sessions.transcript_version this summary was computed from
+    transcript_version = Column(BigInteger, nullable=False, server_default="0")
+
+    earned_credits = Column(Integer, nullable=False, server_default="0")
+    earned_by_category = Column(JSONB, nullable=False, server_default="{}")
+    earned_by_subcategory = Column(JSONB, nullable=False, server_default="{}")
+    seminars_completed = Column(Integer, nullable=False, server_default="0")
+
+    updated_at = Column(TIMESTAMP(timezone=True), server_default=func.now(), nullable=False)
+
+
+class TermOffering(Base):
+    __tablename__ = "term_offerings"
+
+    term = Column(Text, primary_key=True)
+    course_code_id = Column(Integer, primary_key=True)
+
+
+class CourseCatalogVersion(Base):
+    __tablename__ = "course_catalog_version"
+
+    # single row; bumped by every course create / update (ETag of /admin/courses)
+    singleton = Column(Boolean, primary_key=True, server_default="true")
+    version = Column(BigInteger, nullable=False, server_default="0")
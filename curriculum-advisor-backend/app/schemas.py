@@ -1,5 +1,5 @@
-from pydantic import BaseModel
-from typing import List, Optional
+from pydantic import BaseModel, Field
+from typing import List, Optional, Union
 
 class CreateSessionRequest(BaseModel):
     student_id_number: int
@@ -14,9 +14,162 @@ class TranscriptRow(BaseModel):
     credits_earned: int = 0
     term: str | None = None
 
+class RegistrarRow(TranscriptRow):
+    # one line of a registrar grade dump (CSV / NDJSON)
+    student_id_number: int
+
 class TrackSelectRequest(BaseModel):
     group_id: int
 
 class RecommendationRequest(BaseModel):
     max_credits: Optional[int] = 15
-    offered_courses: Optional[List[str]] = None
\ No newline at end of file
+    offered_courses: Optional[List[str]] = None
+    # restrict candidates to a term's offering catalog (e.g. "1/2025")
+    term: Optional[str] = None
+    # compact: course details once in "courses", buckets list course codes
+    compact: bool = False
+    # top-level recommendation fields to return (session_id always is),
+    # e.g. ["next_semester_plan"]
+    fields: Optional[List[str]] = None
+
+class CohortRecommendationRequest(BaseModel):
+    # either explicit sessions ...
+    session_ids: Optional[List[int]] = None
+    # ... or a curriculum plus a student ID range (defaults to curriculum_id_ranges)
+    curriculum_id: Optional[int] = None
+    student_id_start: Optional[int] = None
+    student_id_end: Optional[int] = None
+
+    max_credits: int = Field(15, ge=0, le=30)
+    offered_courses: Optional[List[str]] = None
+    term: Optional[str] = None
+    stream: bool = False
+    compact: bool = False
+    fields: Optional[List[str]] = None
+
+class DemandForecastRequest(BaseModel):
+    # every student of the curriculum (latest session), optionally narrowed
+    # to a student ID range (defaults to curriculum_id_ranges)
+    student_id_start: Optional[int] = None
+    student_id_end: Optional[int] = None
+
+    max_credits: int = Field(15, ge=0, le=30)
+    offered_courses: Optional[List[str]] = None
+    term: Optional[str] = None
+
+class WhatIfRequest(BaseModel):
+    # hypothetical rows applied on top of the stored attempts (same course
+    # code = override), never written
+    attempts: List[TranscriptRow] = []
+    remove_courses: Optional[List[str]] = None
+    max_credits: int = Field(15, ge=0, le=30)
+    offered_courses: Optional[List[str]] = None
+    term: Optional[str] = None
+
+class TranscriptDelta(BaseModel):
+    # upserted by course code (one attempt per code); unchanged rows are
+    # not rewritten, so retrying the same delta is a no-op
+    attempts: List[TranscriptRow] = []
+    remove_courses: Optional[List[str]] = None
+
+class TermOfferingsUpdate(BaseModel):
+    course_codes: List[str]
+
+class RoadmapRequest(BaseModel):
+    max_credits: int = Field(15, ge=0, le=30)
+    max_terms: int = Field(12, ge=1, le=24)
+
+
+# ----------------------------
+# Response models (recommendations / audit)
+# ----------------------------
+# Endpoints using them set response_model_exclude_unset, so keys the
+# engines leave out (e.g. Major Electives tracks) stay out of the JSON.
+
+class CourseItem(BaseModel):
+    course_code: str
+    course_name: Optional[str] = None
+    credits: int
+
+class CourseBuckets(BaseModel):
+    eligible: List[CourseItem] = []
+    blocked_by_prerequisite: List[CourseItem] = []
+    blocked_by_credit_requirement: List[CourseItem] = []
+    already_completed: List[CourseItem] = []
+
+class MajorElectiveBuckets(BaseModel):
+    # set (without tracks) when no concentration is selected
+    message: Optional[str] = None
+    chosen_track: Optional[CourseBuckets] = None
+    other_tracks: Optional[CourseBuckets] = None
+    open_pool: CourseBuckets
+
+class EligibleBySubcategory(BaseModel):
+    other_specialized: Optional[CourseBuckets] = Field(None, alias="Other Specialized Courses")
+    major_electives: Optional[MajorElectiveBuckets] = Field(None, alias="Major Electives")
+
+class ElectiveProgress(BaseModel):
+    track_status: str
+    chosen_group_id: Optional[int] = None
+    min_from_chosen_group: int
+    min_from_all_groups: int
+    chosen_group_completed: int
+    all_groups_completed: int
+    chosen_group_remaining: int
+    all_groups_remaining: int
+
+class PlannedCourse(BaseModel):
+    course_code: str
+    course_name: Optional[str] = None
+    credits: int
+    source: str
+
+class NextSemesterPlan(BaseModel):
+    max_credits: int
+    total_credits: int
+    recommended_courses: List[PlannedCourse]
+    notes: List[str]
+
+class RecommendationResponse(BaseModel):
+    session_id: int
+    curriculum_id: int
+    earned_credits: int
+    passed_course_codes: List[str]
+    failed_course_codes: List[str]
+    elective_progress: Optional[ElectiveProgress] = None
+    elective_priority: Optional[str] = None
+    eligible_specialized_by_subcategory: EligibleBySubcategory
+    next_semester_plan: NextSemesterPlan
+
+class CreditAudit(BaseModel):
+    earned_credits: int
+    required_credits: int
+    remaining_credits: int
+    percentage_completed: Union[int, float]
+    status: str
+
+class CategoryAudit(BaseModel):
+    main_category: str
+    required_credits: int
+    earned_credits: int
+    remaining_credits: int
+    status: str
+
+class SeminarAudit(BaseModel):
+    required_total: int
+    completed: int
+    remaining: int
+    status: str
+
+class GraduationAuditResponse(BaseModel):
+    session_id: int
+    curriculum_id: int
+    credit_audit: CreditAudit
+    main_category_audit: List[CategoryAudit]
+    seminar_audit: SeminarAudit
+    graduation_status: str
+
+class DashboardResponse(BaseModel):
+    session_id: int
+    recommendations: RecommendationResponse
+    graduation_audit: GraduationAuditResponse
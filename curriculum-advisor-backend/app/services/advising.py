@@ -3,11 +3,16 @@
 from __future__ import annotations
 
 from sqlalchemy.orm import Session
-from sqlalchemy import text
-import re
-from typing import Optional, Dict, Any, List
+from sqlalchemy import text, bindparam, BigInteger
+from typing import Optional, Dict, Any, List, Tuple, AbstractSet
 
 from .grading import is_passing
+from .curriculum_snapshot import CurriculumSnapshot, get_curriculum_snapshot
+from .seminars import SeminarProgress, load_seminar_progress
+from .session_context import SessionContext, load_session_context_async
+from .transcript import SESSION_SQL, load_session_attempts
+from .term_offerings import get_term_offerings_async
+from .result_cache import recommendation_cache_key, get_cached_recommendations, store_recommendations
 
 
 # ============================================================
@@ -17,12 +22,14 @@ from .grading import is_passing
 def build_next_semester_plan(
     eligible_by_subcat: dict,
     elective_priority: Optional[str],
-    max_credits: int = 18
+    max_credits: int = 18,
+    course_rank: Optional[Dict[str, Tuple[int, int]]] = None
 ) -> dict:
     """
     Soft enforcement planner:
     - Always show a plan (even if electives not selected)
     - Uses priority to pick elective buckets earlier or later
+    - Inside a bucket, courses that unblock the most come first (course_rank)
     - Never exceeds max_credits
     """
 
@@ -33,6 +40,9 @@ def build_next_semester_plan(
 
     def add_from(items: List[dict], source: str):
         nonlocal total_credits
+        if course_rank:
+            # stable sort: ties keep display order
+            items = sorted(items, key=lambda c: course_rank.get(c.get("course_code"), (0, 0)), reverse=True)
         for c in items:
             code = c.get("course_code")
             credits = int(c.get("credits", 0))
@@ -123,328 +133,130 @@ def get_next_ethics_seminar(session_id: int, db: Session) -> Optional[dict]:
     - Only grade 'S' counts as completed.
     - 'W' and 'F' are NOT completed.
     """
-    # All seminar course codes in order (BG14030 ..)
-    seminars = db.execute(text("""
-        SELECT
-            cc.course_code,
-            c.course_name,
-            c.credits
-        FROM courses c
-        JOIN course_codes cc ON cc.course_id = c.course_id
-        WHERE c.is_ethics_seminar = TRUE
-          AND c.is_active = TRUE
-          AND cc.is_active = TRUE
-        ORDER BY cc.course_code
-    """)).mappings().all()
-
-    if not seminars:
-        return None
-
-    # Find first seminar NOT completed with grade 'S'
-    for s in seminars:
-        completed = db.execute(text("""
-            SELECT 1
-            FROM session_course_attempts a
-            JOIN course_codes cc ON cc.course_code_id = a.course_code_id
-            JOIN courses c ON c.course_id = cc.course_id
-            WHERE a.session_id = :sid
-              AND c.is_ethics_seminar = TRUE
-              AND cc.course_code = :code
-              AND a.grade IN ('S', 'IP')
-            LIMIT 1
-        """), {"sid": session_id, "code": s["course_code"]}).scalar()
-
-        if not completed:
-            return {
-                "course_code": s["course_code"],
-                "course_name": s["course_name"],
-                "credits": int(s["credits"]),  # should be 0
-                "source": "Professional Ethics Seminar (Required)"
-            }
-
-    # All completed
-    return None
+    return load_seminar_progress(session_id, db).next_seminar()
 
 # ============================================================
-# Main recommendation builder
+# Candidate classification (shared with the multi-term planner)
 # ============================================================
 
-def build_recommendations(
-    session_id: int,
-    db: Session,
-    max_credits: int = 18,
-    offered_courses: Optional[List[str]] = None
-) -> Dict[str, Any]:
-    # load session
-    s = db.execute(
-        text("SELECT session_id, curriculum_id FROM advising_sessions WHERE session_id = :sid"),
-        {"sid": session_id}
-    ).mappings().first()
-
-    if not s:
-        return {"error": "Session not found"}
-
-    curriculum_id = int(s["curriculum_id"])
-
-    # attempts + required grade
-    attempts = db.execute(text("""
-        SELECT
-            a.attempt_id,
-            a.grade,
-            a.course_code_id,
-            cc.course_code,
-            c.course_id,
-            c.credits,
-            COALESCE(mg.min_required_grade::text, 'D') AS required_grade
-        FROM session_course_attempts a
-        JOIN course_codes cc ON cc.course_code_id = a.course_code_id
-        JOIN courses c ON c.course_id = cc.course_id
-        LEFT JOIN curriculum_course_min_grades mg
-            ON mg.curriculum_id = :cid AND mg.course_id = c.course_id
-        WHERE a.session_id = :sid
-        ORDER BY a.attempt_id
-    """), {"sid": session_id, "cid": curriculum_id}).mappings().all()
-
-    passed_course_ids = set()
-    passed_codes = set()
-    failed_codes = set()
-    passed_course_code_ids = set()
-    in_progress_course_ids = set()
-    in_progress_course_code_ids = set()
-
-    for row in attempts:
-        grade = row["grade"].strip().upper()
-
-        # --- IP handling ---
-        if grade == "IP":
-            in_progress_course_ids.add(int(row["course_id"]))
-            in_progress_course_code_ids.add(int(row["course_code_id"]))
-            continue
-
-        # --- Normal pass/fail handling ---
-        ok = is_passing(row["grade"], row["required_grade"])
-
-        if ok:
-            passed_course_ids.add(int(row["course_id"]))
-            passed_codes.add(row["course_code"])
-            passed_course_code_ids.add(int(row["course_code_id"]))
-        else:
-            failed_codes.add(row["course_code"])
-
-    # earned credits = sum credits of unique passed courses
-    earned_row = db.execute(text("""
-        SELECT COALESCE(SUM(a.credits_earned), 0) AS earned_credits
-        FROM session_course_attempts a
-        WHERE a.session_id = :sid
-            AND a.credits_earned > 0
-    """), {"sid": session_id}).mappings().first()
-
-    earned_credits = int(earned_row["earned_credits"])
-    
-    # --------------------------------------------------------
-    # Load main category required credits (GE, FE)
-    # --------------------------------------------------------
-    required_by_category = {}
-
-    required_rows = db.execute(text("""
-        SELECT 
-            mc.main_category_id,
-            mc.name AS main_category,
-            cmc.required_credits
-        FROM curriculum_main_categories cmc
-        JOIN main_categories mc 
-            ON mc.main_category_id = cmc.main_category_id
-        WHERE cmc.curriculum_id = :cid
-    """), {"cid": curriculum_id}).mappings().all()
-
-    for row in required_rows:
-        required_by_category[row["main_category"]] = int(row["required_credits"])
-
-    earned_by_category = {}
-
-    category_credit_rows = db.execute(text("""
-        SELECT 
-            mc.name AS main_category,
-            COALESCE(SUM(a.credits_earned), 0) AS earned_credits 
-        FROM session_course_attempts a
-        JOIN course_codes cc ON cc.course_code_id = a.course_code_id
-        JOIN courses c ON c.course_id = cc.course_id
-        JOIN subcategory_course_codes sc ON sc.course_code_id = cc.course_code_id
-        JOIN curriculum_subcategories sub ON sub.subcategory_id = sc.subcategory_id
-        JOIN main_categories mc ON mc.main_category_id = sub.main_category_id
-        WHERE a.session_id = :sid
-          AND sub.curriculum_id = :cid
-          AND a.credits_earned > 0
-        GROUP BY mc.name
-    """), {"sid": session_id, "cid": curriculum_id}).mappings().all()
-
-    for row in category_credit_rows:
-        earned_by_category[row["main_category"]] = int(row["earned_credits"])
+def offered_candidate_positions(
+    snapshot: CurriculumSnapshot,
+    offered_courses: Optional[List[str]] = None,
+    offered_course_code_ids: Optional[AbstractSet[int]] = None
+) -> Optional[List[int]]:
+    """
+    Positions (in snapshot.candidates) of the offered candidates, via the
+    snapshot's code indexes. offered_courses is the free-form code list,
+    offered_course_code_ids a term's catalog; both given = intersection.
+    None = no filter.
+    """
+    if not offered_courses and offered_course_code_ids is None:
+        return None
 
-    ge_remaining = max(
-        0,
-        required_by_category.get("General Education", 0)
-        - earned_by_category.get("General Education", 0)
-    )
+    positions: Optional[set] = None
 
-    fe_remaining = max(
-        0,
-        required_by_category.get("Free Electives", 0)
-        - earned_by_category.get("Free Electives", 0)
-    )
+    if offered_courses:
+        by_code = snapshot.candidate_positions_by_code
+        positions = {
+            p
+            for code in set(code.strip().upper() for code in offered_courses)
+            for p in by_code.get(code, ())
+        }
 
-    # Major elective subcategory (if exists)
-    elective_subcat = db.execute(text("""
-        SELECT subcategory_id, name
-        FROM curriculum_subcategories
-        WHERE curriculum_id = :cid AND name ILIKE '%Major Elective%'
-        LIMIT 1
-    """), {"cid": curriculum_id}).mappings().first()
-    elective_subcategory_id = int(elective_subcat["subcategory_id"]) if elective_subcat else None
-
-    elective_rules = db.execute(text("""
-        SELECT min_from_chosen_group, min_from_all_groups
-        FROM major_elective_rules
-        WHERE curriculum_id = :cid
-        LIMIT 1
-    """), {"cid": curriculum_id}).mappings().first()
-
-    chosen_group_id = db.execute(text("""
-        SELECT group_id
-        FROM session_concentration_selection
-        WHERE session_id = :sid
-        LIMIT 1
-    """), {"sid": session_id}).scalar()
-    chosen_group_id = int(chosen_group_id) if chosen_group_id else None
+    if offered_course_code_ids is not None:
+        by_code_id = snapshot.candidate_positions_by_code_id
+        term_positions = {
+            p
+            for code_id in offered_course_code_ids
+            for p in by_code_id.get(code_id, ())
+        }
+        positions = term_positions if positions is None else positions & term_positions
 
-    def resolve_elective_group(course_code_id: int, course_code: str) -> Optional[int]:
-        # explicit mapping
-        g = db.execute(text("""
-            SELECT group_id
-            FROM major_elective_group_course_codes
-            WHERE course_code_id = :ccid
-            LIMIT 1
-        """), {"ccid": course_code_id}).scalar()
-        if g:
-            return int(g)
-
-        # range mapping
-        if not elective_subcategory_id:
-            return None
-
-        m = re.match(r"^([A-Za-z]+)(\d+)$", course_code.strip())
-        if not m:
-            return None
-
-        prefix = m.group(1).upper()
-        num = int(m.group(2))
-
-        g2 = db.execute(text("""
-            SELECT group_id
-            FROM course_code_ranges
-            WHERE subcategory_id = :subid
-              AND UPPER(prefix) = :prefix
-              AND :num BETWEEN number_start AND number_end
-            LIMIT 1
-        """), {"subid": elective_subcategory_id, "prefix": prefix, "num": num}).scalar()
-
-        return int(g2) if g2 else None
+    return sorted(positions)
 
-    # --------------------------------------------------------
-    # Elective progress (count courses)
-    # --------------------------------------------------------
-    elective_progress = None
-    passed_elective_course_code_ids = set()
 
-    if elective_rules and elective_subcategory_id:
-        passed_attempt_rows = db.execute(text("""
-            SELECT DISTINCT a.course_code_id, cc.course_code
-            FROM session_course_attempts a
-            JOIN course_codes cc ON cc.course_code_id = a.course_code_id
-            JOIN subcategory_course_codes sc ON sc.course_code_id = a.course_code_id
-            WHERE a.session_id = :sid
-              AND sc.subcategory_id = :subid
-        """), {"sid": session_id, "subid": elective_subcategory_id}).mappings().all()
+def classify_candidates(
+    snapshot: CurriculumSnapshot,
+    passed_course_ids: set,
+    in_progress_course_ids: set,
+    earned_credits: int,
+    positions: Optional[List[int]] = None
+) -> List[str]:
+    """
+    Block reason for every snapshot candidate (or only those at
+    `positions`), in candidate order:
+    "completed", "credit", "prereq" or "eligible".
+    Uses the snapshot's vectorized EligibilityIndex when it has one.
+    """
+    if snapshot.eligibility_index is not None:
+        reasons = snapshot.eligibility_index.classify(passed_course_ids, in_progress_course_ids, earned_credits)
+        return reasons if positions is None else [reasons[p] for p in positions]
 
-        chosen_done = 0
-        any_done = 0
+    prereq_map = snapshot.prereq_map
+    reasons: List[str] = []
+    candidates = snapshot.candidates if positions is None else [snapshot.candidates[p] for p in positions]
 
-        for r in passed_attempt_rows:
-            ccid = int(r["course_code_id"])
-            code = r["course_code"]
+    for c in candidates:
+        course_id = c["course_id"]
 
-            if ccid not in passed_course_code_ids:
-                continue
+        if course_id in passed_course_ids or course_id in in_progress_course_ids:
+            block_reason = "completed"
+        elif earned_credits < c["min_credits_required"]:
+            block_reason = "credit"
+        else:
+            needed = prereq_map.get(course_id, [])
+            if any(req not in passed_course_ids for req in needed):
+                block_reason = "prereq"
+            else:
+                block_reason = "eligible"
 
-            g = resolve_elective_group(ccid, code)
-            if g is None:
-                continue
+        reasons.append(block_reason)
 
-            passed_elective_course_code_ids.add(ccid)
-            any_done += 1
-            if chosen_group_id and g == chosen_group_id:
-                chosen_done += 1
+    return reasons
 
-        elective_progress = {
-            "track_status": "SELECTED" if chosen_group_id else "NOT_SELECTED",
-            "chosen_group_id": chosen_group_id,
-            "min_from_chosen_group": int(elective_rules["min_from_chosen_group"]),
-            "min_from_all_groups": int(elective_rules["min_from_all_groups"]),
-            "chosen_group_completed": chosen_done,
-            "all_groups_completed": any_done,
-            "chosen_group_remaining": max(0, int(elective_rules["min_from_chosen_group"]) - chosen_done),
-            "all_groups_remaining": max(0, int(elective_rules["min_from_all_groups"]) - any_done),
-        }
 
-    # Determine elective priority state
-    priority_state = None
-    if elective_progress:
-        if not chosen_group_id:
-            priority_state = "SELECT_CONCENTRATION_FIRST"
-        elif elective_progress["all_groups_remaining"] == 0:
-            priority_state = "ELECTIVE_REQUIREMENT_COMPLETED"
-        elif elective_progress["chosen_group_remaining"] > 0:
-            priority_state = "FOCUS_ON_CHOSEN_TRACK"
-        else:
-            priority_state = "FREE_CHOICE"
+def build_elective_progress(
+    elective_rules: Dict[str, int],
+    chosen_group_id: Optional[int],
+    chosen_done: int,
+    any_done: int
+) -> Dict[str, Any]:
+    return {
+        "track_status": "SELECTED" if chosen_group_id else "NOT_SELECTED",
+        "chosen_group_id": chosen_group_id,
+        "min_from_chosen_group": elective_rules["min_from_chosen_group"],
+        "min_from_all_groups": elective_rules["min_from_all_groups"],
+        "chosen_group_completed": chosen_done,
+        "all_groups_completed": any_done,
+        "chosen_group_remaining": max(0, elective_rules["min_from_chosen_group"] - chosen_done),
+        "all_groups_remaining": max(0, elective_rules["min_from_all_groups"] - any_done),
+    }
 
-    # --------------------------------------------------------
-    # Candidates (specialized only)
-    # --------------------------------------------------------
-    candidates = db.execute(text("""
-        SELECT
-            cc.course_code,
-            cc.course_code_id,
-            c.course_id,
-            c.course_name,
-            c.credits,
-            sub.subcategory_id,
-            sub.name AS subcategory_name,
-            COALESCE(cr.min_earned_credits, 0) AS min_credits_required
-        FROM curriculum_subcategories sub
-        JOIN subcategory_course_codes sc ON sc.subcategory_id = sub.subcategory_id
-        JOIN course_codes cc ON cc.course_code_id = sc.course_code_id
-        JOIN courses c ON c.course_id = cc.course_id
-        LEFT JOIN curriculum_course_credit_requirements cr
-            ON cr.curriculum_id = :cid AND cr.course_id = c.course_id
-        WHERE sub.curriculum_id = :cid
-          AND sub.main_category_id = 2
-        ORDER BY sub.display_order, cc.course_code
-    """), {"cid": curriculum_id}).mappings().all()
-
-    # prereq map
-    prereqs = db.execute(text("""
-        SELECT course_id, prerequisite_course_id
-        FROM course_prerequisites
-    """)).mappings().all()
-
-    prereq_map: Dict[int, List[int]] = {}
-    for p in prereqs:
-        prereq_map.setdefault(int(p["course_id"]), []).append(int(p["prerequisite_course_id"]))
 
-    # --------------------------------------------------------
-    # Eligible output buckets
-    # --------------------------------------------------------
+def elective_priority_state(elective_progress: Optional[dict], chosen_group_id: Optional[int]) -> Optional[str]:
+    if not elective_progress:
+        return None
+    if not chosen_group_id:
+        return "SELECT_CONCENTRATION_FIRST"
+    if elective_progress["all_groups_remaining"] == 0:
+        return "ELECTIVE_REQUIREMENT_COMPLETED"
+    if elective_progress["chosen_group_remaining"] > 0:
+        return "FOCUS_ON_CHOSEN_TRACK"
+    return "FREE_CHOICE"
+
+
+def bucket_candidates(
+    snapshot: CurriculumSnapshot,
+    block_reasons: List[str],
+    chosen_group_id: Optional[int],
+    positions: Optional[List[int]] = None
+) -> Dict[str, Any]:
+    """
+    Sorts classified candidates into the response buckets
+    (Other Specialized Courses / Major Electives tracks).
+    block_reasons line up with `positions` when given (classify_candidates
+    called with the same positions).
+    """
     eligible_by_subcat: Dict[str, Any] = {}
 
     chosen_track_list = []
@@ -470,8 +282,9 @@ def build_recommendations(
         "already_completed": []
     }
 
-    for c in candidates:
-        course_id = int(c["course_id"])
+    candidates = snapshot.candidates if positions is None else [snapshot.candidates[p] for p in positions]
+
+    for c, block_reason in zip(candidates, block_reasons):
         subcat_id = int(c["subcategory_id"])
         course_code_id = int(c["course_code_id"])
         course_code = c["course_code"]
@@ -482,20 +295,8 @@ def build_recommendations(
             "credits": int(c["credits"]),
         }
 
-        # determine blocking reason
-        if course_id in passed_course_ids or course_id in in_progress_course_ids:
-            block_reason = "completed"
-        elif earned_credits < int(c["min_credits_required"]):
-            block_reason = "credit"
-        else:
-            needed = prereq_map.get(course_id, [])
-            if any(req not in passed_course_ids for req in needed):
-                block_reason = "prereq"
-            else:
-                block_reason = "eligible"
-
         # non-elective -> normal specialized
-        if elective_subcategory_id is None or subcat_id != elective_subcategory_id:
+        if snapshot.elective_subcategory_id is None or subcat_id != snapshot.elective_subcategory_id:
             if block_reason == "eligible":
                 normal_specialized["eligible"].append(item)
             elif block_reason == "prereq":
@@ -507,7 +308,7 @@ def build_recommendations(
             continue
 
         # elective course -> resolve group
-        group = resolve_elective_group(course_code_id, course_code)
+        group = snapshot.group_resolver.resolve(course_code_id, course_code)
 
         # Group 3 = open pool
         if group == 3:
@@ -542,16 +343,12 @@ def build_recommendations(
             elif block_reason == "completed":
                 other_track_completed.append(item)
 
-    # Assemble final structure
-    if (
-        normal_specialized["eligible"]
-        or normal_specialized["blocked_by_prerequisite"]
-        or normal_specialized["blocked_by_credit_requirement"]
-        or normal_specialized["already_completed"]
-    ):
+    # Assemble final structure (the section exists whenever the curriculum
+    # has such courses, even if none of them is offered)
+    if snapshot.has_other_specialized:
         eligible_by_subcat["Other Specialized Courses"] = normal_specialized
 
-    if elective_subcategory_id:
+    if snapshot.elective_subcategory_id:
         if not chosen_group_id:
             eligible_by_subcat["Major Electives"] = {
                 "message": "Please select a concentration to see track-specific recommendations.",
@@ -583,42 +380,255 @@ def build_recommendations(
                     "already_completed": open_pool_completed,
                 }
             }
+
+    return eligible_by_subcat
+
+# ============================================================
+# Main recommendation builder
+# ============================================================
+
+CONCENTRATION_SQL = text("""
+    SELECT group_id
+    FROM session_concentration_selection
+    WHERE session_id = :sid
+    LIMIT 1
+""").bindparams(
+    bindparam("sid", type_=BigInteger)
+).execution_options(query_name="advising.concentration")
+
+
+def build_recommendations(
+    session_id: int,
+    db: Session,
+    max_credits: int = 18,
+    offered_courses: Optional[List[str]] = None
+) -> Dict[str, Any]:
+    # load session
+    s = db.execute(SESSION_SQL, {"sid": session_id}).mappings().first()
+
+    if not s:
+        return {"error": "Session not found"}
+
+    snapshot = get_curriculum_snapshot(int(s["curriculum_id"]), db)
+
+    return evaluate_recommendations(
+        session_id=session_id,
+        snapshot=snapshot,
+        attempts=load_session_attempts(session_id, db),
+        chosen_group_id=db.execute(CONCENTRATION_SQL, {"sid": session_id}).scalar(),
+        seminar_progress=load_seminar_progress(session_id, db),
+        max_credits=max_credits,
+        offered_courses=offered_courses
+    )
+
+
+async def build_recommendations_async(
+    session_id: int,
+    max_credits: int = 18,
+    offered_courses: Optional[List[str]] = None,
+    term: Optional[str] = None,
+    min_version: Optional[int] = None
+) -> Dict[str, Any]:
+    """
+    Async variant of build_recommendations.
+    """
+    ctx = await load_session_context_async(session_id, min_version)
+
+    if ctx is None:
+        return {"error": "Session not found"}
+
+    return await recommendations_for_context(ctx, max_credits, offered_courses, term)
+
+
+async def recommendations_for_context(
+    ctx: SessionContext,
+    max_credits: int = 18,
+    offered_courses: Optional[List[str]] = None,
+    term: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    The context row (session, transcript_version, concentration) decides
+    the result cache key; only on a miss are the attempts and seminar
+    progress loaded into the context (concurrently) and the pipeline run.
+    `term` restricts candidates to that term's offering catalog.
+    """
+    offerings = None
+    if term:
+        offerings = await get_term_offerings_async(term)
+        if offerings is None:
+            return {"error": "Unknown term"}
+
+    key = recommendation_cache_key(
+        ctx.session_id,
+        ctx.transcript_version,
+        ctx.chosen_group_id,
+        ctx.snapshot.loaded_at,
+        max_credits,
+        offered_courses,
+        (offerings.term, offerings.loaded_at) if offerings else None
+    )
+    cached = get_cached_recommendations(key)
+    if cached is not None:
+        return cached
+
+    await ctx.load(attempts=True, seminars=True)
+
+    result = evaluate_recommendations(
+        session_id=ctx.session_id,
+        snapshot=ctx.snapshot,
+        attempts=ctx.attempts,
+        chosen_group_id=ctx.chosen_group_id,
+        seminar_progress=ctx.seminar_progress,
+        max_credits=max_credits,
+        offered_courses=offered_courses,
+        offered_course_code_ids=offerings.course_code_ids if offerings else None
+    )
+    store_recommendations(key, result)
+    return result
+
+
+def evaluate_recommendations(
+    session_id: int,
+    snapshot: CurriculumSnapshot,
+    attempts: List[Any],
+    chosen_group_id: Optional[int],
+    seminar_progress: SeminarProgress,
+    max_credits: int = 18,
+    offered_courses: Optional[List[str]] = None,
+    offered_course_code_ids: Optional[AbstractSet[int]] = None
+) -> Dict[str, Any]:
+    """
+    Pure recommendation engine: works only on already-loaded data,
+    never touches the database. Candidates outside offered_courses /
+    offered_course_code_ids (a term catalog) are dropped before
+    classification.
+    """
+    curriculum_id = snapshot.curriculum_id
+
+    passed_course_ids = set()
+    passed_codes = set()
+    failed_codes = set()
+    passed_course_code_ids = set()
+    in_progress_course_ids = set()
+    in_progress_course_code_ids = set()
+
+    for row in attempts:
+        grade = row["grade"].strip().upper()
+
+        # --- IP handling ---
+        if grade == "IP":
+            in_progress_course_ids.add(int(row["course_id"]))
+            in_progress_course_code_ids.add(int(row["course_code_id"]))
+            continue
+
+        # --- Normal pass/fail handling ---
+        ok = is_passing(row["grade"], snapshot.required_grade(int(row["course_id"])))
+
+        if ok:
+            passed_course_ids.add(int(row["course_id"]))
+            passed_codes.add(row["course_code"])
+            passed_course_code_ids.add(int(row["course_code_id"]))
+        else:
+            failed_codes.add(row["course_code"])
+
     # --------------------------------------------------------
-    # Filter by offered courses (if provided)
+    # Earned credits, total and per main category (GE, FE)
     # --------------------------------------------------------
-    if offered_courses:
-        offered_set = set(code.strip().upper() for code in offered_courses)
+    earned_credits = 0
+    earned_by_category: Dict[str, int] = {}
 
-        def filter_list(course_list):
-            return [
-                c for c in course_list
-                if c["course_code"].upper() in offered_set
-            ]
+    for row in attempts:
+        credits_earned = int(row["credits_earned"])
+        if credits_earned <= 0:
+            continue
 
-        for key, value in eligible_by_subcat.items():
+        earned_credits += credits_earned
+        for _, main_category in snapshot.subcategory_links_by_code_id.get(int(row["course_code_id"]), []):
+            earned_by_category[main_category] = earned_by_category.get(main_category, 0) + credits_earned
 
-            if key == "Other Specialized Courses":
-                for bucket in value:
-                    value[bucket] = filter_list(value[bucket])
+    required_by_category = snapshot.required_by_category
 
-            elif key == "Major Electives":
-                for subkey in value:
-                    if isinstance(value[subkey], dict):
-                        for bucket in value[subkey]:
-                            if isinstance(value[subkey][bucket], list):
-                                value[subkey][bucket] = filter_list(value[subkey][bucket])
+    ge_remaining = max(
+        0,
+        required_by_category.get("General Education", 0)
+        - earned_by_category.get("General Education", 0)
+    )
+
+    fe_remaining = max(
+        0,
+        required_by_category.get("Free Electives", 0)
+        - earned_by_category.get("Free Electives", 0)
+    )
+
+    elective_subcategory_id = snapshot.elective_subcategory_id
+    elective_rules = snapshot.elective_rules
+
+    chosen_group_id = int(chosen_group_id) if chosen_group_id else None
+
+    resolve_elective_group = snapshot.group_resolver.resolve
+
+    # --------------------------------------------------------
+    # Elective progress (count courses)
+    # --------------------------------------------------------
+    elective_progress = None
+    passed_elective_course_code_ids = set()
+
+    if elective_rules and elective_subcategory_id:
+        chosen_done = 0
+        any_done = 0
+        seen_elective_code_ids = set()
+
+        for r in attempts:
+            ccid = int(r["course_code_id"])
+            code = r["course_code"]
+
+            if ccid not in snapshot.elective_course_code_ids or ccid in seen_elective_code_ids:
+                continue
+            seen_elective_code_ids.add(ccid)
+
+            if ccid not in passed_course_code_ids:
+                continue
+
+            g = resolve_elective_group(ccid, code)
+            if g is None:
+                continue
+
+            passed_elective_course_code_ids.add(ccid)
+            any_done += 1
+            if chosen_group_id and g == chosen_group_id:
+                chosen_done += 1
+
+        elective_progress = build_elective_progress(elective_rules, chosen_group_id, chosen_done, any_done)
+
+    # Determine elective priority state
+    priority_state = elective_priority_state(elective_progress, chosen_group_id)
+
+    # --------------------------------------------------------
+    # Candidates (specialized only), classified and bucketed
+    # --------------------------------------------------------
+    positions = offered_candidate_positions(snapshot, offered_courses, offered_course_code_ids)
+
+    block_reasons = classify_candidates(
+        snapshot,
+        passed_course_ids=passed_course_ids,
+        in_progress_course_ids=in_progress_course_ids,
+        earned_credits=earned_credits,
+        positions=positions
+    )
+    eligible_by_subcat = bucket_candidates(snapshot, block_reasons, chosen_group_id, positions)
 
     # Next semester plan (soft enforcement)
     next_semester_plan = build_next_semester_plan(
         eligible_by_subcat=eligible_by_subcat,
         elective_priority=priority_state,
-        max_credits=max_credits
+        max_credits=max_credits,
+        course_rank=snapshot.course_rank_by_code
     )
 
     # --------------------------------------------------------
     # Add Professional Ethics Seminar (0 credit, mandatory)
     # --------------------------------------------------------
-    next_seminar = get_next_ethics_seminar(session_id=session_id, db=db)
+    next_seminar = seminar_progress.next_seminar()
     if next_seminar:
         # Always include it even if max credits already reached (0 credit anyway)
         next_semester_plan["recommended_courses"].append(next_seminar)
@@ -0,0 +1,260 @@
+# app/services/cohort.py
+
+from __future__ import annotations
+
+import threading
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from typing import Optional, Dict, Any, List, Iterator, FrozenSet
+
+from sqlalchemy.orm import Session
+from sqlalchemy import text, bindparam, BigInteger, Integer
+from sqlalchemy.dialects.postgresql import ARRAY
+
+from ..config import COHORT_WORKERS, COHORT_CHUNK_SIZE
+from .advising import evaluate_recommendations
+from .curriculum_snapshot import CurriculumSnapshot, get_curriculum_snapshot
+from .seminars import SeminarProgress, load_seminar_catalog
+
+
+# ============================================================
+# Bulk loading (a fixed number of queries for the whole cohort)
+# ============================================================
+
+COHORT_SESSIONS_BY_ID_SQL = text("""
+    SELECT session_id, curriculum_id
+    FROM advising_sessions
+    WHERE session_id = ANY(:sids)
+    ORDER BY session_id
+""").bindparams(
+    bindparam("sids", type_=ARRAY(BigInteger))
+).execution_options(query_name="cohort.cohort_sessions_by_id")
+
+# latest session per student inside the given student ID range
+COHORT_SESSIONS_BY_RANGE_SQL = text("""
+    SELECT DISTINCT ON (student_id_number)
+        session_id,
+        curriculum_id
+    FROM advising_sessions
+    WHERE curriculum_id = :cid
+      AND student_id_number BETWEEN :id_start AND :id_end
+    ORDER BY student_id_number, session_id DESC
+""").bindparams(
+    bindparam("cid", type_=Integer),
+    bindparam("id_start", type_=BigInteger),
+    bindparam("id_end", type_=BigInteger)
+).execution_options(query_name="cohort.cohort_sessions_by_range")
+
+CURRICULUM_ID_RANGES_SQL = text("""
+    SELECT MIN(id_start) AS id_start, MAX(id_end) AS id_end
+    FROM curriculum_id_ranges
+    WHERE curriculum_id = :cid
+""").bindparams(
+    bindparam("cid", type_=Integer)
+).execution_options(query_name="cohort.curriculum_id_ranges")
+
+COHORT_ATTEMPTS_SQL = text("""
+    SELECT
+        a.session_id,
+        a.attempt_id,
+        a.grade,
+        a.credits_earned,
+        a.course_code_id,
+        cc.course_code,
+        c.course_id,
+        c.credits,
+        c.is_ethics_seminar
+    FROM session_course_attempts a
+    JOIN course_codes cc ON cc.course_code_id = a.course_code_id
+    JOIN courses c ON c.course_id = cc.course_id
+    WHERE a.session_id = ANY(:sids)
+    ORDER BY a.session_id, a.attempt_id
+""").bindparams(
+    bindparam("sids", type_=ARRAY(BigInteger))
+).execution_options(query_name="cohort.cohort_attempts")
+
+COHORT_CONCENTRATION_SQL = text("""
+    SELECT session_id, group_id
+    FROM session_concentration_selection
+    WHERE session_id = ANY(:sids)
+""").bindparams(
+    bindparam("sids", type_=ARRAY(BigInteger))
+).execution_options(query_name="cohort.cohort_concentration")
+
+
+@dataclass
+class CohortInputs:
+    """
+    Everything needed to evaluate many sessions without further queries.
+    """
+
+    # session_id -> curriculum_id, in evaluation order
+    sessions: Dict[int, int] = field(default_factory=dict)
+    attempts_by_session: Dict[int, List[dict]] = field(default_factory=dict)
+    group_by_session: Dict[int, int] = field(default_factory=dict)
+    snapshots: Dict[int, CurriculumSnapshot] = field(default_factory=dict)
+    seminar_catalog: SeminarProgress = field(default_factory=SeminarProgress)
+    missing_session_ids: List[int] = field(default_factory=list)
+
+
+def resolve_cohort_session_ids(
+    db: Session,
+    session_ids: Optional[List[int]] = None,
+    curriculum_id: Optional[int] = None,
+    student_id_start: Optional[int] = None,
+    student_id_end: Optional[int] = None
+) -> Dict[int, int]:
+    """
+    Returns {session_id: curriculum_id} for an explicit list of sessions,
+    or for the latest session of every student of a curriculum whose
+    student ID falls in the given range (defaults to the curriculum's
+    curriculum_id_ranges).
+    """
+    if session_ids:
+        rows = db.execute(COHORT_SESSIONS_BY_ID_SQL, {"sids": list(session_ids)}).mappings().all()
+        return {int(r["session_id"]): int(r["curriculum_id"]) for r in rows}
+
+    if curriculum_id is None:
+        return {}
+
+    if student_id_start is None or student_id_end is None:
+        bounds = db.execute(CURRICULUM_ID_RANGES_SQL, {"cid": curriculum_id}).mappings().first()
+        if not bounds or bounds["id_start"] is None:
+            return {}
+        if student_id_start is None:
+            student_id_start = int(bounds["id_start"])
+        if student_id_end is None:
+            student_id_end = int(bounds["id_end"])
+
+    rows = db.execute(COHORT_SESSIONS_BY_RANGE_SQL, {
+        "cid": curriculum_id,
+        "id_start": student_id_start,
+        "id_end": student_id_end
+    }).mappings().all()
+
+    return {int(r["session_id"]): int(r["curriculum_id"]) for r in rows}
+
+
+def load_cohort_inputs(
+    sessions: Dict[int, int],
+    db: Session,
+    requested_session_ids: Optional[List[int]] = None
+) -> CohortInputs:
+    inputs = CohortInputs(sessions=sessions)
+
+    if requested_session_ids:
+        inputs.missing_session_ids = [sid for sid in requested_session_ids if sid not in sessions]
+
+    if not sessions:
+        return inputs
+
+    sids = list(sessions)
+
+    for row in db.execute(COHORT_ATTEMPTS_SQL, {"sids": sids}).mappings():
+        inputs.attempts_by_session.setdefault(int(row["session_id"]), []).append(dict(row))
+
+    for row in db.execute(COHORT_CONCENTRATION_SQL, {"sids": sids}).mappings():
+        inputs.group_by_session[int(row["session_id"])] = int(row["group_id"])
+
+    for curriculum_id in set(sessions.values()):
+        inputs.snapshots[curriculum_id] = get_curriculum_snapshot(curriculum_id, db)
+
+    inputs.seminar_catalog = load_seminar_catalog(db)
+    return inputs
+
+
+# ============================================================
+# Evaluation (process pool)
+# ============================================================
+
+def _evaluate_chunk(
+    snapshot: CurriculumSnapshot,
+    seminar_catalog: SeminarProgress,
+    items: List[tuple],
+    max_credits: int,
+    offered_courses: Optional[List[str]],
+    offered_course_code_ids: Optional[FrozenSet[int]] = None
+) -> List[Dict[str, Any]]:
+    """
+    Runs in a worker process. items = [(session_id, attempts, group_id), ...]
+    """
+    results = []
+    for session_id, attempts, chosen_group_id in items:
+        results.append(evaluate_recommendations(
+            session_id=session_id,
+            snapshot=snapshot,
+            attempts=attempts,
+            chosen_group_id=chosen_group_id,
+            seminar_progress=seminar_catalog.with_attempts(attempts),
+            max_credits=max_credits,
+            offered_courses=offered_courses,
+            offered_course_code_ids=offered_course_code_ids
+        ))
+    return results
+
+
+_executor: Optional[ProcessPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def get_cohort_executor() -> ProcessPoolExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ProcessPoolExecutor(max_workers=COHORT_WORKERS)
+        return _executor
+
+
+def iter_cohort_chunks(inputs: CohortInputs) -> Iterator[tuple]:
+    """
+    Yields (snapshot, items) per curriculum, COHORT_CHUNK_SIZE sessions at a time.
+    """
+    by_curriculum: Dict[int, List[int]] = {}
+    for session_id, curriculum_id in inputs.sessions.items():
+        by_curriculum.setdefault(curriculum_id, []).append(session_id)
+
+    for curriculum_id, session_ids in by_curriculum.items():
+        snapshot = inputs.snapshots[curriculum_id]
+        for i in range(0, len(session_ids), COHORT_CHUNK_SIZE):
+            yield snapshot, [
+                (
+                    sid,
+                    inputs.attempts_by_session.get(sid, []),
+                    inputs.group_by_session.get(sid)
+                )
+                for sid in session_ids[i:i + COHORT_CHUNK_SIZE]
+            ]
+
+
+def iter_cohort_recommendations(
+    inputs: CohortInputs,
+    max_credits: int = 18,
+    offered_courses: Optional[List[str]] = None,
+    offered_course_code_ids: Optional[FrozenSet[int]] = None
+) -> Iterator[Dict[str, Any]]:
+    """
+    Yields one recommendation result per session as chunks finish.
+    Small cohorts (one chunk) are evaluated inline, skipping the pool.
+    """
+    for sid in inputs.missing_session_ids:
+        yield {"session_id": sid, "error": "Session not found"}
+
+    chunks = list(iter_cohort_chunks(inputs))
+
+    if len(chunks) <= 1:
+        for snapshot, items in chunks:
+            yield from _evaluate_chunk(
+                snapshot, inputs.seminar_catalog, items, max_credits, offered_courses, offered_course_code_ids
+            )
+        return
+
+    executor = get_cohort_executor()
+    futures = [
+        executor.submit(
+            _evaluate_chunk, snapshot, inputs.seminar_catalog, items, max_credits, offered_courses, offered_course_code_ids
+        )
+        for snapshot, items in chunks
+    ]
+
+    for future in as_completed(futures):
+        yield from future.result()
@@ -0,0 +1,79 @@
+# app/services/compact.py
+
+from __future__ import annotations
+
+from typing import Optional, Dict, Any, List
+
+
+# ============================================================
+# Response shaping for recommendation results (compact / fields)
+# ============================================================
+#
+# Applied after the engine (and the result cache): the stored result is
+# always the full one.
+
+RECOMMENDATION_FIELDS = (
+    "session_id",
+    "curriculum_id",
+    "earned_credits",
+    "passed_course_codes",
+    "failed_course_codes",
+    "elective_progress",
+    "elective_priority",
+    "eligible_specialized_by_subcategory",
+    "next_semester_plan",
+)
+
+
+def unknown_fields(fields: Optional[List[str]]) -> List[str]:
+    return [f for f in fields or [] if f not in RECOMMENDATION_FIELDS]
+
+
+def _compact_section(section: Any, courses: Dict[str, dict]) -> Any:
+    """
+    Bucket lists of course dicts -> lists of course codes; the details
+    go to `courses` once.
+    """
+    if isinstance(section, dict):
+        return {key: _compact_section(value, courses) for key, value in section.items()}
+
+    if isinstance(section, list):
+        codes = []
+        for item in section:
+            code = item["course_code"]
+            if code not in courses:
+                courses[code] = {"course_name": item["course_name"], "credits": item["credits"]}
+            codes.append(code)
+        return codes
+
+    return section
+
+
+def shape_recommendations(
+    result: Dict[str, Any],
+    compact: bool = False,
+    fields: Optional[List[str]] = None
+) -> Dict[str, Any]:
+    """
+    Full result -> the requested view. compact replaces the bucket course
+    dicts with codes plus one "courses" dictionary {code: {course_name,
+    credits}}; fields keeps only those top-level keys (and session_id).
+    Error results pass through unchanged.
+    """
+    if "error" in result:
+        return result
+
+    if fields:
+        keep = {"session_id", *fields}
+        shaped = {key: value for key, value in result.items() if key in keep}
+    else:
+        shaped = dict(result)
+
+    if compact and "eligible_specialized_by_subcategory" in shaped:
+        courses: Dict[str, dict] = {}
+        shaped["eligible_specialized_by_subcategory"] = _compact_section(
+            shaped["eligible_specialized_by_subcategory"], courses
+        )
+        shaped["courses"] = courses
+
+    return shaped
@@ -0,0 +1,126 @@
+# app/services/course_catalog.py
+
+from __future__ import annotations
+
+from sqlalchemy.orm import Session
+from sqlalchemy import text, bindparam, Integer, Boolean, Text
+from typing import Optional, Dict, Any, List
+
+
+# ============================================================
+# Admin course catalog (keyset pages + version for ETags)
+# ============================================================
+
+CATALOG_VERSION_SQL = text("""
+    SELECT version FROM course_catalog_version
+""").execution_options(query_name="course_catalog.version")
+
+BUMP_CATALOG_VERSION_SQL = text("""
+    UPDATE course_catalog_version
+    SET version = version + 1
+    RETURNING version
+""").execution_options(query_name="course_catalog.bump_version")
+
+# keyset on course_id; NULL filters are ignored. :pattern is an escaped
+# LIKE prefix matched against the name (case-insensitive) or any code.
+COURSES_PAGE_SQL = text("""
+    SELECT
+        c.course_id,
+        c.course_name,
+        c.credits,
+        c.is_ethics_seminar,
+        c.is_active
+    FROM courses c
+    WHERE c.course_id > :after
+      AND (CAST(:active AS BOOLEAN) IS NULL OR c.is_active = :active)
+      AND (CAST(:seminar AS BOOLEAN) IS NULL OR c.is_ethics_seminar = :seminar)
+      AND (
+        CAST(:pattern AS TEXT) IS NULL
+        OR LOWER(c.course_name) LIKE LOWER(:pattern)
+        OR EXISTS (
+          SELECT 1
+          FROM course_codes cc
+          WHERE cc.course_id = c.course_id
+            AND cc.course_code LIKE UPPER(:pattern)
+        )
+      )
+    ORDER BY c.course_id
+    LIMIT :limit
+""").bindparams(
+    bindparam("after", type_=Integer),
+    bindparam("active", type_=Boolean),
+    bindparam("seminar", type_=Boolean),
+    bindparam("pattern", type_=Text),
+    bindparam("limit", type_=Integer)
+).execution_options(query_name="course_catalog.page")
+
+
+def catalog_version(db: Session) -> int:
+    return int(db.execute(CATALOG_VERSION_SQL).scalar() or 0)
+
+
+def bump_catalog_version(db: Session) -> int:
+    """
+    Call in the transaction that changes courses. Does not commit.
+    """
+    return int(db.execute(BUMP_CATALOG_VERSION_SQL).scalar() or 0)
+
+
+def catalog_etag(version: int) -> str:
+    return f'"courses-{version}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    If-None-Match check (weak comparison, "*" or a list of tags).
+    """
+    if not if_none_match:
+        return False
+    tags = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in tags or any(tag.removeprefix("W/") == etag for tag in tags)
+
+
+def prefix_pattern(prefix: Optional[str]) -> Optional[str]:
+    prefix = (prefix or "").strip()
+    if not prefix:
+        return None
+    escaped = prefix.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return escaped + "%"
+
+
+def keyset_page(rows: List[Any], limit: int, key: str) -> Dict[str, Any]:
+    """
+    Splits a `limit + 1` query result into the page and the cursor of the
+    following one (the page's last key, None when nothing follows).
+    """
+    items = [dict(r) for r in rows[:limit]]
+    has_more = len(rows) > limit
+
+    return {
+        "items": items,
+        "next_after": items[-1][key] if has_more and items else None
+    }
+
+
+def load_courses_page(
+    db: Session,
+    after: int = 0,
+    limit: int = 100,
+    active: Optional[bool] = None,
+    seminar: Optional[bool] = None,
+    prefix: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    One page of courses ordered by course_id. next_after is the cursor of
+    the following page (None on the last one).
+    """
+    rows = db.execute(COURSES_PAGE_SQL, {
+        "after": after,
+        "active": active,
+        "seminar": seminar,
+        "pattern": prefix_pattern(prefix),
+        "limit": limit + 1
+    }).mappings().all()
+
+    page = keyset_page(rows, limit, "course_id")
+    return {"courses": page["items"], "next_after": page["next_after"]}
@@ -0,0 +1,162 @@
+# app/services/curriculum_ranges.py
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from bisect import bisect_right
+from dataclasses import dataclass
+from sqlalchemy.orm import Session
+from sqlalchemy import text, bindparam, BigInteger
+from sqlalchemy.dialects.postgresql import ARRAY
+from typing import Optional, Dict, Any, List, Tuple
+
+from ..config import CURRICULUM_SNAPSHOT_TTL_SECONDS
+
+
+logger = logging.getLogger(__name__)
+
+
+# ============================================================
+# Student ID -> curriculum (sorted interval table)
+# ============================================================
+#
+# curriculum_id_ranges is small and rarely changes: it is loaded once
+# into sorted, non-overlapping intervals and resolved with bisect. The
+# database side (int8range GiST exclusion constraint, see sql.sql) keeps
+# ranges disjoint and serves the fallback queries from its index.
+
+CURRICULUM_RANGES_SQL = text("""
+    SELECT range_id, curriculum_id, id_start, id_end
+    FROM curriculum_id_ranges
+    ORDER BY id_start, range_id
+""").execution_options(query_name="curriculum_ranges.all")
+
+# same predicate as the exclusion constraint, so the GiST index is used
+CURRICULUM_FOR_STUDENT_SQL = text("""
+    SELECT curriculum_id
+    FROM curriculum_id_ranges
+    WHERE int8range(id_start, id_end, '[]') @> CAST(:sid AS BIGINT)
+""").bindparams(
+    bindparam("sid", type_=BigInteger)
+).execution_options(query_name="curriculum_ranges.curriculum_for_student")
+
+CURRICULUM_FOR_STUDENTS_SQL = text("""
+    SELECT u.student_id_number, r.curriculum_id
+    FROM unnest(:ids) AS u(student_id_number)
+    JOIN curriculum_id_ranges r
+      ON int8range(r.id_start, r.id_end, '[]') @> u.student_id_number
+""").bindparams(
+    bindparam("ids", type_=ARRAY(BigInteger))
+).execution_options(query_name="curriculum_ranges.curriculum_for_students")
+
+
+@dataclass(frozen=True)
+class CurriculumRangeIndex:
+    """
+    Parallel tuples sorted by id_start; ranges never overlap.
+    """
+
+    starts: Tuple[int, ...]
+    ends: Tuple[int, ...]
+    curriculum_ids: Tuple[int, ...]
+    loaded_at: float
+
+    @classmethod
+    def from_rows(cls, rows: List[Any]) -> "CurriculumRangeIndex":
+        """
+        rows ordered by id_start. An overlapping range (only possible
+        without the exclusion constraint) is dropped with a warning, so
+        lookups stay deterministic.
+        """
+        starts: List[int] = []
+        ends: List[int] = []
+        curriculum_ids: List[int] = []
+
+        for r in rows:
+            start, end = int(r["id_start"]), int(r["id_end"])
+            if ends and start <= ends[-1]:
+                logger.warning(
+                    "curriculum_id_ranges %s (%s-%s) overlaps %s-%s, ignored",
+                    r["range_id"], start, end, starts[-1], ends[-1]
+                )
+                continue
+            starts.append(start)
+            ends.append(end)
+            curriculum_ids.append(int(r["curriculum_id"]))
+
+        return cls(tuple(starts), tuple(ends), tuple(curriculum_ids), time.monotonic())
+
+    def lookup(self, student_id: int) -> Optional[int]:
+        i = bisect_right(self.starts, student_id) - 1
+        if i >= 0 and student_id <= self.ends[i]:
+            return self.curriculum_ids[i]
+        return None
+
+    def lookup_many(self, student_ids: List[int]) -> Dict[int, int]:
+        found = {}
+        for sid in student_ids:
+            curriculum_id = self.lookup(sid)
+            if curriculum_id is not None:
+                found[sid] = curriculum_id
+        return found
+
+
+# ----------------------------
+# Process-wide cache (same TTL as curriculum snapshots)
+# ----------------------------
+
+_index: Optional[CurriculumRangeIndex] = None
+_index_lock = threading.Lock()
+
+
+def get_curriculum_range_index(db: Session) -> CurriculumRangeIndex:
+    global _index
+    index = _index
+    if index and time.monotonic() - index.loaded_at < CURRICULUM_SNAPSHOT_TTL_SECONDS:
+        return index
+
+    index = CurriculumRangeIndex.from_rows(db.execute(CURRICULUM_RANGES_SQL).mappings().all())
+    with _index_lock:
+        _index = index
+    return index
+
+
+def invalidate_curriculum_ranges() -> None:
+    global _index
+    with _index_lock:
+        _index = None
+
+
+def resolve_curriculum_id(student_id: int, db: Session) -> Optional[int]:
+    """
+    Curriculum of a student ID, None when no range covers it. A miss is
+    re-checked in the database (indexed) so ranges added since the index
+    was loaded are found right away.
+    """
+    curriculum_id = get_curriculum_range_index(db).lookup(student_id)
+    if curriculum_id is not None:
+        return curriculum_id
+
+    curriculum_id = db.execute(CURRICULUM_FOR_STUDENT_SQL, {"sid": student_id}).scalar()
+    if curriculum_id is not None:
+        invalidate_curriculum_ranges()
+    return curriculum_id
+
+
+def resolve_curriculum_ids(student_ids: List[int], db: Session) -> Dict[int, int]:
+    """
+    {student_id_number: curriculum_id} for the IDs some range covers
+    (same miss handling as resolve_curriculum_id, one query for all misses).
+    """
+    found = get_curriculum_range_index(db).lookup_many(student_ids)
+
+    missing = [sid for sid in student_ids if sid not in found]
+    if missing:
+        rows = db.execute(CURRICULUM_FOR_STUDENTS_SQL, {"ids": missing}).mappings().all()
+        if rows:
+            invalidate_curriculum_ranges()
+        found.update((int(r["student_id_number"]), int(r["curriculum_id"])) for r in rows)
+
+    return found
@@ -0,0 +1,368 @@
+# app/services/curriculum_snapshot.py
+
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Optional, Dict, Any, List, Tuple
+
+from sqlalchemy.orm import Session
+from sqlalchemy import text, bindparam, Integer
+
+from ..config import CURRICULUM_SNAPSHOT_TTL_SECONDS, ELIGIBILITY_ENGINE
+from ..db import async_fetch_batch
+from .elective_groups import ElectiveGroupResolver
+from .eligibility import EligibilityIndex, numpy_available
+from .prereq_graph import PrerequisiteGraph
+
+
+# ============================================================
+# Compiled curriculum snapshot
+# ============================================================
+
+@dataclass
+class CurriculumSnapshot:
+    """
+    Read-only, in-memory view of the curriculum structure used by
+    build_recommendations and run_graduation_audit. Everything in here is shared by every
+    session of the same curriculum, so it is loaded once and reused.
+    """
+
+    curriculum_id: int
+    total_required_credits: int = 0
+    required_by_category: Dict[str, int] = field(default_factory=dict)
+
+    elective_subcategory_id: Optional[int] = None
+    elective_rules: Optional[Dict[str, int]] = None
+
+    # specialized candidates, already ordered by display_order, course_code
+    candidates: List[Dict[str, Any]] = field(default_factory=list)
+
+    # positions in candidates per course_code_id / upper-cased course code
+    # (a code can sit in several subcategories), for offered-course filters
+    candidate_positions_by_code_id: Dict[int, List[int]] = field(default_factory=dict)
+    candidate_positions_by_code: Dict[str, List[int]] = field(default_factory=dict)
+
+    # any candidate outside the major elective subcategory
+    has_other_specialized: bool = False
+
+    # candidate course_id -> [prerequisite course_id, ...]
+    prereq_map: Dict[int, List[int]] = field(default_factory=dict)
+
+    # DAG with closure / unlock counts, and the planner's rank per candidate code
+    prereq_graph: PrerequisiteGraph = field(default_factory=lambda: PrerequisiteGraph({}))
+    course_rank_by_code: Dict[str, Tuple[int, int]] = field(default_factory=dict)
+
+    # vectorized candidate classifier (None = plain Python loop)
+    eligibility_index: Optional[EligibilityIndex] = None
+
+    # course_id -> minimum grade text (missing = 'D')
+    min_grade_by_course_id: Dict[int, str] = field(default_factory=dict)
+
+    # course_id -> min earned credits before the course can be taken
+    credit_requirement_by_course_id: Dict[int, int] = field(default_factory=dict)
+
+    # major elective group lookup (explicit codes + code ranges)
+    group_resolver: ElectiveGroupResolver = field(default_factory=ElectiveGroupResolver)
+
+    # course_code_ids linked to the major elective subcategory
+    elective_course_code_ids: set = field(default_factory=set)
+
+    # course_code_id -> [(subcategory_id, main category name), ...]
+    subcategory_links_by_code_id: Dict[int, List[Tuple[int, str]]] = field(default_factory=dict)
+
+    loaded_at: float = 0.0
+
+    def required_grade(self, course_id: int) -> str:
+        return self.min_grade_by_course_id.get(course_id, "D")
+
+
+# ============================================================
+# Structural queries (bound to :cid, prerequisites are global)
+# ============================================================
+
+SNAPSHOT_QUERIES = {
+    "curriculum": text("""
+        SELECT total_required_credits
+        FROM curriculums
+        WHERE curriculum_id = :cid
+    """),
+
+    # main category required credits (GE, FE, ...)
+    "required_by_category": text("""
+        SELECT
+            mc.main_category_id,
+            mc.name AS main_category,
+            cmc.required_credits
+        FROM curriculum_main_categories cmc
+        JOIN main_categories mc
+            ON mc.main_category_id = cmc.main_category_id
+        WHERE cmc.curriculum_id = :cid
+    """),
+
+    "elective_subcategory": text("""
+        SELECT subcategory_id, name
+        FROM curriculum_subcategories
+        WHERE curriculum_id = :cid AND name ILIKE '%Major Elective%'
+        LIMIT 1
+    """),
+
+    "elective_rules": text("""
+        SELECT min_from_chosen_group, min_from_all_groups
+        FROM major_elective_rules
+        WHERE curriculum_id = :cid
+        LIMIT 1
+    """),
+
+    # specialized candidates
+    "candidates": text("""
+        SELECT
+            cc.course_code,
+            cc.course_code_id,
+            c.course_id,
+            c.course_name,
+            c.credits,
+            sub.subcategory_id,
+            sub.name AS subcategory_name,
+            COALESCE(cr.min_earned_credits, 0) AS min_credits_required
+        FROM curriculum_subcategories sub
+        JOIN subcategory_course_codes sc ON sc.subcategory_id = sub.subcategory_id
+        JOIN course_codes cc ON cc.course_code_id = sc.course_code_id
+        JOIN courses c ON c.course_id = cc.course_id
+        LEFT JOIN curriculum_course_credit_requirements cr
+            ON cr.curriculum_id = :cid AND cr.course_id = c.course_id
+        WHERE sub.curriculum_id = :cid
+          AND sub.main_category_id = 2
+        ORDER BY sub.display_order, cc.course_code
+    """),
+
+    "prerequisites": text("""
+        SELECT course_id, prerequisite_course_id
+        FROM course_prerequisites
+    """),
+
+    "min_grades": text("""
+        SELECT course_id, min_required_grade::text AS required_grade
+        FROM curriculum_course_min_grades
+        WHERE curriculum_id = :cid
+    """),
+
+    # subcategory links (for per-category credit sums)
+    "subcategory_links": text("""
+        SELECT
+            sc.course_code_id,
+            sub.subcategory_id,
+            mc.name AS main_category
+        FROM subcategory_course_codes sc
+        JOIN curriculum_subcategories sub ON sub.subcategory_id = sc.subcategory_id
+        JOIN main_categories mc ON mc.main_category_id = sub.main_category_id
+        WHERE sub.curriculum_id = :cid
+    """),
+
+    "explicit_groups": text("""
+        SELECT gcc.course_code_id, gcc.group_id
+        FROM major_elective_group_course_codes gcc
+        JOIN major_elective_groups g ON g.group_id = gcc.group_id
+        WHERE g.curriculum_id = :cid
+        ORDER BY gcc.group_id
+    """),
+
+    "code_ranges": text("""
+        SELECT r.subcategory_id, r.prefix, r.number_start, r.number_end, r.group_id
+        FROM course_code_ranges r
+        JOIN curriculum_subcategories sub ON sub.subcategory_id = r.subcategory_id
+        WHERE sub.curriculum_id = :cid
+    """),
+}
+SNAPSHOT_QUERIES = {
+    name: (stmt.bindparams(bindparam("cid", type_=Integer)) if ":cid" in stmt.text else stmt)
+    .execution_options(query_name=f"snapshot.{name}")
+    for name, stmt in SNAPSHOT_QUERIES.items()
+}
+
+
+def load_curriculum_snapshot(curriculum_id: int, db: Session) -> CurriculumSnapshot:
+    """
+    Reads all curriculum structure for one curriculum from the database.
+    """
+    rows = {
+        name: db.execute(stmt, {"cid": curriculum_id}).mappings().all()
+        for name, stmt in SNAPSHOT_QUERIES.items()
+    }
+    return build_curriculum_snapshot(curriculum_id, rows)
+
+
+def build_curriculum_snapshot(curriculum_id: int, rows: Dict[str, List[Any]]) -> CurriculumSnapshot:
+    """
+    Compiles the rows of every SNAPSHOT_QUERIES entry into a snapshot.
+    Shared by the sync and async loaders.
+    """
+    snapshot = CurriculumSnapshot(curriculum_id=curriculum_id, loaded_at=time.monotonic())
+
+    if rows["curriculum"]:
+        snapshot.total_required_credits = int(rows["curriculum"][0]["total_required_credits"] or 0)
+
+    for row in rows["required_by_category"]:
+        snapshot.required_by_category[row["main_category"]] = int(row["required_credits"])
+
+    # --------------------------------------------------------
+    # Major elective subcategory + rules
+    # --------------------------------------------------------
+    elective_subcat = rows["elective_subcategory"][0] if rows["elective_subcategory"] else None
+    snapshot.elective_subcategory_id = int(elective_subcat["subcategory_id"]) if elective_subcat else None
+
+    elective_rules = rows["elective_rules"][0] if rows["elective_rules"] else None
+    if elective_rules:
+        snapshot.elective_rules = {
+            "min_from_chosen_group": int(elective_rules["min_from_chosen_group"]),
+            "min_from_all_groups": int(elective_rules["min_from_all_groups"]),
+        }
+
+    # --------------------------------------------------------
+    # Candidates (specialized only)
+    # --------------------------------------------------------
+    for position, c in enumerate(rows["candidates"]):
+        snapshot.candidates.append({
+            "course_code": c["course_code"],
+            "course_code_id": int(c["course_code_id"]),
+            "course_id": int(c["course_id"]),
+            "course_name": c["course_name"],
+            "credits": int(c["credits"]),
+            "subcategory_id": int(c["subcategory_id"]),
+            "subcategory_name": c["subcategory_name"],
+            "min_credits_required": int(c["min_credits_required"]),
+        })
+        snapshot.credit_requirement_by_course_id[int(c["course_id"])] = int(c["min_credits_required"])
+        snapshot.candidate_positions_by_code_id.setdefault(int(c["course_code_id"]), []).append(position)
+        snapshot.candidate_positions_by_code.setdefault(c["course_code"].upper(), []).append(position)
+        if snapshot.elective_subcategory_id is None or int(c["subcategory_id"]) != snapshot.elective_subcategory_id:
+            snapshot.has_other_specialized = True
+
+    # course_prerequisites is global: keep only the edges of this
+    # curriculum's candidates, so bad rows elsewhere cannot affect it
+    candidate_course_ids = set(snapshot.credit_requirement_by_course_id)
+    for p in rows["prerequisites"]:
+        course_id = int(p["course_id"])
+        if course_id in candidate_course_ids:
+            snapshot.prereq_map.setdefault(course_id, []).append(int(p["prerequisite_course_id"]))
+
+    # a cycle is logged and its courses rank last (see PrerequisiteGraph)
+    snapshot.prereq_graph = PrerequisiteGraph(snapshot.prereq_map)
+    for c in snapshot.candidates:
+        snapshot.course_rank_by_code.setdefault(c["course_code"], snapshot.prereq_graph.rank(c["course_id"]))
+
+    if ELIGIBILITY_ENGINE == "numpy" and numpy_available():
+        snapshot.eligibility_index = EligibilityIndex(snapshot.candidates, snapshot.prereq_map)
+
+    for row in rows["min_grades"]:
+        snapshot.min_grade_by_course_id[int(row["course_id"])] = row["required_grade"] or "D"
+
+    for row in rows["subcategory_links"]:
+        ccid = int(row["course_code_id"])
+        subid = int(row["subcategory_id"])
+        snapshot.subcategory_links_by_code_id.setdefault(ccid, []).append((subid, row["main_category"]))
+        if snapshot.elective_subcategory_id and subid == snapshot.elective_subcategory_id:
+            snapshot.elective_course_code_ids.add(ccid)
+
+    # --------------------------------------------------------
+    # Elective group resolver (explicit mapping + code ranges)
+    # --------------------------------------------------------
+    if snapshot.elective_subcategory_id:
+        explicit: Dict[int, int] = {}
+        for row in rows["explicit_groups"]:
+            # keep the first mapping, like the old LIMIT 1 lookup
+            explicit.setdefault(int(row["course_code_id"]), int(row["group_id"]))
+
+        snapshot.group_resolver = ElectiveGroupResolver(
+            explicit=explicit,
+            ranges=[
+                (r["prefix"], r["number_start"], r["number_end"], r["group_id"])
+                for r in rows["code_ranges"]
+                if int(r["subcategory_id"]) == snapshot.elective_subcategory_id
+            ]
+        )
+
+    return snapshot
+
+
+async def load_curriculum_snapshot_async(curriculum_id: int) -> CurriculumSnapshot:
+    """
+    Async loader: every structural query in sequence on one pooled
+    connection, so a cold load (one per curriculum, see the single-flight
+    lock below) never holds more than one connection of the pool.
+    """
+    rows = await async_fetch_batch(SNAPSHOT_QUERIES, {"cid": curriculum_id})
+    return build_curriculum_snapshot(curriculum_id, rows)
+
+
+# ============================================================
+# Process-wide cache
+# ============================================================
+
+_snapshots: Dict[int, CurriculumSnapshot] = {}
+_snapshots_lock = threading.Lock()
+
+# one asyncio.Lock per curriculum: on a miss or expiry a single request
+# loads the snapshot while the others await it
+_async_load_locks: Dict[int, asyncio.Lock] = {}
+
+
+def _fresh_snapshot(curriculum_id: int) -> Optional[CurriculumSnapshot]:
+    snapshot = _snapshots.get(curriculum_id)
+    if snapshot and time.monotonic() - snapshot.loaded_at < CURRICULUM_SNAPSHOT_TTL_SECONDS:
+        return snapshot
+    return None
+
+
+def get_curriculum_snapshot(curriculum_id: int, db: Session) -> CurriculumSnapshot:
+    """
+    Returns the cached snapshot for a curriculum, loading it on first use
+    or when it is older than CURRICULUM_SNAPSHOT_TTL_SECONDS.
+    """
+    snapshot = _fresh_snapshot(curriculum_id)
+    if snapshot:
+        return snapshot
+
+    with _snapshots_lock:
+        # another thread may have reloaded it while we waited
+        snapshot = _fresh_snapshot(curriculum_id)
+        if snapshot:
+            return snapshot
+
+        snapshot = load_curriculum_snapshot(curriculum_id, db)
+        _snapshots[curriculum_id] = snapshot
+        return snapshot
+
+
+async def get_curriculum_snapshot_async(curriculum_id: int) -> CurriculumSnapshot:
+    """
+    Async counterpart of get_curriculum_snapshot, sharing the same cache.
+    """
+    snapshot = _fresh_snapshot(curriculum_id)
+    if snapshot:
+        return snapshot
+
+    async with _async_load_locks.setdefault(curriculum_id, asyncio.Lock()):
+        # another request may have loaded it while we waited
+        snapshot = _fresh_snapshot(curriculum_id)
+        if snapshot:
+            return snapshot
+
+        snapshot = await load_curriculum_snapshot_async(curriculum_id)
+        with _snapshots_lock:
+            _snapshots[curriculum_id] = snapshot
+        return snapshot
+
+
+def invalidate_curriculum_snapshots(curriculum_id: Optional[int] = None) -> None:
+    """
+    Drops cached snapshots (all of them when curriculum_id is None).
+    Call after any change to courses or curriculum structure.
+    """
+    with _snapshots_lock:
+        if curriculum_id is None:
+            _snapshots.clear()
+        else:
+            _snapshots.pop(curriculum_id, None)
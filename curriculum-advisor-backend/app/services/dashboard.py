@@ -0,0 +1,39 @@
+# app/services/dashboard.py
+
+from __future__ import annotations
+
+from typing import Optional, Dict, Any, List
+
+from .advising import recommendations_for_context
+from .graduation_audit import graduation_audit_for_context
+from .session_context import load_session_context_async
+
+
+async def build_dashboard_async(
+    session_id: int,
+    max_credits: int = 18,
+    offered_courses: Optional[List[str]] = None,
+    term: Optional[str] = None,
+    min_version: Optional[int] = None
+) -> Dict[str, Any]:
+    """
+    Recommendations + graduation audit over one SessionContext: the
+    session row, snapshot and (when needed) attempts are loaded once and
+    shared by both engines.
+    """
+    ctx = await load_session_context_async(session_id, min_version)
+
+    if ctx is None:
+        return {"error": "Session not found"}
+
+    recommendations = await recommendations_for_context(ctx, max_credits, offered_courses, term)
+    if "error" in recommendations:
+        return recommendations
+
+    audit = await graduation_audit_for_context(ctx)
+
+    return {
+        "session_id": session_id,
+        "recommendations": recommendations,
+        "graduation_audit": audit
+    }
@@ -0,0 +1,181 @@
+# app/services/demand_forecast.py
+
+from __future__ import annotations
+
+from typing import Optional, Dict, Any, List, Iterator, FrozenSet
+
+from .advising import evaluate_recommendations
+from .cohort import CohortInputs, iter_cohort_chunks, get_cohort_executor
+from .curriculum_snapshot import CurriculumSnapshot
+from .seminars import SeminarProgress
+
+
+# ============================================================
+# Course demand forecast (cohort aggregate)
+# ============================================================
+#
+# Every session of the cohort goes through evaluate_recommendations (the
+# same engine as the per-session endpoint) on bulk-loaded inputs; workers
+# only send back per-course counters, never the per-session results.
+
+# bucket keys of bucket_candidates, used as counter names
+BUCKET_COUNTERS = (
+    "eligible",
+    "blocked_by_prerequisite",
+    "blocked_by_credit_requirement",
+    "already_completed",
+)
+COUNTERS = BUCKET_COUNTERS + ("planned",)
+
+# next_semester_plan placeholders: not real courses, counted separately
+PLACEHOLDER_CODES = {"GE", "FE"}
+
+
+def _new_course_row(item: dict) -> Dict[str, Any]:
+    row = {
+        "course_code": item["course_code"],
+        "course_name": item.get("course_name"),
+        "credits": int(item.get("credits", 0)),
+    }
+    row.update((counter, 0) for counter in COUNTERS)
+    return row
+
+
+def _iter_bucket_items(section: Any) -> Iterator[tuple]:
+    """
+    Yields (counter, item) for every course listed in an
+    eligible_specialized_by_subcategory section, whatever its nesting
+    (Other Specialized Courses / Major Electives tracks).
+    """
+    if not isinstance(section, dict):
+        return
+    for key, value in section.items():
+        if key in BUCKET_COUNTERS and isinstance(value, list):
+            for item in value:
+                yield key, item
+        elif isinstance(value, dict):
+            yield from _iter_bucket_items(value)
+
+
+def tally_recommendation(result: Dict[str, Any], courses: Dict[str, dict], placeholders: Dict[str, int]) -> None:
+    """
+    Adds one session's recommendation result to the counters. A course is
+    counted at most once per session and counter.
+    """
+    seen = set()
+
+    for counter, item in _iter_bucket_items(result.get("eligible_specialized_by_subcategory")):
+        code = item["course_code"]
+        if (code, counter) in seen:
+            continue
+        seen.add((code, counter))
+
+        row = courses.get(code)
+        if row is None:
+            row = courses[code] = _new_course_row(item)
+        row[counter] += 1
+
+    for item in result.get("next_semester_plan", {}).get("recommended_courses", []):
+        code = item["course_code"]
+        if code in PLACEHOLDER_CODES:
+            placeholders[code] = placeholders.get(code, 0) + 1
+            continue
+        if (code, "planned") in seen:
+            continue
+        seen.add((code, "planned"))
+
+        row = courses.get(code)
+        if row is None:
+            row = courses[code] = _new_course_row(item)
+        row["planned"] += 1
+
+
+def _forecast_chunk(
+    snapshot: CurriculumSnapshot,
+    seminar_catalog: SeminarProgress,
+    items: List[tuple],
+    max_credits: int,
+    offered_courses: Optional[List[str]],
+    offered_course_code_ids: Optional[FrozenSet[int]] = None
+) -> Dict[str, Any]:
+    """
+    Runs in a worker process. Returns the chunk's counters.
+    """
+    courses: Dict[str, dict] = {}
+    placeholders: Dict[str, int] = {}
+
+    for session_id, attempts, chosen_group_id in items:
+        tally_recommendation(evaluate_recommendations(
+            session_id=session_id,
+            snapshot=snapshot,
+            attempts=attempts,
+            chosen_group_id=chosen_group_id,
+            seminar_progress=seminar_catalog.with_attempts(attempts),
+            max_credits=max_credits,
+            offered_courses=offered_courses,
+            offered_course_code_ids=offered_course_code_ids
+        ), courses, placeholders)
+
+    return {"session_count": len(items), "courses": courses, "placeholders": placeholders}
+
+
+def _merge(total: Dict[str, Any], part: Dict[str, Any]) -> None:
+    total["session_count"] += part["session_count"]
+
+    for code, row in part["courses"].items():
+        current = total["courses"].get(code)
+        if current is None:
+            total["courses"][code] = dict(row)
+            continue
+        for counter in COUNTERS:
+            current[counter] += row[counter]
+
+    for code, count in part["placeholders"].items():
+        total["placeholders"][code] = total["placeholders"].get(code, 0) + count
+
+
+def build_demand_forecast(
+    inputs: CohortInputs,
+    max_credits: int = 18,
+    offered_courses: Optional[List[str]] = None,
+    offered_course_code_ids: Optional[FrozenSet[int]] = None
+) -> Dict[str, Any]:
+    """
+    Per-course demand over the cohort: how many students are eligible,
+    how many would get the course in their next semester plan, and how
+    many are blocked (by reason) or already done. Courses are ordered by
+    planned, then eligible demand.
+    """
+    total: Dict[str, Any] = {"session_count": 0, "courses": {}, "placeholders": {}}
+    chunks = list(iter_cohort_chunks(inputs))
+
+    if len(chunks) <= 1:
+        for snapshot, items in chunks:
+            _merge(total, _forecast_chunk(
+                snapshot, inputs.seminar_catalog, items, max_credits, offered_courses, offered_course_code_ids
+            ))
+    else:
+        executor = get_cohort_executor()
+        futures = [
+            executor.submit(
+                _forecast_chunk, snapshot, inputs.seminar_catalog, items, max_credits, offered_courses, offered_course_code_ids
+            )
+            for snapshot, items in chunks
+        ]
+        for future in futures:
+            _merge(total, future.result())
+
+    courses = sorted(
+        total["courses"].values(),
+        key=lambda r: (-r["planned"], -r["eligible"], r["course_code"])
+    )
+
+    return {
+        "session_count": total["session_count"],
+        "max_credits": max_credits,
+        "courses": courses,
+        "placeholders": {
+            "general_education": total["placeholders"].get("GE", 0),
+            "free_elective": total["placeholders"].get("FE", 0),
+        },
+    }
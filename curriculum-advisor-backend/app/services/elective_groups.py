@@ -0,0 +1,81 @@
+# app/services/elective_groups.py
+
+from __future__ import annotations
+
+import re
+from bisect import bisect_right
+from typing import Optional, Dict, List, Tuple, Iterable
+
+COURSE_CODE_PATTERN = re.compile(r"^([A-Za-z]+)(\d+)$")
+
+
+class ElectiveGroupResolver:
+    """
+    Resolves a major elective course to its group_id without touching the DB.
+
+    1) explicit mapping: course_code_id -> group_id (hash lookup)
+    2) range mapping: per-prefix table of (number_start, number_end, group_id)
+       sorted by number_start, searched with bisect
+    """
+
+    def __init__(
+        self,
+        explicit: Optional[Dict[int, int]] = None,
+        ranges: Iterable[Tuple[str, int, int, Optional[int]]] = ()
+    ):
+        self.explicit: Dict[int, int] = dict(explicit or {})
+
+        by_prefix: Dict[str, List[Tuple[int, int, Optional[int]]]] = {}
+        for prefix, number_start, number_end, group_id in ranges:
+            by_prefix.setdefault(prefix.strip().upper(), []).append(
+                (int(number_start), int(number_end), group_id)
+            )
+
+        self._starts: Dict[str, List[int]] = {}
+        self._intervals: Dict[str, List[Tuple[int, int, Optional[int]]]] = {}
+        # running max of number_end, lets overlapping ranges stop the scan early
+        self._max_ends: Dict[str, List[int]] = {}
+
+        for prefix, intervals in by_prefix.items():
+            intervals.sort(key=lambda r: (r[0], r[1]))
+            max_ends = []
+            running = -1
+            for _, number_end, _ in intervals:
+                running = max(running, number_end)
+                max_ends.append(running)
+
+            self._intervals[prefix] = intervals
+            self._starts[prefix] = [r[0] for r in intervals]
+            self._max_ends[prefix] = max_ends
+
+    def resolve_range(self, course_code: str) -> Optional[int]:
+        m = COURSE_CODE_PATTERN.match(course_code.strip())
+        if not m:
+            return None
+
+        prefix = m.group(1).upper()
+        num = int(m.group(2))
+
+        starts = self._starts.get(prefix)
+        if not starts:
+            return None
+
+        intervals = self._intervals[prefix]
+        max_ends = self._max_ends[prefix]
+
+        # last interval starting at or before num, then walk back over overlaps
+        i = bisect_right(starts, num) - 1
+        while i >= 0 and max_ends[i] >= num:
+            number_start, number_end, group_id = intervals[i]
+            if number_end >= num and group_id:
+                return int(group_id)
+            i -= 1
+
+        return None
+
+    def resolve(self, course_code_id: int, course_code: str) -> Optional[int]:
+        g = self.explicit.get(course_code_id)
+        if g:
+            return g
+
+        return self.resolve_range(course_code)
@@ -0,0 +1,97 @@
+# app/services/eligibility.py
+
+from __future__ import annotations
+
+from typing import Dict, Any, List, Iterable
+
+try:
+    import numpy as np
+except ImportError:  # optional: classify_candidates falls back to the Python loop
+    np = None
+
+
+# ============================================================
+# Vectorized candidate classification
+# ============================================================
+
+# classification codes, in the order classify_candidates checks them
+REASONS = ("completed", "credit", "prereq", "eligible")
+COMPLETED, CREDIT, PREREQ, ELIGIBLE = range(4)
+
+
+def numpy_available() -> bool:
+    return np is not None
+
+
+class EligibilityIndex:
+    """
+    Dense index over every course a curriculum's candidates mention.
+
+    - passed / in-progress courses are boolean masks over the index
+    - prerequisites are a CSR matrix (candidate row -> prerequisite columns)
+      stored as prereq_indptr / prereq_indices
+
+    Masks may carry leading batch dimensions (students, simulated terms),
+    so a whole cohort is classified in the same handful of operations.
+    """
+
+    def __init__(self, candidates: List[Dict[str, Any]], prereq_map: Dict[int, List[int]]):
+        course_ids = {c["course_id"] for c in candidates}
+        for course_id, prereqs in prereq_map.items():
+            course_ids.add(course_id)
+            course_ids.update(prereqs)
+
+        self.position: Dict[int, int] = {cid: i for i, cid in enumerate(sorted(course_ids))}
+        self.size = len(self.position)
+        self.candidate_count = len(candidates)
+
+        self.candidate_index = np.array([self.position[c["course_id"]] for c in candidates], dtype=np.intp)
+        self.min_credits = np.array([c["min_credits_required"] for c in candidates], dtype=np.int64)
+
+        indptr = [0]
+        indices: List[int] = []
+        for c in candidates:
+            indices.extend(self.position[p] for p in prereq_map.get(c["course_id"], []))
+            indptr.append(len(indices))
+
+        self.prereq_indptr = np.array(indptr, dtype=np.intp)
+        self.prereq_indices = np.array(indices, dtype=np.intp)
+
+    def mask(self, course_ids: Iterable[int]) -> "np.ndarray":
+        """
+        Boolean mask over the index; ids outside the curriculum are ignored.
+        """
+        m = np.zeros(self.size, dtype=bool)
+        idx = [self.position[c] for c in course_ids if c in self.position]
+        if idx:
+            m[idx] = True
+        return m
+
+    def classify_codes(self, passed: "np.ndarray", in_progress: "np.ndarray", earned_credits) -> "np.ndarray":
+        """
+        passed / in_progress: bool arrays [..., size]; earned_credits: scalar
+        or array [...]. Returns int8 codes [..., candidate_count].
+        """
+        earned = np.asarray(earned_credits)[..., None]
+
+        # missing prerequisites per candidate: row sums of the CSR matrix
+        # over ~passed, via a prefix sum so empty rows need no special case
+        missing = (~passed[..., self.prereq_indices]).astype(np.int32)
+        prefix = np.concatenate(
+            [np.zeros(missing.shape[:-1] + (1,), dtype=np.int32), np.cumsum(missing, axis=-1, dtype=np.int32)],
+            axis=-1
+        )
+        blocked = prefix[..., self.prereq_indptr[1:]] > prefix[..., self.prereq_indptr[:-1]]
+
+        done = (passed | in_progress)[..., self.candidate_index]
+
+        # later assignments win, mirroring the if / elif order
+        codes = np.full(done.shape, ELIGIBLE, dtype=np.int8)
+        codes[blocked] = PREREQ
+        codes[np.broadcast_to(earned < self.min_credits, done.shape)] = CREDIT
+        codes[done] = COMPLETED
+        return codes
+
+    def classify(self, passed_course_ids: set, in_progress_course_ids: set, earned_credits: int) -> List[str]:
+        codes = self.classify_codes(self.mask(passed_course_ids), self.mask(in_progress_course_ids), earned_credits)
+        return [REASONS[c] for c in codes.tolist()]
@@ -0,0 +1,137 @@
+# app/services/grade_ranks.py
+
+from __future__ import annotations
+
+from sqlalchemy.orm import Session
+from sqlalchemy import text
+from typing import Optional, Dict, Any, List
+
+from .grading import GRADE_RANK, SPECIAL_PASS, SPECIAL_FAIL, is_passing
+from .curriculum_snapshot import get_curriculum_snapshot
+from .progress_summary import summarize_session_progress
+from .transcript import load_session_attempts
+
+
+# ============================================================
+# Database-side pass/fail (grade_ranks + grade_is_passing())
+# ============================================================
+
+# passed courses and earned credits for many sessions, computed in
+# Postgres without shipping attempt rows (same rules as the audit)
+SESSION_PASS_AGGREGATES_SQL = text("""
+    SELECT
+        a.session_id,
+        COALESCE(SUM(c.credits) FILTER (
+            WHERE NOT c.is_ethics_seminar
+              AND grade_is_passing(a.grade, COALESCE(mg.min_required_grade::text, 'D'))
+        ), 0) AS earned_credits,
+        COALESCE(ARRAY_AGG(DISTINCT c.course_id) FILTER (
+            WHERE grade_is_passing(a.grade, COALESCE(mg.min_required_grade::text, 'D'))
+        ), '{}') AS passed_course_ids
+    FROM session_course_attempts a
+    JOIN advising_sessions s ON s.session_id = a.session_id
+    JOIN course_codes cc ON cc.course_code_id = a.course_code_id
+    JOIN courses c ON c.course_id = cc.course_id
+    LEFT JOIN curriculum_course_min_grades mg
+        ON mg.curriculum_id = s.curriculum_id
+        AND mg.course_id = c.course_id
+    WHERE a.session_id = ANY(:sids)
+    GROUP BY a.session_id
+""").execution_options(query_name="grade_ranks.session_pass_aggregates")
+
+
+def load_session_pass_aggregates(session_ids: List[int], db: Session) -> Dict[int, Dict[str, Any]]:
+    """
+    {session_id: {"earned_credits": int, "passed_course_ids": set}} in one
+    query. Sessions without attempts are omitted.
+    """
+    rows = db.execute(SESSION_PASS_AGGREGATES_SQL, {"sids": list(session_ids)}).mappings().all()
+    return {
+        int(r["session_id"]): {
+            "earned_credits": int(r["earned_credits"]),
+            "passed_course_ids": {int(cid) for cid in r["passed_course_ids"]},
+        }
+        for r in rows
+    }
+
+
+# ============================================================
+# Consistency check (Python is_passing vs grade_is_passing())
+# ============================================================
+
+GRADE_PAIRS_SQL = text("""
+    SELECT
+        p.student_grade,
+        p.required_grade,
+        grade_is_passing(p.student_grade, p.required_grade) AS passing
+    FROM unnest(CAST(:student AS TEXT[]), CAST(:required AS TEXT[]))
+        AS p(student_grade, required_grade)
+""").execution_options(query_name="grade_ranks.grade_pairs")
+
+CONSISTENCY_SAMPLE_SQL = text("""
+    SELECT session_id, curriculum_id
+    FROM advising_sessions
+    ORDER BY session_id DESC
+    LIMIT :limit
+""").execution_options(query_name="grade_ranks.consistency_sample")
+
+
+def grade_check_values() -> List[str]:
+    """
+    Every known grade, plus spelling variants and unknown values.
+    """
+    known = list(GRADE_RANK) + sorted(SPECIAL_PASS | SPECIAL_FAIL)
+    return known + [g.lower() for g in known] + [f" {g} " for g in known] + ["", "X", "E", "INC"]
+
+
+def check_grade_rank_consistency(db: Session, sample_sessions: Optional[int] = 50) -> Dict[str, Any]:
+    """
+    1) Every (student grade, required grade) pair: grade_is_passing() must
+       equal is_passing().
+    2) For the most recent sessions: earned credits and passed courses from
+       SESSION_PASS_AGGREGATES_SQL must equal the Python computation.
+    """
+    values = grade_check_values()
+    student = [s for s in values for _ in values]
+    required = [r for _ in values for r in values]
+
+    mismatches: List[Dict[str, Any]] = []
+
+    for r in db.execute(GRADE_PAIRS_SQL, {"student": student, "required": required}).mappings():
+        expected = is_passing(r["student_grade"], r["required_grade"])
+        if bool(r["passing"]) != expected:
+            mismatches.append({
+                "student_grade": r["student_grade"],
+                "required_grade": r["required_grade"],
+                "python": expected,
+                "sql": r["passing"]
+            })
+
+    sessions = db.execute(CONSISTENCY_SAMPLE_SQL, {"limit": sample_sessions or 0}).mappings().all()
+    aggregates = load_session_pass_aggregates([int(s["session_id"]) for s in sessions], db)
+
+    for s in sessions:
+        session_id = int(s["session_id"])
+        snapshot = get_curriculum_snapshot(int(s["curriculum_id"]), db)
+        attempts = load_session_attempts(session_id, db)
+
+        expected_earned = summarize_session_progress(snapshot, attempts)["earned_credits"]
+        expected_passed = {
+            int(a["course_id"]) for a in attempts
+            if is_passing(a["grade"], snapshot.required_grade(int(a["course_id"])))
+        }
+        got = aggregates.get(session_id, {"earned_credits": 0, "passed_course_ids": set()})
+
+        if got["earned_credits"] != expected_earned or got["passed_course_ids"] != expected_passed:
+            mismatches.append({
+                "session_id": session_id,
+                "python": {"earned_credits": expected_earned, "passed_course_ids": sorted(expected_passed)},
+                "sql": {"earned_credits": got["earned_credits"], "passed_course_ids": sorted(got["passed_course_ids"])}
+            })
+
+    return {
+        "consistent": not mismatches,
+        "grade_pairs_checked": len(student),
+        "sessions_checked": len(sessions),
+        "mismatches": mismatches
+    }
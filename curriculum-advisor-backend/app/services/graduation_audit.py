@@ -1,10 +1,17 @@
 # app/services/graduation_audit.py
 
 from sqlalchemy.orm import Session
-from sqlalchemy import text
-from typing import Dict, Any
+from typing import Optional, Dict, Any, List
 
-from .grading import is_passing
+from .curriculum_snapshot import CurriculumSnapshot, get_curriculum_snapshot
+from .progress_summary import (
+    SESSION_PROGRESS_SQL,
+    summarize_session_progress,
+    summary_from_row,
+)
+from .seminars import SeminarProgress, seminar_audit
+from .session_context import SessionContext, load_session_context_async
+from .transcript import load_session_attempts
 
 
 def run_graduation_audit(session_id: int, db: Session) -> Dict[str, Any]:
@@ -14,69 +21,106 @@ def run_graduation_audit(session_id: int, db: Session) -> Dict[str, Any]:
     1) Total earned credits
     2) Main category credit requirements
     3) Professional Ethics Seminar completion (S only)
+
+    Reads the session's progress summary; falls back to the attempts
+    when the summary is missing or stale.
     """
 
     # --------------------------------------------------
-    # 1) Load advising session
+    # 1) Load advising session + stored summary
     # --------------------------------------------------
-    session_row = db.execute(
-        text("""
-            SELECT session_id, curriculum_id
-            FROM advising_sessions
-            WHERE session_id = :sid
-        """),
-        {"sid": session_id}
-    ).mappings().first()
-
-    if not session_row:
+    row = db.execute(SESSION_PROGRESS_SQL, {"sid": session_id}).mappings().first()
+
+    if not row:
+        return {"error": "Session not found"}
+
+    snapshot = get_curriculum_snapshot(int(row["curriculum_id"]), db)
+
+    summary = summary_from_row(row)
+    if summary is None:
+        summary = summarize_session_progress(snapshot, load_session_attempts(session_id, db))
+
+    return evaluate_graduation_audit_summary(
+        session_id=session_id,
+        snapshot=snapshot,
+        summary=summary,
+        seminar_required_total=int(row["seminar_required_total"])
+    )
+
+
+async def run_graduation_audit_async(session_id: int, min_version: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Async variant of run_graduation_audit.
+    """
+    ctx = await load_session_context_async(session_id, min_version)
+
+    if ctx is None:
         return {"error": "Session not found"}
 
-    curriculum_id = int(session_row["curriculum_id"])
+    return await graduation_audit_for_context(ctx)
+
+
+async def graduation_audit_for_context(ctx: SessionContext) -> Dict[str, Any]:
+    """
+    A fresh stored summary makes this free; otherwise the summary is
+    rebuilt in memory from the context's attempts (loaded once, shared
+    with the recommendation engine). Read-only: the summary is only
+    written by the transcript write paths.
+    """
+    summary = ctx.summary
+    if summary is None:
+        await ctx.load(attempts=True)
+        summary = summarize_session_progress(ctx.snapshot, ctx.attempts)
+        ctx.summary = summary
+
+    return evaluate_graduation_audit_summary(
+        session_id=ctx.session_id,
+        snapshot=ctx.snapshot,
+        summary=summary,
+        seminar_required_total=ctx.seminar_required_total
+    )
+
+
+def evaluate_graduation_audit(
+    session_id: int,
+    snapshot: CurriculumSnapshot,
+    attempts: List[Any],
+    seminar_progress: SeminarProgress
+) -> Dict[str, Any]:
+    """
+    Pure audit engine over already-loaded attempts.
+    """
+    summary = summarize_session_progress(snapshot, attempts)
+    summary["seminars_completed"] = len(seminar_progress.completed_course_ids)
+
+    return evaluate_graduation_audit_summary(
+        session_id=session_id,
+        snapshot=snapshot,
+        summary=summary,
+        seminar_required_total=seminar_progress.required_total
+    )
+
+
+def evaluate_graduation_audit_summary(
+    session_id: int,
+    snapshot: CurriculumSnapshot,
+    summary: Dict[str, Any],
+    seminar_required_total: int
+) -> Dict[str, Any]:
+    """
+    Pure audit engine over a session progress summary.
+    """
+    curriculum_id = snapshot.curriculum_id
 
     # --------------------------------------------------
-    # 2) Load passed courses + required grade
+    # 2) Earned credits (passing, non-seminar)
     # --------------------------------------------------
-    attempts = db.execute(text("""
-        SELECT
-            a.grade,
-            cc.course_code,
-            cc.course_code_id,
-            c.course_id,
-            c.credits,
-            c.is_ethics_seminar,
-            COALESCE(mg.min_required_grade::text, 'D') AS required_grade
-        FROM session_course_attempts a
-        JOIN course_codes cc ON cc.course_code_id = a.course_code_id
-        JOIN courses c ON c.course_id = cc.course_id
-        LEFT JOIN curriculum_course_min_grades mg
-            ON mg.curriculum_id = :cid
-            AND mg.course_id = c.course_id
-        WHERE a.session_id = :sid
-    """), {"sid": session_id, "cid": curriculum_id}).mappings().all()
-
-    passed_course_ids = set()
-    earned_credits = 0
-
-    for row in attempts:
-        # Seminar rule: only grade 'S' counts
-        if row["is_ethics_seminar"]:
-            if row["grade"] == "S":
-                passed_course_ids.add(int(row["course_id"]))
-        else:
-            if is_passing(row["grade"], row["required_grade"]):
-                passed_course_ids.add(int(row["course_id"]))
-                earned_credits += int(row["credits"])
+    earned_credits = summary["earned_credits"]
 
     # --------------------------------------------------
-    # 3) Load total required credits
+    # 3) Total required credits
     # --------------------------------------------------
-    total_required_row = db.execute(text("""
-        SELECT total_required_credits
-        FROM curriculums
-        WHERE curriculum_id = :cid
-    """), {"cid": curriculum_id}).mappings().first()
-
-    total_required = int(total_required_row["total_required_credits"])
+    total_required = snapshot.total_required_credits
     total_remaining = max(0, total_required - earned_credits)
     total_status = "COMPLETED" if total_remaining == 0 else "INCOMPLETE"
 
@@ -85,41 +129,9 @@ def run_graduation_audit(session_id: int, db: Session) -> Dict[str, Any]:
     # --------------------------------------------------
     # 4) Main Category Credit Audit
     # --------------------------------------------------
-    required_by_category = {}
-
-    required_rows = db.execute(text("""
-        SELECT 
-            mc.name AS main_category,
-            cmc.required_credits
-        FROM curriculum_main_categories cmc
-        JOIN main_categories mc 
-            ON mc.main_category_id = cmc.main_category_id
-        WHERE cmc.curriculum_id = :cid
-    """), {"cid": curriculum_id}).mappings().all()
-
-    for row in required_rows:
-        required_by_category[row["main_category"]] = int(row["required_credits"])
-
-    earned_by_category = {}
-
-    category_credit_rows = db.execute(text("""
-        SELECT 
-            mc.name AS main_category,
-            SUM(c.credits) AS earned_credits
-        FROM session_course_attempts a
-        JOIN course_codes cc ON cc.course_code_id = a.course_code_id
-        JOIN courses c ON c.course_id = cc.course_id
-        JOIN subcategory_course_codes sc ON sc.course_code_id = cc.course_code_id
-        JOIN curriculum_subcategories sub ON sub.subcategory_id = sc.subcategory_id
-        JOIN main_categories mc ON mc.main_category_id = sub.main_category_id
-        WHERE a.session_id = :sid
-          AND sub.curriculum_id = :cid
-          AND c.is_ethics_seminar = FALSE
-        GROUP BY mc.name
-    """), {"sid": session_id, "cid": curriculum_id}).mappings().all()
-
-    for row in category_credit_rows:
-        earned_by_category[row["main_category"]] = int(row["earned_credits"])
+    required_by_category = snapshot.required_by_category
+
+    earned_by_category = summary["earned_by_category"]
 
     category_audit = []
 
@@ -139,35 +151,8 @@ def run_graduation_audit(session_id: int, db: Session) -> Dict[str, Any]:
     # --------------------------------------------------
     # 5) Seminar Audit (0 credit, mandatory)
     # --------------------------------------------------
-    seminar_total_row = db.execute(text("""
-        SELECT COUNT(*) AS total
-        FROM courses
-        WHERE is_ethics_seminar = TRUE
-          AND is_active = TRUE
-    """)).mappings().first()
-
-    seminar_total = int(seminar_total_row["total"])
-
-    seminar_completed_row = db.execute(text("""
-        SELECT COUNT(DISTINCT c.course_id) AS completed
-        FROM session_course_attempts a
-        JOIN course_codes cc ON cc.course_code_id = a.course_code_id
-        JOIN courses c ON c.course_id = cc.course_id
-        WHERE a.session_id = :sid
-          AND c.is_ethics_seminar = TRUE
-          AND a.grade = 'S'
-    """), {"sid": session_id}).mappings().first()
-
-    seminar_completed = int(seminar_completed_row["completed"])
-    seminar_remaining = max(0, seminar_total - seminar_completed)
-    seminar_status = "COMPLETED" if seminar_remaining == 0 else "INCOMPLETE"
-
-    seminar_audit = {
-        "required_total": seminar_total,
-        "completed": seminar_completed,
-        "remaining": seminar_remaining,
-        "status": seminar_status
-    }
+    seminar_result = seminar_audit(seminar_required_total, summary["seminars_completed"])
+    seminar_status = seminar_result["status"]
 
     # --------------------------------------------------
     # 6) Final Graduation Decision
@@ -199,6 +184,6 @@ def run_graduation_audit(session_id: int, db: Session) -> Dict[str, Any]:
             "status": total_status
         },
         "main_category_audit": category_audit,
-        "seminar_audit": seminar_audit,
+        "seminar_audit": seminar_result,
         "graduation_status": graduation_status
     }
\ No newline at end of file
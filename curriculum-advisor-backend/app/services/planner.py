@@ -0,0 +1,302 @@
+# app/services/planner.py
+
+from __future__ import annotations
+
+import asyncio
+from typing import Optional, Dict, Any, List
+
+from ..db import async_fetch_all, async_fetch_first, async_fetch_scalar
+from .advising import (
+    CONCENTRATION_SQL,
+    build_next_semester_plan,
+    classify_candidates,
+    bucket_candidates,
+    build_elective_progress,
+    elective_priority_state,
+)
+from .curriculum_snapshot import CurriculumSnapshot, get_curriculum_snapshot_async
+from .grading import is_passing
+from .graduation_audit import evaluate_graduation_audit
+from .seminars import SeminarProgress, SEMINAR_PROGRESS_SQL, build_seminar_progress
+from .session_context import replica_behind
+from .transcript import SESSION_SQL, SESSION_ATTEMPTS_SQL
+
+
+# ============================================================
+# Multi-semester path-to-graduation planner
+# ============================================================
+
+async def build_graduation_roadmap_async(
+    session_id: int,
+    max_credits: int = 18,
+    max_terms: int = 12,
+    min_version: Optional[int] = None
+) -> Dict[str, Any]:
+    params = {"sid": session_id}
+
+    async def fetch(primary: bool) -> tuple:
+        return await asyncio.gather(
+            async_fetch_first(SESSION_SQL, params, primary=primary),
+            async_fetch_all(SESSION_ATTEMPTS_SQL, params, primary=primary),
+            async_fetch_scalar(CONCENTRATION_SQL, params, primary=primary),
+            async_fetch_all(SEMINAR_PROGRESS_SQL, params, primary=primary),
+        )
+
+    s, attempts, chosen_group_id, seminar_rows = await fetch(False)
+    # replica behind the client's last upload: read everything again from the primary
+    if replica_behind(s, min_version):
+        s, attempts, chosen_group_id, seminar_rows = await fetch(True)
+
+    if not s:
+        return {"error": "Session not found"}
+
+    snapshot = await get_curriculum_snapshot_async(int(s["curriculum_id"]))
+
+    return simulate_graduation_roadmap(
+        session_id=session_id,
+        snapshot=snapshot,
+        attempts=attempts,
+        chosen_group_id=chosen_group_id,
+        seminar_progress=build_seminar_progress(seminar_rows),
+        max_credits=max_credits,
+        max_terms=max_terms
+    )
+
+
+def simulate_graduation_roadmap(
+    session_id: int,
+    snapshot: CurriculumSnapshot,
+    attempts: List[Any],
+    chosen_group_id: Optional[int],
+    seminar_progress: SeminarProgress,
+    max_credits: int = 18,
+    max_terms: int = 12
+) -> Dict[str, Any]:
+    """
+    Simulates term after term on the in-memory curriculum graph until the
+    run_graduation_audit conditions hold (or nothing more can be planned).
+
+    Each term:
+    - GE / FE placeholders (up to 3 credits each) while those categories are short
+    - specialized courses via build_next_semester_plan with the remaining budget
+    - the next Professional Ethics Seminar
+    Courses currently 'IP' are assumed passed before the first planned term.
+    """
+    chosen_group_id = int(chosen_group_id) if chosen_group_id else None
+    notes: List[str] = []
+
+    # --------------------------------------------------------
+    # Starting point: the real audit + passed courses
+    # --------------------------------------------------------
+    audit = evaluate_graduation_audit(
+        session_id=session_id,
+        snapshot=snapshot,
+        attempts=attempts,
+        seminar_progress=seminar_progress
+    )
+
+    earned_credits = audit["credit_audit"]["earned_credits"]
+    total_required = audit["credit_audit"]["required_credits"]
+    required_by_category = dict(snapshot.required_by_category)
+    earned_by_category = {c["main_category"]: c["earned_credits"] for c in audit["main_category_audit"]}
+
+    passed_course_ids = set()
+    passed_course_code_ids = set()
+    in_progress_credits = 0
+
+    for row in attempts:
+        grade = row["grade"].strip().upper()
+        course_id = int(row["course_id"])
+
+        if grade == "IP":
+            passed_course_ids.add(course_id)
+            passed_course_code_ids.add(int(row["course_code_id"]))
+            if not row["is_ethics_seminar"]:
+                # the audit already counts every attempt toward its category
+                in_progress_credits += int(row["credits"])
+        elif is_passing(row["grade"], snapshot.required_grade(course_id)):
+            passed_course_ids.add(course_id)
+            passed_course_code_ids.add(int(row["course_code_id"]))
+
+    if in_progress_credits:
+        earned_credits += in_progress_credits
+        notes.append(f"Assumes in-progress courses ({in_progress_credits} credits) are passed this term.")
+
+    seminar_done = set(seminar_progress.completed_course_ids)
+    seminars_taken_codes = seminar_progress.completed_codes | seminar_progress.in_progress_codes
+    for s in seminar_progress.seminars:
+        if s["course_code"] in seminars_taken_codes:
+            seminar_done.add(s["course_id"])
+
+    candidate_by_code: Dict[str, dict] = {}
+    code_by_code_id: Dict[int, str] = {}
+    for c in snapshot.candidates:
+        candidate_by_code.setdefault(c["course_code"], c)
+        code_by_code_id.setdefault(c["course_code_id"], c["course_code"])
+
+    # elective counts (courses, not credits)
+    chosen_done = 0
+    any_done = 0
+    if snapshot.elective_rules and snapshot.elective_subcategory_id:
+        for ccid in passed_course_code_ids & snapshot.elective_course_code_ids:
+            g = snapshot.group_resolver.resolve(ccid, code_by_code_id.get(ccid, ""))
+            if g is None:
+                continue
+            any_done += 1
+            if chosen_group_id and g == chosen_group_id:
+                chosen_done += 1
+
+    def add_credits(category: Optional[str], credits: int):
+        nonlocal earned_credits
+        earned_credits += credits
+        if category:
+            earned_by_category[category] = earned_by_category.get(category, 0) + credits
+
+    def remaining(category: str) -> int:
+        return max(0, required_by_category.get(category, 0) - earned_by_category.get(category, 0))
+
+    def graduation_met() -> bool:
+        if earned_credits < total_required:
+            return False
+        if any(remaining(cat) > 0 for cat in required_by_category):
+            return False
+        return len(seminar_done) >= seminar_progress.required_total
+
+    # --------------------------------------------------------
+    # Term loop
+    # --------------------------------------------------------
+    terms: List[Dict[str, Any]] = []
+    status = "INCOMPLETE"
+
+    for term_no in range(1, max_terms + 1):
+        if graduation_met():
+            status = "GRADUATION_REACHED"
+            break
+
+        courses: List[dict] = []
+        term_credits = 0
+
+        ge_slot = min(remaining("General Education"), 3)
+        fe_slot = min(remaining("Free Electives"), 3)
+
+        # specialized courses with what is left of the budget
+        if remaining("Specialized") > 0:
+            elective_progress = None
+            if snapshot.elective_rules and snapshot.elective_subcategory_id:
+                elective_progress = build_elective_progress(snapshot.elective_rules, chosen_group_id, chosen_done, any_done)
+
+            block_reasons = classify_candidates(
+                snapshot,
+                passed_course_ids=passed_course_ids,
+                in_progress_course_ids=set(),
+                earned_credits=earned_credits
+            )
+            plan = build_next_semester_plan(
+                eligible_by_subcat=bucket_candidates(snapshot, block_reasons, chosen_group_id),
+                elective_priority=elective_priority_state(elective_progress, chosen_group_id),
+                max_credits=max(0, max_credits - ge_slot - fe_slot),
+                course_rank=snapshot.course_rank_by_code
+            )
+            planned = plan["recommended_courses"]
+        else:
+            planned = []
+
+        # apply the term only after planning it (courses unlock next term)
+        for p in planned:
+            c = candidate_by_code[p["course_code"]]
+            passed_course_ids.add(c["course_id"])
+            passed_course_code_ids.add(c["course_code_id"])
+
+            for _, main_category in snapshot.subcategory_links_by_code_id.get(c["course_code_id"], []):
+                earned_by_category[main_category] = earned_by_category.get(main_category, 0) + c["credits"]
+            earned_credits += c["credits"]
+            term_credits += c["credits"]
+
+            if c["course_code_id"] in snapshot.elective_course_code_ids and snapshot.elective_rules:
+                g = snapshot.group_resolver.resolve(c["course_code_id"], c["course_code"])
+                if g is not None:
+                    any_done += 1
+                    if chosen_group_id and g == chosen_group_id:
+                        chosen_done += 1
+
+            courses.append(p)
+
+        if ge_slot > 0:
+            add_credits("General Education", ge_slot)
+            term_credits += ge_slot
+            courses.append({
+                "course_code": "GE",
+                "course_name": "General Education (Select 1 Course)",
+                "credits": ge_slot,
+                "source": "General Education"
+            })
+
+        if fe_slot > 0:
+            add_credits("Free Electives", fe_slot)
+            term_credits += fe_slot
+            courses.append({
+                "course_code": "FE",
+                "course_name": "Free Elective (Select 1 Course)",
+                "credits": fe_slot,
+                "source": "Free Elective"
+            })
+
+        # nothing specialized was possible: fill with free electives so the
+        # total keeps growing (e.g. to reach a credit requirement)
+        if not planned and earned_credits < total_required and term_credits < max_credits:
+            extra = min(max_credits - term_credits, total_required - earned_credits)
+            add_credits("Free Electives", extra)
+            term_credits += extra
+            courses.append({
+                "course_code": "FE",
+                "course_name": "Additional Free Electives",
+                "credits": extra,
+                "source": "Free Elective"
+            })
+
+        next_seminar = next((s for s in seminar_progress.seminars if s["course_id"] not in seminar_done), None)
+        if next_seminar:
+            seminar_done.add(next_seminar["course_id"])
+            courses.append({
+                "course_code": next_seminar["course_code"],
+                "course_name": next_seminar["course_name"],
+                "credits": int(next_seminar["credits"]),
+                "source": "Professional Ethics Seminar (Required)"
+            })
+
+        if not courses:
+            status = "STUCK"
+            notes.append("No further courses can be planned; check prerequisites and credit requirements.")
+            break
+
+        terms.append({
+            "term": term_no,
+            "total_credits": term_credits,
+            "courses": courses,
+            "earned_credits_after": earned_credits
+        })
+    else:
+        if graduation_met():
+            status = "GRADUATION_REACHED"
+        else:
+            notes.append(f"Graduation not reached within {max_terms} terms.")
+
+    return {
+        "session_id": session_id,
+        "curriculum_id": snapshot.curriculum_id,
+        "max_credits": max_credits,
+        "status": status,
+        "terms_needed": len(terms) if status == "GRADUATION_REACHED" else None,
+        "projected_earned_credits": earned_credits,
+        "projected_by_category": [
+            {
+                "main_category": cat,
+                "required_credits": required,
+                "earned_credits": earned_by_category.get(cat, 0),
+                "remaining_credits": remaining(cat),
+            }
+            for cat, required in required_by_category.items()
+        ],
+        "terms": terms,
+        "notes": notes
+    }
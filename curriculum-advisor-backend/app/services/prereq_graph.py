@@ -0,0 +1,98 @@
+# app/services/prereq_graph.py
+
+from __future__ import annotations
+
+import logging
+from collections import deque
+from typing import Dict, List, Tuple
+
+
+logger = logging.getLogger(__name__)
+
+# rank of a course on (or behind) a prerequisite cycle: below every real
+# rank, so the planner lists it last
+CYCLIC_RANK = (-1, -1)
+
+
+class PrerequisiteGraph:
+    """
+    Precomputed prerequisite DAG (built once per curriculum snapshot).
+
+    - topological_order: every course after all of its prerequisites
+    - ancestors[c]: all transitive prerequisites of c
+    - descendants[c]: all courses that transitively require c
+    - unlock_count[c]: len(descendants[c])
+    - depth[c]: length of the longest chain of courses still waiting on c
+      (critical path depth; 0 for a course nothing depends on)
+    - cyclic: courses on a prerequisite cycle or depending on one. No
+      student can take them; they are left out of the maps above and
+      rank last. A cycle is logged, never raised, so bad data only
+      blocks the courses involved.
+    """
+
+    def __init__(self, prereq_map: Dict[int, List[int]]):
+        self.prereqs: Dict[int, Tuple[int, ...]] = {c: tuple(ps) for c, ps in prereq_map.items()}
+        self.dependents: Dict[int, List[int]] = {}
+
+        nodes = set(self.prereqs)
+        for course_id, prereqs in self.prereqs.items():
+            for p in prereqs:
+                nodes.add(p)
+                self.dependents.setdefault(p, []).append(course_id)
+
+        # --------------------------------------------------------
+        # Kahn's algorithm; leftovers are on or behind a cycle
+        # --------------------------------------------------------
+        indegree = {n: len(self.prereqs.get(n, ())) for n in nodes}
+        queue = deque(sorted(n for n, d in indegree.items() if d == 0))
+        order: List[int] = []
+
+        while queue:
+            n = queue.popleft()
+            order.append(n)
+            for d in self.dependents.get(n, []):
+                indegree[d] -= 1
+                if indegree[d] == 0:
+                    queue.append(d)
+
+        self.cyclic: frozenset = frozenset(n for n, d in indegree.items() if d > 0)
+        if self.cyclic:
+            logger.warning("Prerequisite cycle between course_ids %s", sorted(self.cyclic))
+
+        self.topological_order: List[int] = order
+
+        # --------------------------------------------------------
+        # Transitive closure + critical path depth
+        # --------------------------------------------------------
+        self.ancestors: Dict[int, frozenset] = {}
+        for n in order:
+            acc = set()
+            for p in self.prereqs.get(n, ()):
+                acc.add(p)
+                acc |= self.ancestors[p]
+            self.ancestors[n] = frozenset(acc)
+
+        self.descendants: Dict[int, frozenset] = {}
+        self.depth: Dict[int, int] = {}
+        for n in reversed(order):
+            acc = set()
+            depth = 0
+            for d in self.dependents.get(n, []):
+                if d in self.cyclic:
+                    continue
+                acc.add(d)
+                acc |= self.descendants[d]
+                depth = max(depth, self.depth[d] + 1)
+            self.descendants[n] = frozenset(acc)
+            self.depth[n] = depth
+
+        self.unlock_count: Dict[int, int] = {n: len(ds) for n, ds in self.descendants.items()}
+
+    def rank(self, course_id: int) -> Tuple[int, int]:
+        """
+        Sort key (higher first): how many courses it unblocks, then how
+        long the chain behind it is. CYCLIC_RANK for cyclic courses.
+        """
+        if course_id in self.cyclic:
+            return CYCLIC_RANK
+        return (self.unlock_count.get(course_id, 0), self.depth.get(course_id, 0))
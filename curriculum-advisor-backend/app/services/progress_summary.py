@@ -0,0 +1,223 @@
+# app/services/progress_summary.py
+
+from __future__ import annotations
+
+import json
+from sqlalchemy.orm import Session
+from sqlalchemy import text, bindparam, BigInteger, Integer, Text
+from typing import Optional, Dict, Any, List
+
+from .grading import is_passing
+from .curriculum_snapshot import CurriculumSnapshot, get_curriculum_snapshot
+
+
+# ============================================================
+# Per-session progress aggregates (session_progress_summary)
+# ============================================================
+#
+# Written whenever a transcript is written, so the graduation audit is a
+# single-row read. A row is only trusted when its transcript_version
+# matches advising_sessions.transcript_version; otherwise (or when it is
+# missing, e.g. after a course edit) readers recompute it in memory from
+# the attempts. Readers never write it: only the transcript write paths
+# (replace_session_attempts, apply_transcript_delta, the registrar
+# import) do.
+
+def summarize_session_progress(snapshot: CurriculumSnapshot, attempts: List[Any]) -> Dict[str, Any]:
+    """
+    Aggregates one session's attempts (rows shaped like SESSION_ATTEMPTS_SQL).
+    - earned_credits: official credits of passing, non-seminar attempts
+    - earned_by_category / earned_by_subcategory: credits of every
+      non-seminar attempt (the audit's category rule)
+    - seminars_completed: seminar courses graded 'S'
+    """
+    earned_credits = 0
+    earned_by_category: Dict[str, int] = {}
+    earned_by_subcategory: Dict[str, int] = {}
+    seminar_course_ids = set()
+
+    for row in attempts:
+        course_id = int(row["course_id"])
+
+        if row["is_ethics_seminar"]:
+            if row["grade"] == "S":
+                seminar_course_ids.add(course_id)
+            continue
+
+        credits = int(row["credits"])
+        if is_passing(row["grade"], snapshot.required_grade(course_id)):
+            earned_credits += credits
+
+        for subcategory_id, main_category in snapshot.subcategory_links_by_code_id.get(int(row["course_code_id"]), []):
+            earned_by_category[main_category] = earned_by_category.get(main_category, 0) + credits
+            key = str(subcategory_id)
+            earned_by_subcategory[key] = earned_by_subcategory.get(key, 0) + credits
+
+    return {
+        "earned_credits": earned_credits,
+        "earned_by_category": earned_by_category,
+        "earned_by_subcategory": earned_by_subcategory,
+        "seminars_completed": len(seminar_course_ids),
+    }
+
+
+# session + its summary + the seminar requirement, in one row
+SESSION_PROGRESS_SQL = text("""
+    SELECT
+        s.session_id,
+        s.curriculum_id,
+        s.transcript_version,
+        p.transcript_version AS summary_version,
+        p.earned_credits,
+        p.earned_by_category,
+        p.earned_by_subcategory,
+        p.seminars_completed,
+        (
+            SELECT COUNT(*)
+            FROM courses c
+            WHERE c.is_ethics_seminar = TRUE
+              AND c.is_active = TRUE
+        ) AS seminar_required_total
+    FROM advising_sessions s
+    LEFT JOIN session_progress_summary p ON p.session_id = s.session_id
+    WHERE s.session_id = :sid
+""").bindparams(
+    bindparam("sid", type_=BigInteger)
+).execution_options(query_name="progress_summary.session_progress")
+
+# never replaces a newer summary: the audit may recompute from a lagging replica
+UPSERT_PROGRESS_SUMMARY_SQL = text("""
+    INSERT INTO session_progress_summary (
+        session_id,
+        transcript_version,
+        earned_credits,
+        earned_by_category,
+        earned_by_subcategory,
+        seminars_completed,
+        updated_at
+    )
+    VALUES (
+        :sid,
+        :version,
+        :earned,
+        CAST(:by_category AS JSONB),
+        CAST(:by_subcategory AS JSONB),
+        :seminars,
+        NOW()
+    )
+    ON CONFLICT (session_id) DO UPDATE
+    SET transcript_version = EXCLUDED.transcript_version,
+        earned_credits = EXCLUDED.earned_credits,
+        earned_by_category = EXCLUDED.earned_by_category,
+        earned_by_subcategory = EXCLUDED.earned_by_subcategory,
+        seminars_completed = EXCLUDED.seminars_completed,
+        updated_at = EXCLUDED.updated_at
+    WHERE session_progress_summary.transcript_version <= EXCLUDED.transcript_version
+""").bindparams(
+    bindparam("sid", type_=BigInteger),
+    bindparam("version", type_=BigInteger),
+    bindparam("earned", type_=Integer),
+    bindparam("by_category", type_=Text),
+    bindparam("by_subcategory", type_=Text),
+    bindparam("seminars", type_=Integer)
+).execution_options(query_name="progress_summary.upsert_progress_summary")
+
+# sessions whose attempts include the given course
+DELETE_SUMMARIES_FOR_COURSE_SQL = text("""
+    DELETE FROM session_progress_summary p
+    USING session_course_attempts a
+    JOIN course_codes cc ON cc.course_code_id = a.course_code_id
+    WHERE a.session_id = p.session_id
+      AND cc.course_id = :course_id
+""").bindparams(
+    bindparam("course_id", type_=Integer)
+).execution_options(query_name="progress_summary.delete_summaries_for_course")
+
+
+def summary_params(session_id: int, transcript_version: int, summary: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "sid": session_id,
+        "version": int(transcript_version),
+        "earned": summary["earned_credits"],
+        "by_category": json.dumps(summary["earned_by_category"]),
+        "by_subcategory": json.dumps(summary["earned_by_subcategory"]),
+        "seminars": summary["seminars_completed"],
+    }
+
+
+def summary_from_row(row: Any) -> Optional[Dict[str, Any]]:
+    """
+    The stored summary from a SESSION_PROGRESS_SQL row, or None when it is
+    missing or older than the session's transcript.
+    """
+    if row["summary_version"] is None or int(row["summary_version"]) != int(row["transcript_version"]):
+        return None
+
+    def as_dict(value):
+        # psycopg2 decodes JSONB, asyncpg hands back text
+        return json.loads(value) if isinstance(value, str) else dict(value or {})
+
+    return {
+        "earned_credits": int(row["earned_credits"]),
+        "earned_by_category": as_dict(row["earned_by_category"]),
+        "earned_by_subcategory": as_dict(row["earned_by_subcategory"]),
+        "seminars_completed": int(row["seminars_completed"]),
+    }
+
+
+def refresh_session_progress(
+    session_id: int,
+    curriculum_id: int,
+    transcript_version: int,
+    attempts: List[Any],
+    db: Session
+) -> Dict[str, Any]:
+    """
+    Recomputes and stores the summary from the session's current attempts.
+    Does not commit (runs inside the transcript write transaction).
+    """
+    snapshot = get_curriculum_snapshot(curriculum_id, db)
+    summary = summarize_session_progress(snapshot, attempts)
+    db.execute(UPSERT_PROGRESS_SUMMARY_SQL, summary_params(session_id, transcript_version, summary))
+    return summary
+
+
+def apply_progress_delta(
+    snapshot: CurriculumSnapshot,
+    summary: Dict[str, Any],
+    removed: List[Any],
+    added: List[Any]
+) -> Optional[Dict[str, Any]]:
+    """
+    summary - contribution of the `removed` attempt rows + contribution of
+    the `added` ones. None when a seminar attempt is involved: completed
+    seminars are counted per course, so the caller recomputes instead.
+    """
+    if any(row["is_ethics_seminar"] for row in (*removed, *added)):
+        return None
+
+    before = summarize_session_progress(snapshot, removed)
+    after = summarize_session_progress(snapshot, added)
+
+    def combine(current: Dict[str, int], minus: Dict[str, int], plus: Dict[str, int]) -> Dict[str, int]:
+        result = dict(current)
+        for key, value in minus.items():
+            result[key] = result.get(key, 0) - value
+        for key, value in plus.items():
+            result[key] = result.get(key, 0) + value
+        return {key: value for key, value in result.items() if value}
+
+    return {
+        "earned_credits": summary["earned_credits"] - before["earned_credits"] + after["earned_credits"],
+        "earned_by_category": combine(summary["earned_by_category"], before["earned_by_category"], after["earned_by_category"]),
+        "earned_by_subcategory": combine(summary["earned_by_subcategory"], before["earned_by_subcategory"], after["earned_by_subcategory"]),
+        "seminars_completed": summary["seminars_completed"],
+    }
+
+
+def invalidate_progress_for_course(course_id: int, db: Session) -> None:
+    """
+    Drops summaries that depend on a course whose credits / flags changed;
+    they are rebuilt on the next read. Does not commit.
+    """
+    db.execute(DELETE_SUMMARIES_FOR_COURSE_SQL, {"course_id": course_id})
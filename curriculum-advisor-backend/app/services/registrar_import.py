@@ -0,0 +1,415 @@
+# app/services/registrar_import.py
+
+from __future__ import annotations
+
+import argparse
+import csv
+import json
+import logging
+import sys
+from dataclasses import dataclass, field
+from typing import Optional, Dict, Any, List, Iterable, Tuple, Callable
+
+from pydantic import ValidationError
+from sqlalchemy.orm import Session
+from sqlalchemy import text, bindparam, BigInteger, Integer
+from sqlalchemy.dialects.postgresql import ARRAY, insert as pg_insert
+
+from ..config import IMPORT_CHUNK_SIZE, IMPORT_MAX_ERRORS
+from ..db import SessionLocal
+from ..models import SessionCourseAttempt
+from ..schemas import RegistrarRow
+from .cohort import COHORT_ATTEMPTS_SQL
+from .curriculum_ranges import resolve_curriculum_ids
+from .curriculum_snapshot import get_curriculum_snapshot
+from .progress_summary import UPSERT_PROGRESS_SUMMARY_SQL, summarize_session_progress, summary_params
+from .transcript import build_attempt_rows, load_course_lookup, term_rank
+
+logger = logging.getLogger(__name__)
+
+FORMATS = ("csv", "ndjson")
+
+
+# ============================================================
+# Registrar bulk import (CSV / NDJSON, streamed)
+# ============================================================
+#
+# Rows are read one line at a time and written CHUNK rows per transaction,
+# so memory stays flat whatever the file size. Rows may arrive in any order:
+# attempts are upserted on (session_id, course_code_id) and, when a course
+# appears more than once (a retake, a student split across chunks, an older
+# dump imported again), the attempt of the latest term wins; equal terms
+# (or rows without a parseable term) go by file order. A failing row is
+# reported and skipped; a failing chunk is rolled back and reported, and
+# the import carries on.
+
+@dataclass
+class ImportReport:
+    rows_read: int = 0
+    rows_imported: int = 0
+    rows_failed: int = 0
+    sessions_created: int = 0
+    # sessions written per chunk, summed (a student spanning chunks counts twice)
+    session_updates: int = 0
+    chunks_committed: int = 0
+    chunks_failed: int = 0
+    # first IMPORT_MAX_ERRORS row errors: {"line": n, "error": "..."}
+    errors: List[Dict[str, Any]] = field(default_factory=list)
+
+    def add_error(self, line_no: int, error: str) -> None:
+        self.rows_failed += 1
+        if len(self.errors) < IMPORT_MAX_ERRORS:
+            self.errors.append({"line": line_no, "error": error})
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "rows_read": self.rows_read,
+            "rows_imported": self.rows_imported,
+            "rows_failed": self.rows_failed,
+            "sessions_created": self.sessions_created,
+            "session_updates": self.session_updates,
+            "chunks_committed": self.chunks_committed,
+            "chunks_failed": self.chunks_failed,
+            "errors": self.errors,
+            "errors_truncated": self.rows_failed > len(self.errors),
+        }
+
+
+class RecordParser:
+    """
+    Turns input lines into RegistrarRow objects, one line at a time.
+    CSV needs a header line with student_id_number, course_code, grade
+    (term optional); quoted fields may not contain line breaks.
+    """
+
+    def __init__(self, fmt: str):
+        if fmt not in FORMATS:
+            raise ValueError(f"Unsupported format {fmt!r}, expected one of {FORMATS}")
+        self.fmt = fmt
+        self.header: Optional[List[str]] = None
+        self.line_no = 0
+
+    def feed(self, line: str) -> Tuple[int, Optional[RegistrarRow], Optional[str]]:
+        """
+        Returns (line number, row or None, error or None).
+        Blank lines and the CSV header give (n, None, None).
+        """
+        self.line_no += 1
+        line = line.strip("\r\n")
+
+        if not line.strip():
+            return self.line_no, None, None
+
+        try:
+            if self.fmt == "ndjson":
+                data = json.loads(line)
+                if not isinstance(data, dict):
+                    return self.line_no, None, "Expected a JSON object"
+            else:
+                values = next(csv.reader([line]))
+                if self.header is None:
+                    self.header = [h.strip() for h in values]
+                    return self.line_no, None, None
+                if len(values) != len(self.header):
+                    return self.line_no, None, f"Expected {len(self.header)} columns, got {len(values)}"
+                data = dict(zip(self.header, values))
+                if not data.get("term"):
+                    data["term"] = None
+
+            return self.line_no, RegistrarRow(**data), None
+
+        except json.JSONDecodeError as e:
+            return self.line_no, None, f"Invalid JSON: {e.msg}"
+        except ValidationError as e:
+            problems = "; ".join(f"{'.'.join(str(p) for p in err['loc'])}: {err['msg']}" for err in e.errors())
+            return self.line_no, None, problems
+        except csv.Error as e:
+            return self.line_no, None, f"Invalid CSV: {e}"
+
+
+# ----------------------------
+# Chunk writer (one transaction)
+# ----------------------------
+
+LATEST_SESSIONS_SQL = text("""
+    SELECT DISTINCT ON (student_id_number)
+        student_id_number,
+        session_id,
+        curriculum_id
+    FROM advising_sessions
+    WHERE student_id_number = ANY(:ids)
+    ORDER BY student_id_number, session_id DESC
+""").bindparams(
+    bindparam("ids", type_=ARRAY(BigInteger))
+).execution_options(query_name="registrar_import.latest_sessions")
+
+CREATE_SESSIONS_SQL = text("""
+    INSERT INTO advising_sessions (student_id_number, curriculum_id, earned_credits)
+    SELECT u.student_id_number, u.curriculum_id, 0
+    FROM unnest(CAST(:ids AS BIGINT[]), CAST(:cids AS INT[])) AS u(student_id_number, curriculum_id)
+    RETURNING student_id_number, session_id, curriculum_id
+""").bindparams(
+    bindparam("ids", type_=ARRAY(BigInteger)),
+    bindparam("cids", type_=ARRAY(Integer))
+).execution_options(query_name="registrar_import.create_sessions")
+
+# totals from every attempt the session now has (not only this chunk's)
+REFRESH_SESSION_TOTALS_SQL = text("""
+    UPDATE advising_sessions s
+    SET earned_credits = t.total,
+        transcript_version = s.transcript_version + 1
+    FROM (
+        SELECT session_id, COALESCE(SUM(credits_earned), 0) AS total
+        FROM session_course_attempts
+        WHERE session_id = ANY(:sids)
+        GROUP BY session_id
+    ) t
+    WHERE s.session_id = t.session_id
+    RETURNING s.session_id, s.curriculum_id, s.transcript_version
+""").bindparams(
+    bindparam("sids", type_=ARRAY(BigInteger))
+).execution_options(query_name="registrar_import.refresh_session_totals")
+
+
+# a missing / unparseable term ranks below every real term (-1), in both
+# the chunk dict and the ON CONFLICT guard
+STORED_TERM_NOT_LATER = text(
+    "COALESCE(term_rank(excluded.term), -1) >= COALESCE(term_rank(session_course_attempts.term), -1)"
+)
+
+
+def _term_key(term: Optional[str]) -> int:
+    rank = term_rank(term)
+    return -1 if rank is None else rank
+
+
+def resolve_student_sessions(student_ids: List[int], db: Session) -> Tuple[Dict[int, Tuple[int, int]], int]:
+    """
+    ({student_id_number: (session_id, curriculum_id)}, sessions created):
+    the student's latest session, or a new one from curriculum_id_ranges.
+    Students without a matching range are left out.
+    """
+    created_count = 0
+    sessions = {
+        int(r["student_id_number"]): (int(r["session_id"]), int(r["curriculum_id"]))
+        for r in db.execute(LATEST_SESSIONS_SQL, {"ids": student_ids}).mappings()
+    }
+
+    missing = [sid for sid in student_ids if sid not in sessions]
+    if missing:
+        curricula = resolve_curriculum_ids(missing, db)
+        if curricula:
+            created = db.execute(CREATE_SESSIONS_SQL, {
+                "ids": list(curricula),
+                "cids": list(curricula.values())
+            }).mappings().all()
+            for r in created:
+                sessions[int(r["student_id_number"])] = (int(r["session_id"]), int(r["curriculum_id"]))
+            created_count = len(created)
+
+    return sessions, created_count
+
+
+def write_chunk(rows: List[Tuple[int, RegistrarRow]], db: Session, report: ImportReport) -> None:
+    """
+    Writes one chunk of parsed rows in a single transaction (commits).
+    """
+    by_student: Dict[int, List[Tuple[int, RegistrarRow]]] = {}
+    for line_no, row in rows:
+        by_student.setdefault(row.student_id_number, []).append((line_no, row))
+
+    sessions, created_count = resolve_student_sessions(list(by_student), db)
+
+    # one course lookup per curriculum for the whole chunk
+    codes_by_curriculum: Dict[int, set] = {}
+    for student_id, student_rows in by_student.items():
+        if student_id in sessions:
+            codes_by_curriculum.setdefault(sessions[student_id][1], set()).update(r.course_code for _, r in student_rows)
+    lookups = {
+        cid: load_course_lookup(cid, codes, db)
+        for cid, codes in codes_by_curriculum.items()
+    }
+
+    # (session_id, course_code_id) -> attempt of the latest term
+    attempts: Dict[Tuple[int, int], dict] = {}
+    row_errors: List[Tuple[int, str]] = []
+    imported = 0
+    updated = 0
+
+    for student_id, student_rows in by_student.items():
+        if student_id not in sessions:
+            row_errors.extend((line_no, f"No curriculum found for student_id_number {student_id}") for line_no, _ in student_rows)
+            continue
+
+        session_id, curriculum_id = sessions[student_id]
+        built = build_attempt_rows(session_id, curriculum_id, [r for _, r in student_rows], db, lookup=lookups[curriculum_id])
+
+        if "error" in built:
+            row_errors.extend((line_no, built["error"]) for line_no, _ in student_rows)
+            continue
+
+        for a in built["attempts"]:
+            key = (a["session_id"], a["course_code_id"])
+            if key not in attempts or _term_key(a["term"]) >= _term_key(attempts[key]["term"]):
+                attempts[key] = a
+        imported += len(student_rows)
+
+    if attempts:
+        stmt = pg_insert(SessionCourseAttempt)
+        db.execute(
+            stmt.on_conflict_do_update(
+                index_elements=["session_id", "course_code_id"],
+                set_={
+                    "grade": stmt.excluded.grade,
+                    "credits_earned": stmt.excluded.credits_earned,
+                    "term": stmt.excluded.term,
+                },
+                # never replace an attempt from a later term
+                where=STORED_TERM_NOT_LATER
+            ),
+            list(attempts.values())
+        )
+
+        touched = sorted({session_id for session_id, _ in attempts})
+        refreshed = db.execute(REFRESH_SESSION_TOTALS_SQL, {"sids": touched}).mappings().all()
+        refresh_progress_summaries(refreshed, db)
+        updated = len(refreshed)
+
+    db.commit()
+
+    # counted only once the chunk is committed
+    report.rows_imported += imported
+    report.sessions_created += created_count
+    report.session_updates += updated
+    for line_no, error in row_errors:
+        report.add_error(line_no, error)
+
+
+def refresh_progress_summaries(sessions: List[Any], db: Session) -> None:
+    """
+    Rebuilds session_progress_summary for the given (session_id,
+    curriculum_id, transcript_version) rows with one attempts query.
+    """
+    attempts_by_session: Dict[int, List[dict]] = {}
+    for row in db.execute(COHORT_ATTEMPTS_SQL, {"sids": [int(s["session_id"]) for s in sessions]}).mappings():
+        attempts_by_session.setdefault(int(row["session_id"]), []).append(row)
+
+    params = []
+    for s in sessions:
+        session_id = int(s["session_id"])
+        snapshot = get_curriculum_snapshot(int(s["curriculum_id"]), db)
+        summary = summarize_session_progress(snapshot, attempts_by_session.get(session_id, []))
+        params.append(summary_params(session_id, s["transcript_version"], summary))
+
+    if params:
+        db.execute(UPSERT_PROGRESS_SUMMARY_SQL, params)
+
+
+# ----------------------------
+# Drivers
+# ----------------------------
+
+class RegistrarImport:
+    """
+    Feeds lines in, writes a chunk whenever chunk_size valid rows are
+    buffered. Used by both the CLI (file lines) and the HTTP endpoint
+    (request body lines).
+    """
+
+    def __init__(
+        self,
+        fmt: str,
+        chunk_size: int = IMPORT_CHUNK_SIZE,
+        session_factory: Callable[[], Session] = SessionLocal,
+        progress: Optional[Callable[[ImportReport], None]] = None
+    ):
+        self.parser = RecordParser(fmt)
+        self.chunk_size = max(1, chunk_size)
+        self.session_factory = session_factory
+        self.progress = progress
+        self.report = ImportReport()
+        self.pending: List[Tuple[int, RegistrarRow]] = []
+
+    def feed_lines(self, lines: Iterable[str]) -> bool:
+        """
+        Parses lines; returns True when a full chunk is waiting for flush().
+        """
+        for line in lines:
+            line_no, row, error = self.parser.feed(line)
+            if error:
+                self.report.rows_read += 1
+                self.report.add_error(line_no, error)
+            elif row is not None:
+                self.report.rows_read += 1
+                self.pending.append((line_no, row))
+        return len(self.pending) >= self.chunk_size
+
+    def flush(self) -> None:
+        """
+        Writes buffered rows, chunk_size at a time. A chunk that fails is
+        rolled back and its rows reported; later chunks still run.
+        """
+        while self.pending:
+            chunk, self.pending = self.pending[:self.chunk_size], self.pending[self.chunk_size:]
+            db = self.session_factory()
+            try:
+                write_chunk(chunk, db, self.report)
+                self.report.chunks_committed += 1
+            except Exception as e:
+                db.rollback()
+                logger.exception("Registrar import chunk failed (lines %s-%s)", chunk[0][0], chunk[-1][0])
+                self.report.chunks_failed += 1
+                for line_no, _ in chunk:
+                    self.report.add_error(line_no, f"Chunk rolled back: {e.__class__.__name__}: {e}")
+            finally:
+                db.close()
+
+            if self.progress:
+                self.progress(self.report)
+
+    def finish(self) -> Dict[str, Any]:
+        self.flush()
+        return self.report.as_dict()
+
+
+def import_lines(lines: Iterable[str], fmt: str, **kwargs) -> Dict[str, Any]:
+    """
+    Synchronous import of an iterable of lines (e.g. an open file).
+    """
+    importer = RegistrarImport(fmt, **kwargs)
+    for line in lines:
+        if importer.feed_lines([line]):
+            importer.flush()
+    return importer.finish()
+
+
+def _print_progress(report: ImportReport) -> None:
+    print(
+        f"chunks={report.chunks_committed} rows_read={report.rows_read} "
+        f"imported={report.rows_imported} failed={report.rows_failed} "
+        f"sessions_created={report.sessions_created}",
+        file=sys.stderr
+    )
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Import a registrar grade dump (CSV or NDJSON, any row order; the latest term of a course wins).")
+    parser.add_argument("path", help="file to import, '-' for stdin")
+    parser.add_argument("--format", choices=FORMATS, help="defaults to the file extension")
+    parser.add_argument("--chunk-size", type=int, default=IMPORT_CHUNK_SIZE)
+    args = parser.parse_args(argv)
+
+    fmt = args.format or ("ndjson" if args.path.endswith((".ndjson", ".jsonl")) else "csv")
+
+    if args.path == "-":
+        report = import_lines(sys.stdin, fmt, chunk_size=args.chunk_size, progress=_print_progress)
+    else:
+        with open(args.path, newline="", encoding="utf-8") as f:
+            report = import_lines(f, fmt, chunk_size=args.chunk_size, progress=_print_progress)
+
+    print(json.dumps(report, indent=2))
+    return 0 if report["rows_failed"] == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
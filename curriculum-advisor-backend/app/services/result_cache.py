@@ -0,0 +1,96 @@
+# app/services/result_cache.py
+
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from typing import Optional, Dict, Any, List, Tuple
+
+from ..config import RECOMMENDATION_CACHE_SIZE
+
+
+# ============================================================
+# Recommendation result cache (process-wide, bounded LRU)
+# ============================================================
+#
+# Key: (session_id, transcript_version, group_id, snapshot loaded_at,
+#       max_credits, normalized offered_courses, (term, offerings loaded_at))
+#
+# transcript_version is bumped in the same transaction that rewrites a
+# session's attempts, so transcript uploads are never served stale, from
+# any worker. Curriculum / course edits are different: the key only
+# changes when this process reloads its snapshot (or a term's offerings),
+# and invalidation below is process-local. Other workers therefore keep
+# serving results computed on the old structure until their snapshot
+# expires, i.e. for up to CURRICULUM_SNAPSHOT_TTL_SECONDS after an admin
+# edit, the same staleness window as the snapshot itself.
+
+_results: "OrderedDict[tuple, Dict[str, Any]]" = OrderedDict()
+_results_lock = threading.Lock()
+
+
+def normalize_offered_courses(offered_courses: Optional[List[str]]) -> Optional[Tuple[str, ...]]:
+    """
+    Same normalization evaluate_recommendations applies, so equivalent
+    requests share one entry. Empty / missing means "no filter".
+    """
+    if not offered_courses:
+        return None
+    return tuple(sorted(set(code.strip().upper() for code in offered_courses)))
+
+
+def recommendation_cache_key(
+    session_id: int,
+    transcript_version: int,
+    chosen_group_id: Optional[int],
+    snapshot_loaded_at: float,
+    max_credits: int,
+    offered_courses: Optional[List[str]],
+    offered_term: Optional[Tuple[str, float]] = None
+) -> tuple:
+    return (
+        session_id,
+        int(transcript_version or 0),
+        int(chosen_group_id) if chosen_group_id else None,
+        snapshot_loaded_at,
+        max_credits,
+        normalize_offered_courses(offered_courses),
+        offered_term,
+    )
+
+
+def get_cached_recommendations(key: tuple) -> Optional[Dict[str, Any]]:
+    """
+    Returns the stored result (shared, do not mutate) or None.
+    """
+    with _results_lock:
+        result = _results.get(key)
+        if result is not None:
+            _results.move_to_end(key)
+        return result
+
+
+def store_recommendations(key: tuple, result: Dict[str, Any]) -> None:
+    if RECOMMENDATION_CACHE_SIZE <= 0:
+        return
+
+    with _results_lock:
+        _results[key] = result
+        _results.move_to_end(key)
+        while len(_results) > RECOMMENDATION_CACHE_SIZE:
+            _results.popitem(last=False)
+
+
+def invalidate_recommendation_cache(session_id: Optional[int] = None) -> None:
+    """
+    Drops cached results for one session (all sessions when None).
+    Call after a transcript upload, a concentration change or any
+    curriculum / course edit.
+    """
+    with _results_lock:
+        if session_id is None:
+            _results.clear()
+            return
+
+        for key in [k for k in _results if k[0] == session_id]:
+            del _results[key]
@@ -0,0 +1,166 @@
+# app/services/seminars.py
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Optional, Dict, Any, List
+
+from sqlalchemy.orm import Session
+from sqlalchemy import text, bindparam, BigInteger
+
+
+# ============================================================
+# Professional Ethics Seminar progress (0 credit, mandatory)
+# ============================================================
+
+@dataclass
+class SeminarProgress:
+    """
+    All seminar courses plus one session's seminar attempts, loaded once.
+
+    Rules:
+    - Audit: only grade 'S' counts as completed.
+    - Next seminar: 'S' or 'IP' means the student does not need it again.
+    """
+
+    # active seminar course codes in order (BG14030 ..)
+    seminars: List[dict] = field(default_factory=list)
+    # number of active seminar courses
+    required_total: int = 0
+
+    completed_codes: set = field(default_factory=set)
+    in_progress_codes: set = field(default_factory=set)
+    completed_course_ids: set = field(default_factory=set)
+
+    def next_seminar(self) -> Optional[dict]:
+        """
+        Returns the next required seminar NOT yet completed with 'S'
+        (and not currently in progress), or None when all are done.
+        """
+        for s in self.seminars:
+            code = s["course_code"]
+            if code in self.completed_codes or code in self.in_progress_codes:
+                continue
+
+            return {
+                "course_code": code,
+                "course_name": s["course_name"],
+                "credits": int(s["credits"]),  # should be 0
+                "source": "Professional Ethics Seminar (Required)"
+            }
+
+        return None
+
+    def with_attempts(self, attempts: List[Any]) -> "SeminarProgress":
+        """
+        Same seminar catalog, progress taken from one session's attempt rows
+        (rows need course_id, course_code, grade, is_ethics_seminar).
+        Used when many sessions share one catalog load.
+        """
+        progress = SeminarProgress(seminars=self.seminars, required_total=self.required_total)
+
+        for a in attempts:
+            if not a["is_ethics_seminar"]:
+                continue
+            if a["grade"] == "S":
+                progress.completed_codes.add(a["course_code"])
+                progress.completed_course_ids.add(int(a["course_id"]))
+            elif a["grade"] == "IP":
+                progress.in_progress_codes.add(a["course_code"])
+
+        return progress
+
+    def audit(self) -> Dict[str, Any]:
+        return seminar_audit(self.required_total, len(self.completed_course_ids))
+
+
+def seminar_audit(required_total: int, completed: int) -> Dict[str, Any]:
+    remaining = max(0, required_total - completed)
+
+    return {
+        "required_total": required_total,
+        "completed": completed,
+        "remaining": remaining,
+        "status": "COMPLETED" if remaining == 0 else "INCOMPLETE"
+    }
+
+
+# every seminar course/code joined with this session's attempts
+SEMINAR_PROGRESS_SQL = text("""
+    SELECT
+        c.course_id,
+        c.course_name,
+        c.credits,
+        c.is_active AS course_active,
+        cc.course_code,
+        cc.is_active AS code_active,
+        a.grade
+    FROM courses c
+    LEFT JOIN course_codes cc ON cc.course_id = c.course_id
+    LEFT JOIN session_course_attempts a
+        ON a.course_code_id = cc.course_code_id
+        AND a.session_id = :sid
+    WHERE c.is_ethics_seminar = TRUE
+    ORDER BY cc.course_code
+""").bindparams(
+    bindparam("sid", type_=BigInteger)
+).execution_options(query_name="seminars.seminar_progress")
+
+
+# seminar catalog only (no session), for bulk evaluation
+SEMINAR_CATALOG_SQL = text("""
+    SELECT
+        c.course_id,
+        c.course_name,
+        c.credits,
+        c.is_active AS course_active,
+        cc.course_code,
+        cc.is_active AS code_active,
+        NULL AS grade
+    FROM courses c
+    LEFT JOIN course_codes cc ON cc.course_id = c.course_id
+    WHERE c.is_ethics_seminar = TRUE
+    ORDER BY cc.course_code
+""").execution_options(query_name="seminars.seminar_catalog")
+
+
+def load_seminar_catalog(db: Session) -> SeminarProgress:
+    rows = db.execute(SEMINAR_CATALOG_SQL).mappings().all()
+    return build_seminar_progress(rows)
+
+
+def load_seminar_progress(session_id: int, db: Session) -> SeminarProgress:
+    rows = db.execute(SEMINAR_PROGRESS_SQL, {"sid": session_id}).mappings().all()
+    return build_seminar_progress(rows)
+
+
+def build_seminar_progress(rows: List[Any]) -> SeminarProgress:
+    progress = SeminarProgress()
+    active_course_ids = set()
+    listed_codes = set()
+
+    for r in rows:
+        course_id = int(r["course_id"])
+        code = r["course_code"]
+        grade = r["grade"]
+
+        if r["course_active"]:
+            active_course_ids.add(course_id)
+
+            if code and r["code_active"] and code not in listed_codes:
+                listed_codes.add(code)
+                progress.seminars.append({
+                    "course_id": course_id,
+                    "course_code": code,
+                    "course_name": r["course_name"],
+                    "credits": int(r["credits"]),
+                })
+
+        if grade == "S":
+            progress.completed_codes.add(code)
+            progress.completed_course_ids.add(course_id)
+        elif grade == "IP":
+            progress.in_progress_codes.add(code)
+
+    progress.required_total = len(active_course_ids)
+    return progress
@@ -0,0 +1,134 @@
+# app/services/session_context.py
+
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass
+from sqlalchemy import text, bindparam, BigInteger
+from typing import Optional, Dict, Any, List
+
+from ..db import async_fetch_all, async_fetch_first
+from .curriculum_snapshot import CurriculumSnapshot, get_curriculum_snapshot_async
+from .progress_summary import summary_from_row
+from .seminars import SeminarProgress, SEMINAR_PROGRESS_SQL, build_seminar_progress
+from .transcript import SESSION_ATTEMPTS_SQL
+
+
+# ============================================================
+# Per-request session context (shared by recommendations + audit)
+# ============================================================
+#
+# One row carries everything the recommendation cache key and the audit
+# need (session, transcript_version, concentration, stored summary,
+# seminar requirement). Attempts and seminar progress are loaded on first
+# use and kept, so engines consuming the same context never reload them.
+#
+# Reads go to the replica. A client that just uploaded a transcript passes
+# the transcript_version it got back (min_version): when the replica has
+# not caught up yet, the context is read again from the primary and stays
+# there for the rest of the request.
+
+SESSION_CONTEXT_SQL = text("""
+    SELECT
+        s.session_id,
+        s.curriculum_id,
+        s.transcript_version,
+        sel.group_id,
+        p.transcript_version AS summary_version,
+        p.earned_credits,
+        p.earned_by_category,
+        p.earned_by_subcategory,
+        p.seminars_completed,
+        (
+            SELECT COUNT(*)
+            FROM courses c
+            WHERE c.is_ethics_seminar = TRUE
+              AND c.is_active = TRUE
+        ) AS seminar_required_total
+    FROM advising_sessions s
+    LEFT JOIN session_concentration_selection sel ON sel.session_id = s.session_id
+    LEFT JOIN session_progress_summary p ON p.session_id = s.session_id
+    WHERE s.session_id = :sid
+""").bindparams(
+    bindparam("sid", type_=BigInteger)
+).execution_options(query_name="session_context.session")
+
+
+@dataclass
+class SessionContext:
+    session_id: int
+    curriculum_id: int
+    transcript_version: int
+    chosen_group_id: Optional[int]
+    seminar_required_total: int
+    snapshot: CurriculumSnapshot
+
+    # stored progress summary, None when missing or stale
+    summary: Optional[Dict[str, Any]] = None
+
+    # loaded on demand
+    attempts: Optional[List[Any]] = None
+    seminar_progress: Optional[SeminarProgress] = None
+
+    # read from the primary (the replica was behind min_version)
+    primary: bool = False
+
+    async def load(self, attempts: bool = False, seminars: bool = False) -> None:
+        """
+        Fetches whichever of attempts / seminar progress is requested and
+        not loaded yet, concurrently.
+        """
+        params = {"sid": self.session_id}
+        primary = self.primary
+        want_attempts = attempts and self.attempts is None
+        want_seminars = seminars and self.seminar_progress is None
+
+        if want_attempts and want_seminars:
+            attempt_rows, seminar_rows = await asyncio.gather(
+                async_fetch_all(SESSION_ATTEMPTS_SQL, params, primary=primary),
+                async_fetch_all(SEMINAR_PROGRESS_SQL, params, primary=primary),
+            )
+            self.attempts = attempt_rows
+            self.seminar_progress = build_seminar_progress(seminar_rows)
+        elif want_attempts:
+            self.attempts = await async_fetch_all(SESSION_ATTEMPTS_SQL, params, primary=primary)
+        elif want_seminars:
+            self.seminar_progress = build_seminar_progress(
+                await async_fetch_all(SEMINAR_PROGRESS_SQL, params, primary=primary)
+            )
+
+
+def replica_behind(row: Optional[Any], min_version: Optional[int]) -> bool:
+    """
+    True when a replica row is missing or older than min_version (only
+    checked when the client sent one).
+    """
+    if min_version is None:
+        return False
+    return row is None or int(row["transcript_version"]) < min_version
+
+
+async def load_session_context_async(session_id: int, min_version: Optional[int] = None) -> Optional[SessionContext]:
+    """
+    One row plus the (cached) curriculum snapshot. None when the session
+    does not exist. See min_version above.
+    """
+    row = await async_fetch_first(SESSION_CONTEXT_SQL, {"sid": session_id})
+    primary = replica_behind(row, min_version)
+    if primary:
+        row = await async_fetch_first(SESSION_CONTEXT_SQL, {"sid": session_id}, primary=True)
+    if not row:
+        return None
+
+    snapshot = await get_curriculum_snapshot_async(int(row["curriculum_id"]))
+
+    return SessionContext(
+        session_id=session_id,
+        curriculum_id=int(row["curriculum_id"]),
+        transcript_version=int(row["transcript_version"]),
+        chosen_group_id=row["group_id"],
+        seminar_required_total=int(row["seminar_required_total"]),
+        snapshot=snapshot,
+        summary=summary_from_row(row),
+        primary=primary,
+    )
@@ -0,0 +1,165 @@
+# app/services/term_offerings.py
+
+from __future__ import annotations
+
+import threading
+import time
+from dataclasses import dataclass
+from sqlalchemy.orm import Session
+from sqlalchemy import text, bindparam, Text
+from sqlalchemy.dialects.postgresql import ARRAY
+from typing import Optional, Dict, Any, List, FrozenSet
+
+from ..config import CURRICULUM_SNAPSHOT_TTL_SECONDS
+from ..db import async_fetch_all
+
+
+# ============================================================
+# Term offering catalog (term -> offered course_code_ids)
+# ============================================================
+
+TERM_OFFERING_IDS_SQL = text("""
+    SELECT course_code_id
+    FROM term_offerings
+    WHERE term = :term
+""").bindparams(
+    bindparam("term", type_=Text)
+).execution_options(query_name="term_offerings.ids")
+
+TERM_OFFERING_CODES_SQL = text("""
+    SELECT cc.course_code
+    FROM term_offerings t
+    JOIN course_codes cc ON cc.course_code_id = t.course_code_id
+    WHERE t.term = :term
+    ORDER BY cc.course_code
+""").bindparams(
+    bindparam("term", type_=Text)
+).execution_options(query_name="term_offerings.codes")
+
+TERM_LIST_SQL = text("""
+    SELECT term, COUNT(*) AS course_count
+    FROM term_offerings
+    GROUP BY term
+    ORDER BY term
+""").execution_options(query_name="term_offerings.terms")
+
+COURSE_CODE_IDS_SQL = text("""
+    SELECT course_code, course_code_id
+    FROM course_codes
+    WHERE course_code = ANY(:codes)
+""").bindparams(
+    bindparam("codes", type_=ARRAY(Text))
+).execution_options(query_name="term_offerings.code_ids")
+
+DELETE_TERM_SQL = text("""
+    DELETE FROM term_offerings WHERE term = :term
+""").bindparams(
+    bindparam("term", type_=Text)
+).execution_options(query_name="term_offerings.delete")
+
+INSERT_TERM_SQL = text("""
+    INSERT INTO term_offerings (term, course_code_id)
+    SELECT :term, UNNEST(CAST(:ids AS INTEGER[]))
+    ON CONFLICT DO NOTHING
+""").bindparams(
+    bindparam("term", type_=Text)
+).execution_options(query_name="term_offerings.insert")
+
+
+@dataclass(frozen=True)
+class TermOfferings:
+    term: str
+    course_code_ids: FrozenSet[int]
+    loaded_at: float
+
+
+def normalize_term(term: str) -> str:
+    return term.strip()
+
+
+# ----------------------------
+# Process-wide cache (same TTL as curriculum snapshots)
+# ----------------------------
+
+_offerings: Dict[str, TermOfferings] = {}
+_offerings_lock = threading.Lock()
+
+
+def _fresh(term: str) -> Optional[TermOfferings]:
+    offerings = _offerings.get(term)
+    if offerings and time.monotonic() - offerings.loaded_at < CURRICULUM_SNAPSHOT_TTL_SECONDS:
+        return offerings
+    return None
+
+
+def _store(term: str, rows: List[Any]) -> Optional[TermOfferings]:
+    if not rows:
+        return None
+    offerings = TermOfferings(term, frozenset(int(r["course_code_id"]) for r in rows), time.monotonic())
+    with _offerings_lock:
+        _offerings[term] = offerings
+    return offerings
+
+
+def get_term_offerings(term: str, db: Session) -> Optional[TermOfferings]:
+    """
+    Offered course_code_ids of a term, None when the term has no offerings.
+    """
+    term = normalize_term(term)
+    return _fresh(term) or _store(term, db.execute(TERM_OFFERING_IDS_SQL, {"term": term}).mappings().all())
+
+
+async def get_term_offerings_async(term: str) -> Optional[TermOfferings]:
+    term = normalize_term(term)
+    return _fresh(term) or _store(term, await async_fetch_all(TERM_OFFERING_IDS_SQL, {"term": term}))
+
+
+def invalidate_term_offerings(term: Optional[str] = None) -> None:
+    with _offerings_lock:
+        if term is None:
+            _offerings.clear()
+        else:
+            _offerings.pop(normalize_term(term), None)
+
+
+# ----------------------------
+# Admin
+# ----------------------------
+
+def list_terms(db: Session) -> List[Dict[str, Any]]:
+    return [dict(r) for r in db.execute(TERM_LIST_SQL).mappings().all()]
+
+
+def load_term_course_codes(term: str, db: Session) -> List[str]:
+    return list(db.execute(TERM_OFFERING_CODES_SQL, {"term": normalize_term(term)}).scalars().all())
+
+
+def replace_term_offerings(term: str, course_codes: List[str], db: Session) -> Dict[str, Any]:
+    """
+    Replaces the offerings of a term. Unknown codes reject the whole
+    request (nothing is written). Does not commit.
+    """
+    term = normalize_term(term)
+    if not term:
+        return {"error": "term is required"}
+
+    codes = sorted(set(code.strip().upper() for code in course_codes if code.strip()))
+    rows = db.execute(COURSE_CODE_IDS_SQL, {"codes": codes}).mappings().all()
+    ids_by_code = {r["course_code"].upper(): int(r["course_code_id"]) for r in rows}
+
+    unknown = [code for code in codes if code not in ids_by_code]
+    if unknown:
+        return {"error": "Unknown course codes", "unknown_codes": unknown}
+
+    db.execute(DELETE_TERM_SQL, {"term": term})
+    if ids_by_code:
+        db.execute(INSERT_TERM_SQL, {"term": term, "ids": sorted(set(ids_by_code.values()))})
+
+    return {"term": term, "course_count": len(set(ids_by_code.values()))}
+
+
+def delete_term_offerings(term: str, db: Session) -> int:
+    """
+    Does not commit. Returns the number of removed offerings.
+    """
+    return db.execute(DELETE_TERM_SQL, {"term": normalize_term(term)}).rowcount
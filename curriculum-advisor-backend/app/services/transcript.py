@@ -0,0 +1,451 @@
+# app/services/transcript.py
+
+from __future__ import annotations
+
+from sqlalchemy.orm import Session
+from sqlalchemy import text, insert, bindparam, BigInteger, Integer, Text
+from sqlalchemy.dialects.postgresql import ARRAY, insert as pg_insert
+from typing import Optional, Dict, Any, List, Iterable
+
+from .curriculum_snapshot import get_curriculum_snapshot
+from .grading import is_passing, normalize_grade
+from .progress_summary import (
+    UPSERT_PROGRESS_SUMMARY_SQL,
+    apply_progress_delta,
+    refresh_session_progress,
+    summary_from_row,
+    summary_params,
+)
+from ..models import SessionCourseAttempt
+
+FREE_ELECTIVE_CODE = "FREE_ELECTIVE"
+
+
+# ============================================================
+# Reading a session's attempts
+# ============================================================
+
+SESSION_SQL = text("""
+    SELECT session_id, curriculum_id, transcript_version
+    FROM advising_sessions
+    WHERE session_id = :sid
+""").bindparams(
+    bindparam("sid", type_=BigInteger)
+).execution_options(query_name="transcript.session")
+
+# required grade is not joined here, it comes from the curriculum snapshot
+SESSION_ATTEMPTS_SQL = text("""
+    SELECT
+        a.attempt_id,
+        a.grade,
+        a.credits_earned,
+        a.course_code_id,
+        cc.course_code,
+        c.course_id,
+        c.credits,
+        c.is_ethics_seminar
+    FROM session_course_attempts a
+    JOIN course_codes cc ON cc.course_code_id = a.course_code_id
+    JOIN courses c ON c.course_id = cc.course_id
+    WHERE a.session_id = :sid
+    ORDER BY a.attempt_id
+""").bindparams(
+    bindparam("sid", type_=BigInteger)
+).execution_options(query_name="transcript.session_attempts")
+
+
+def load_session_attempts(session_id: int, db: Session) -> List[Any]:
+    return db.execute(SESSION_ATTEMPTS_SQL, {"sid": session_id}).mappings().all()
+
+
+# ============================================================
+# Course lookup (one query for the whole transcript)
+# ============================================================
+
+COURSE_LOOKUP_SQL = text("""
+    SELECT
+        cc.course_code,
+        cc.course_code_id,
+        c.course_id,
+        c.credits,
+        c.is_ethics_seminar,
+        COALESCE(mg.min_required_grade::text, 'D') AS required_grade
+    FROM course_codes cc
+    JOIN courses c ON c.course_id = cc.course_id
+    LEFT JOIN curriculum_course_min_grades mg
+        ON mg.curriculum_id = :cid
+        AND mg.course_id = c.course_id
+    WHERE cc.course_code = ANY(:codes)
+""").bindparams(
+    bindparam("cid", type_=Integer),
+    bindparam("codes", type_=ARRAY(Text))
+).execution_options(query_name="transcript.course_lookup")
+
+
+def load_course_lookup(curriculum_id: int, course_codes: Iterable[str], db: Session) -> Dict[str, dict]:
+    """
+    Resolves every submitted course code (plus FREE_ELECTIVE) together with
+    its official credits, seminar flag and curriculum minimum grade.
+    Returns {course_code: row}.
+    """
+    codes = set(course_codes)
+    codes.add(FREE_ELECTIVE_CODE)
+
+    rows = db.execute(COURSE_LOOKUP_SQL, {"cid": curriculum_id, "codes": list(codes)}).mappings().all()
+
+    return {r["course_code"]: dict(r) for r in rows}
+
+
+# ============================================================
+# Term ordering ("<semester>/<year>", e.g. "1/2025")
+# ============================================================
+
+def term_rank(term: Optional[str]) -> Optional[int]:
+    """
+    Sortable rank of a term (year * 100 + semester); None when the term is
+    missing or not "<semester>/<year>". Mirrored by term_rank() in sql.sql.
+    """
+    semester, sep, year = (term or "").strip().partition("/")
+    if not sep or not semester.isdigit() or not (year.isdigit() and len(year) == 4):
+        return None
+    return int(year) * 100 + int(semester)
+
+
+# ============================================================
+# Credit rules
+# ============================================================
+
+def credits_for_attempt(course: dict, grade: str, is_free_elective: bool = False) -> int:
+    """
+    Credits a single attempt earns.
+    - Unknown codes mapped to FREE_ELECTIVE count unless F / W / IP
+    - Seminars always give 0 credits
+    - TR always passes
+    - IP / W / F never count
+    - Otherwise the curriculum minimum grade decides
+    """
+    official_credits = int(course["credits"])
+
+    if is_free_elective:
+        return official_credits if grade not in ["F", "W", "IP"] else 0
+
+    if course["is_ethics_seminar"]:
+        return 0
+
+    if grade == "TR":
+        return official_credits
+
+    if grade in ["IP", "W", "F"]:
+        return 0
+
+    return official_credits if is_passing(grade, course["required_grade"]) else 0
+
+
+def build_attempt_rows(
+    session_id: int,
+    curriculum_id: int,
+    rows: List[Any],
+    db: Session,
+    lookup: Optional[Dict[str, dict]] = None
+) -> Dict[str, Any]:
+    """
+    Turns transcript rows into session_course_attempts rows, computing
+    earned credits in memory. Rows need course_code, grade and term.
+    Pass a load_course_lookup result to share one lookup between sessions.
+    """
+    if lookup is None:
+        lookup = load_course_lookup(curriculum_id, (r.course_code for r in rows), db)
+    free_row = lookup.get(FREE_ELECTIVE_CODE)
+
+    attempts: List[dict] = []
+    total_earned = 0
+
+    for r in rows:
+        grade = normalize_grade(r.grade)
+        course = lookup.get(r.course_code)
+        is_free_elective = False
+
+        if not course:
+            if not free_row:
+                return {"error": "FREE_ELECTIVE not configured"}
+            course = free_row
+            is_free_elective = True
+
+        earned = credits_for_attempt(course, grade, is_free_elective)
+
+        attempts.append({
+            "session_id": session_id,
+            "course_code_id": int(course["course_code_id"]),
+            "grade": grade,
+            "credits_earned": earned,
+            "term": r.term
+        })
+        total_earned += earned
+
+    return {"attempts": attempts, "total_earned": total_earned}
+
+
+# ============================================================
+# Full transcript replace
+# ============================================================
+
+DELETE_SESSION_ATTEMPTS_SQL = text("""
+    DELETE FROM session_course_attempts WHERE session_id = :sid
+""").bindparams(
+    bindparam("sid", type_=BigInteger)
+).execution_options(query_name="transcript.delete_attempts")
+
+BUMP_TRANSCRIPT_VERSION_SQL = text("""
+    UPDATE advising_sessions
+    SET earned_credits = :total,
+        transcript_version = transcript_version + 1
+    WHERE session_id = :sid
+    RETURNING transcript_version
+""").bindparams(
+    bindparam("total", type_=Integer),
+    bindparam("sid", type_=BigInteger)
+).execution_options(query_name="transcript.bump_version")
+
+
+def replace_session_attempts(
+    session_id: int,
+    curriculum_id: int,
+    rows: List[Any],
+    db: Session
+) -> Dict[str, Any]:
+    """
+    Replaces all attempts of a session with the given transcript using a
+    single bulk insert, updates the cached session total, bumps
+    transcript_version and rewrites the session's progress summary.
+    Does not commit.
+    """
+    built = build_attempt_rows(session_id, curriculum_id, rows, db)
+    if "error" in built:
+        return built
+
+    db.execute(DELETE_SESSION_ATTEMPTS_SQL, {"sid": session_id})
+
+    if built["attempts"]:
+        db.execute(insert(SessionCourseAttempt), built["attempts"])
+
+    transcript_version = db.execute(BUMP_TRANSCRIPT_VERSION_SQL, {
+        "total": built["total_earned"],
+        "sid": session_id
+    }).scalar()
+
+    refresh_session_progress(
+        session_id,
+        curriculum_id,
+        transcript_version,
+        load_session_attempts(session_id, db),
+        db
+    )
+
+    return {
+        "rows_inserted": len(built["attempts"]),
+        "total_earned_credits": built["total_earned"],
+        "transcript_version": int(transcript_version)
+    }
+
+
+# ============================================================
+# Transcript delta (only changed attempts are written)
+# ============================================================
+#
+# One attempt per (session, course code) (uq_session_course): a delta row
+# upserts that attempt, term included; `remove` deletes attempts by code.
+# Totals and the progress summary are adjusted by the difference, and a
+# delta that changes nothing writes nothing (safe to retry). Unknown codes
+# are all stored as the one FREE_ELECTIVE attempt, so a delta naming more
+# than one of them is rejected rather than silently keeping only the last.
+
+# the session (locked) and its stored summary (summary_from_row shape)
+LOCK_SESSION_SQL = text("""
+    SELECT
+        s.session_id,
+        s.curriculum_id,
+        s.transcript_version,
+        s.earned_credits AS session_earned_credits,
+        p.transcript_version AS summary_version,
+        p.earned_credits,
+        p.earned_by_category,
+        p.earned_by_subcategory,
+        p.seminars_completed
+    FROM advising_sessions s
+    LEFT JOIN session_progress_summary p ON p.session_id = s.session_id
+    WHERE s.session_id = :sid
+    FOR UPDATE OF s
+""").bindparams(
+    bindparam("sid", type_=BigInteger)
+).execution_options(query_name="transcript.lock_session")
+
+SESSION_ATTEMPTS_BY_CODE_SQL = text("""
+    SELECT
+        a.attempt_id,
+        a.grade,
+        a.credits_earned,
+        a.term,
+        a.course_code_id,
+        cc.course_code,
+        c.course_id,
+        c.credits,
+        c.is_ethics_seminar
+    FROM session_course_attempts a
+    JOIN course_codes cc ON cc.course_code_id = a.course_code_id
+    JOIN courses c ON c.course_id = cc.course_id
+    WHERE a.session_id = :sid
+      AND a.course_code_id = ANY(:ids)
+""").bindparams(
+    bindparam("sid", type_=BigInteger),
+    bindparam("ids", type_=ARRAY(Integer))
+).execution_options(query_name="transcript.session_attempts_by_code")
+
+DELETE_ATTEMPTS_BY_CODE_SQL = text("""
+    DELETE FROM session_course_attempts
+    WHERE session_id = :sid
+      AND course_code_id = ANY(:ids)
+""").bindparams(
+    bindparam("sid", type_=BigInteger),
+    bindparam("ids", type_=ARRAY(Integer))
+).execution_options(query_name="transcript.delete_attempts_by_code")
+
+APPLY_CREDIT_DELTA_SQL = text("""
+    UPDATE advising_sessions
+    SET earned_credits = earned_credits + :delta,
+        transcript_version = transcript_version + 1
+    WHERE session_id = :sid
+    RETURNING transcript_version, earned_credits
+""").bindparams(
+    bindparam("delta", type_=Integer),
+    bindparam("sid", type_=BigInteger)
+).execution_options(query_name="transcript.apply_credit_delta")
+
+
+def unknown_course_codes(rows: List[Any], lookup: Dict[str, dict]) -> List[str]:
+    """
+    Distinct submitted codes that are not in the lookup (they would all
+    become the FREE_ELECTIVE attempt), sorted.
+    """
+    return sorted({r.course_code for r in rows if r.course_code not in lookup})
+
+
+def _attempt_changed(existing: Any, attempt: dict) -> bool:
+    return (
+        existing["grade"] != attempt["grade"]
+        or int(existing["credits_earned"]) != attempt["credits_earned"]
+        or existing["term"] != attempt["term"]
+    )
+
+
+def apply_transcript_delta(
+    session_id: int,
+    rows: List[Any],
+    remove_courses: Optional[List[str]],
+    db: Session
+) -> Dict[str, Any]:
+    """
+    Upserts the given transcript rows (the last row of a course code wins)
+    and deletes the attempts of remove_courses, writing only attempts that
+    actually change. Locks the session row for the transaction.
+    Does not commit.
+    """
+    session = db.execute(LOCK_SESSION_SQL, {"sid": session_id}).mappings().first()
+    if not session:
+        return {"error": "Session not found"}
+
+    curriculum_id = int(session["curriculum_id"])
+    remove_courses = list(dict.fromkeys(remove_courses or []))
+
+    lookup = load_course_lookup(curriculum_id, [r.course_code for r in rows] + remove_courses, db)
+
+    unknown = unknown_course_codes(rows, lookup)
+    if len(unknown) > 1:
+        return {
+            "error": f"Several unknown course codes would share the {FREE_ELECTIVE_CODE} attempt: {', '.join(unknown)}",
+            "unknown_courses": unknown
+        }
+
+    built = build_attempt_rows(session_id, curriculum_id, rows, db, lookup=lookup)
+    if "error" in built:
+        return built
+
+    courses_by_code_id = {int(c["course_code_id"]): c for c in lookup.values()}
+    upserts: Dict[int, dict] = {a["course_code_id"]: a for a in built["attempts"]}
+
+    # unknown codes were never stored under their own code: nothing to remove
+    remove_ids = {int(lookup[code]["course_code_id"]) for code in remove_courses if code in lookup}
+    conflicting = remove_ids & set(upserts)
+    if conflicting:
+        codes = sorted(courses_by_code_id[i]["course_code"] for i in conflicting)
+        return {"error": f"Course codes both upserted and removed: {', '.join(codes)}"}
+
+    existing = {
+        int(r["course_code_id"]): r
+        for r in db.execute(SESSION_ATTEMPTS_BY_CODE_SQL, {
+            "sid": session_id,
+            "ids": sorted(set(upserts) | remove_ids)
+        }).mappings()
+    }
+
+    changed = [a for ccid, a in upserts.items() if ccid not in existing or _attempt_changed(existing[ccid], a)]
+    removed = [existing[ccid] for ccid in sorted(remove_ids) if ccid in existing]
+
+    result = {
+        "rows_upserted": len(changed),
+        "rows_deleted": len(removed),
+        "rows_unchanged": len(upserts) - len(changed),
+    }
+
+    if not changed and not removed:
+        return {
+            **result,
+            "transcript_version": int(session["transcript_version"]),
+            "total_earned_credits": int(session["session_earned_credits"])
+        }
+
+    if changed:
+        stmt = pg_insert(SessionCourseAttempt)
+        db.execute(
+            stmt.on_conflict_do_update(
+                index_elements=["session_id", "course_code_id"],
+                set_={
+                    "grade": stmt.excluded.grade,
+                    "credits_earned": stmt.excluded.credits_earned,
+                    "term": stmt.excluded.term,
+                }
+            ),
+            changed
+        )
+    if removed:
+        db.execute(DELETE_ATTEMPTS_BY_CODE_SQL, {
+            "sid": session_id,
+            "ids": [int(r["course_code_id"]) for r in removed]
+        })
+
+    # old / new versions of every touched attempt
+    before = removed + [existing[a["course_code_id"]] for a in changed if a["course_code_id"] in existing]
+    after = [
+        {**courses_by_code_id[a["course_code_id"]], "grade": a["grade"], "credits_earned": a["credits_earned"]}
+        for a in changed
+    ]
+
+    totals = db.execute(APPLY_CREDIT_DELTA_SQL, {
+        "delta": sum(a["credits_earned"] for a in after) - sum(int(r["credits_earned"]) for r in before),
+        "sid": session_id
+    }).mappings().first()
+    transcript_version = int(totals["transcript_version"])
+
+    snapshot = get_curriculum_snapshot(curriculum_id, db)
+    stored = summary_from_row(session)
+    summary = apply_progress_delta(snapshot, stored, before, after) if stored is not None else None
+
+    if summary is None:
+        refresh_session_progress(session_id, curriculum_id, transcript_version, load_session_attempts(session_id, db), db)
+    else:
+        db.execute(UPSERT_PROGRESS_SUMMARY_SQL, summary_params(session_id, transcript_version, summary))
+
+    return {
+        **result,
+        "transcript_version": transcript_version,
+        "total_earned_credits": int(totals["earned_credits"])
+    }
@@ -0,0 +1,167 @@
+# app/services/what_if.py
+
+from __future__ import annotations
+
+import asyncio
+from typing import Optional, Dict, Any, List
+
+from ..db import async_fetch_all
+from .advising import evaluate_recommendations
+from .graduation_audit import evaluate_graduation_audit_summary
+from .grading import normalize_grade
+from .progress_summary import summarize_session_progress
+from .seminars import SEMINAR_PROGRESS_SQL, build_seminar_progress
+from .session_context import load_session_context_async
+from .term_offerings import get_term_offerings_async
+from .transcript import COURSE_LOOKUP_SQL, FREE_ELECTIVE_CODE, credits_for_attempt
+
+
+# ============================================================
+# What-if simulation (read-only)
+# ============================================================
+#
+# Hypothetical attempts are applied in memory on top of the stored ones
+# and both engines run on the result. Nothing is written: no attempts, no
+# summary, no result cache entry.
+
+def apply_what_if(
+    attempts: List[Any],
+    seminar_rows: List[Any],
+    lookup: Dict[str, dict],
+    changes: List[Any],
+    remove_courses: Optional[List[str]] = None
+) -> Dict[str, Any]:
+    """
+    Returns the simulated attempts and seminar rows. A hypothetical row
+    replaces the stored attempt of the same course code (one attempt per
+    code, as in session_course_attempts); unknown codes count as
+    FREE_ELECTIVE, exactly like a transcript upload.
+    """
+    free_row = lookup.get(FREE_ELECTIVE_CODE)
+
+    by_code_id: Dict[int, dict] = {int(a["course_code_id"]): dict(a) for a in attempts}
+    seminar_grades: Dict[str, Optional[str]] = {}
+    applied: List[dict] = []
+
+    for code in remove_courses or []:
+        course = lookup.get(code)
+        if course and by_code_id.pop(int(course["course_code_id"]), None) is not None:
+            seminar_grades[course["course_code"]] = None
+            applied.append({"course_code": code, "action": "removed"})
+
+    next_attempt_id = max((int(a["attempt_id"]) for a in attempts), default=0) + 1
+
+    for r in changes:
+        grade = normalize_grade(r.grade)
+        course = lookup.get(r.course_code)
+        is_free_elective = False
+
+        if not course:
+            if not free_row:
+                return {"error": "FREE_ELECTIVE not configured"}
+            course = free_row
+            is_free_elective = True
+
+        code_id = int(course["course_code_id"])
+        earned = credits_for_attempt(course, grade, is_free_elective)
+        previous = by_code_id.get(code_id)
+
+        by_code_id[code_id] = {
+            "attempt_id": previous["attempt_id"] if previous else next_attempt_id,
+            "grade": grade,
+            "credits_earned": earned,
+            "course_code_id": code_id,
+            "course_code": course["course_code"],
+            "course_id": int(course["course_id"]),
+            "credits": int(course["credits"]),
+            "is_ethics_seminar": bool(course["is_ethics_seminar"]),
+        }
+        if not previous:
+            next_attempt_id += 1
+
+        seminar_grades[course["course_code"]] = grade
+        applied.append({
+            "course_code": r.course_code,
+            "action": "overridden" if previous else "added",
+            "grade": grade,
+            "credits_earned": earned,
+            "free_elective": is_free_elective,
+        })
+
+    simulated_seminars = [
+        {**r, "grade": seminar_grades[r["course_code"]]} if r["course_code"] in seminar_grades else r
+        for r in seminar_rows
+    ]
+
+    return {
+        "attempts": sorted(by_code_id.values(), key=lambda a: int(a["attempt_id"])),
+        "seminar_rows": simulated_seminars,
+        "applied": applied,
+    }
+
+
+async def simulate_what_if_async(
+    session_id: int,
+    changes: List[Any],
+    remove_courses: Optional[List[str]] = None,
+    max_credits: int = 18,
+    offered_courses: Optional[List[str]] = None,
+    term: Optional[str] = None,
+    min_version: Optional[int] = None
+) -> Dict[str, Any]:
+    """
+    Recommendations + graduation audit for the session as if `changes`
+    (transcript rows) had been uploaded on top of its current attempts.
+    """
+    ctx = await load_session_context_async(session_id, min_version)
+
+    if ctx is None:
+        return {"error": "Session not found"}
+
+    offerings = None
+    if term:
+        offerings = await get_term_offerings_async(term)
+        if offerings is None:
+            return {"error": "Unknown term"}
+
+    params = {"sid": session_id}
+    codes = {r.course_code for r in changes} | set(remove_courses or []) | {FREE_ELECTIVE_CODE}
+
+    _, seminar_rows, lookup_rows = await asyncio.gather(
+        ctx.load(attempts=True),
+        async_fetch_all(SEMINAR_PROGRESS_SQL, params, primary=ctx.primary),
+        async_fetch_all(COURSE_LOOKUP_SQL, {"cid": ctx.curriculum_id, "codes": list(codes)}),
+    )
+
+    simulated = apply_what_if(
+        ctx.attempts,
+        seminar_rows,
+        {r["course_code"]: dict(r) for r in lookup_rows},
+        changes,
+        remove_courses
+    )
+    if "error" in simulated:
+        return simulated
+
+    summary = summarize_session_progress(ctx.snapshot, simulated["attempts"])
+
+    return {
+        "session_id": session_id,
+        "applied": simulated["applied"],
+        "recommendations": evaluate_recommendations(
+            session_id=session_id,
+            snapshot=ctx.snapshot,
+            attempts=simulated["attempts"],
+            chosen_group_id=ctx.chosen_group_id,
+            seminar_progress=build_seminar_progress(simulated["seminar_rows"]),
+            max_credits=max_credits,
+            offered_courses=offered_courses,
+            offered_course_code_ids=offerings.course_code_ids if offerings else None
+        ),
+        "graduation_audit": evaluate_graduation_audit_summary(
+            session_id=session_id,
+            snapshot=ctx.snapshot,
+            summary=summary,
+            seminar_required_total=ctx.seminar_required_total
+        ),
+    }
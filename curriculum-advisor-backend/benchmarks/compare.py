@@ -0,0 +1,47 @@
+# benchmarks/compare.py
+"""
+Compare two benchmark JSON files (python -m benchmarks.compare old.json new.json).
+Exits 1 when any p50 got slower than --threshold (default 1.25x).
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from typing import Dict, List, Optional, Tuple
+
+
+def load(path: str) -> Dict[Tuple[str, str], dict]:
+    with open(path, encoding="utf-8") as f:
+        report = json.load(f)
+    return {(r["scale"], r["benchmark"]): r["stats"] for r in report["results"]}
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Diff two benchmark result files.")
+    parser.add_argument("old")
+    parser.add_argument("new")
+    parser.add_argument("--threshold", type=float, default=1.25, help="p50 ratio counted as a regression")
+    args = parser.parse_args(argv)
+
+    old, new = load(args.old), load(args.new)
+    regressions = 0
+
+    print(f"{'scale':<8} {'benchmark':<28} {'old p50':>10} {'new p50':>10} {'ratio':>7}")
+    for key in sorted(old.keys() | new.keys()):
+        if key not in old or key not in new:
+            print(f"{key[0]:<8} {key[1]:<28} {'(only in ' + ('new' if key in new else 'old') + ')':>29}")
+            continue
+
+        before, after = old[key]["p50_ms"], new[key]["p50_ms"]
+        ratio = after / before if before else float("inf")
+        flag = "  <-- slower" if ratio > args.threshold else ""
+        regressions += bool(flag)
+        print(f"{key[0]:<8} {key[1]:<28} {before:>10.3f} {after:>10.3f} {ratio:>6.2f}x{flag}")
+
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,142 @@
+# benchmarks/prepared.py
+"""
+Per-request cost of the recommendation read path (session context,
+attempts, seminar progress) with and without statement reuse.
+
+    python -m benchmarks.prepared --database-url postgresql+psycopg2://... \\
+        --output prepared.json
+
+Variants, each running the three statements of one request:
+  async_inline_default      text() rebuilt per call, asyncpg default cache
+                            (100 statements, no connect_arg: the old setup)
+  async_module_cache_256    module-level statements, cache of 256
+  sync_inline               text() rebuilt per call (psycopg2)
+  sync_module               module-level statements (psycopg2)
+
+Read-only: it picks the existing session with the most attempts.
+The output has the same shape as benchmarks.run, so benchmarks.compare
+works on it.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+from .run import measure, git_commit
+
+
+BUSIEST_SESSION_SQL = """
+    SELECT session_id
+    FROM session_course_attempts
+    GROUP BY session_id
+    ORDER BY COUNT(*) DESC
+    LIMIT 1
+"""
+
+
+def run(repeat: int) -> List[Dict[str, Any]]:
+    # imported late: app.config reads DATABASE_URL at import time
+    from sqlalchemy import text
+    from sqlalchemy.ext.asyncio import create_async_engine
+    from app.config import ASYNC_DATABASE_URL
+    from app.db import engine
+    from app.services.seminars import SEMINAR_PROGRESS_SQL
+    from app.services.session_context import SESSION_CONTEXT_SQL
+    from app.services.transcript import SESSION_ATTEMPTS_SQL
+
+    module_statements = [SESSION_CONTEXT_SQL, SESSION_ATTEMPTS_SQL, SEMINAR_PROGRESS_SQL]
+    sources = [stmt.text for stmt in module_statements]
+
+    with engine.connect() as conn:
+        sid = conn.execute(text(BUSIEST_SESSION_SQL)).scalar()
+    if sid is None:
+        raise SystemExit("no session with attempts in this database")
+    params = {"sid": sid}
+
+    results: List[Dict[str, Any]] = []
+
+    def record(name: str, stats: Dict[str, float]):
+        results.append({"benchmark": name, "scale": "request", "params": {"session_id": sid}, "stats": stats})
+        print(f"  {name:<28} p50={stats['p50_ms']:.3f}ms p95={stats['p95_ms']:.3f}ms", file=sys.stderr)
+
+    # ----------------------------
+    # async (asyncpg): one pooled connection, statements in sequence
+    # ----------------------------
+    loop = asyncio.new_event_loop()
+
+    def async_variant(cache_size: Optional[int], inline: bool):
+        # cache_size None: asyncpg's own default
+        connect_args = {} if cache_size is None else {"prepared_statement_cache_size": cache_size}
+        bench_engine = create_async_engine(
+            ASYNC_DATABASE_URL,
+            pool_size=1,
+            max_overflow=0,
+            connect_args=connect_args
+        )
+
+        async def one_request():
+            async with bench_engine.connect() as conn:
+                for src, stmt in zip(sources, module_statements):
+                    await conn.execute(text(src) if inline else stmt, params)
+
+        try:
+            return measure(lambda: loop.run_until_complete(one_request()), repeat, warmup=3)
+        finally:
+            loop.run_until_complete(bench_engine.dispose())
+
+    record("async_inline_default", async_variant(None, inline=True))
+    record("async_module_cache_256", async_variant(256, inline=False))
+    loop.close()
+
+    # ----------------------------
+    # sync (psycopg2): no server-side prepare, only SQLAlchemy's compiled cache
+    # ----------------------------
+    def sync_request(inline: bool):
+        with engine.connect() as conn:
+            for src, stmt in zip(sources, module_statements):
+                conn.execute(text(src) if inline else stmt, params).all()
+
+    record("sync_inline", measure(lambda: sync_request(True), repeat, warmup=3))
+    record("sync_module", measure(lambda: sync_request(False), repeat, warmup=3))
+
+    return results
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark statement reuse on the recommendation read path.")
+    parser.add_argument("--database-url", default=os.getenv("BENCH_DATABASE_URL"),
+                        help="database to read from (default: BENCH_DATABASE_URL)")
+    parser.add_argument("--repeat", type=int, default=200, help="samples per variant")
+    parser.add_argument("--output", help="write JSON here instead of stdout")
+    args = parser.parse_args(argv)
+
+    if not args.database_url:
+        parser.error("--database-url or BENCH_DATABASE_URL is required")
+    os.environ["DATABASE_URL"] = args.database_url
+
+    report = {
+        "meta": {
+            "git_commit": git_commit(),
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "repeat": args.repeat,
+        },
+        "results": run(args.repeat),
+    }
+
+    out = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(out + "\n")
+    else:
+        print(out)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
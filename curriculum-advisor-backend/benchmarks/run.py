@@ -0,0 +1,217 @@
+# benchmarks/run.py
+"""
+Backend benchmark suite.
+
+    cd curriculum-advisor-backend
+    python -m benchmarks.run --database-url postgresql+psycopg2://... \\
+        --scales small,medium --output bench.json
+    python -m benchmarks.compare old.json new.json
+    python -m benchmarks.prepared --database-url ...   (statement reuse)
+
+Runs against a local database that already has the database.sql + sql.sql
+schema. It WRITES synthetic curricula (curriculum_code BENCH_*), sessions
+and attempts into it, so never point it at production.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from typing import Callable, Dict, Any, List, Optional
+
+
+def measure(fn: Callable[[], Any], repeat: int, warmup: int = 1) -> Dict[str, float]:
+    """
+    Wall-clock stats (milliseconds) over `repeat` calls after `warmup` calls.
+    """
+    for _ in range(warmup):
+        fn()
+
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+
+    samples.sort()
+    return {
+        "n": repeat,
+        "mean_ms": round(statistics.fmean(samples), 4),
+        "p50_ms": round(samples[len(samples) // 2], 4),
+        "p95_ms": round(samples[min(len(samples) - 1, int(len(samples) * 0.95))], 4),
+        "min_ms": round(samples[0], 4),
+        "max_ms": round(samples[-1], 4),
+    }
+
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_scale(scale_name: str, seed: int, repeat: int) -> List[Dict[str, Any]]:
+    # imported late: app.config reads DATABASE_URL at import time
+    from app.db import SessionLocal
+    from app.models import AdvisingSession
+    from app.services.advising import (
+        build_recommendations,
+        build_next_semester_plan,
+        classify_candidates,
+        bucket_candidates,
+        build_elective_progress,
+        elective_priority_state,
+    )
+    from app.services.curriculum_snapshot import get_curriculum_snapshot, load_curriculum_snapshot
+    from app.services.grading import is_passing
+    from app.services.graduation_audit import run_graduation_audit
+    from app.services.transcript import replace_session_attempts
+    from .synthetic import SCALES, generate_curriculum, generate_transcript, student_id
+
+    scale = SCALES[scale_name]
+    results: List[Dict[str, Any]] = []
+
+    def record(name: str, stats: Dict[str, float], **params):
+        results.append({"benchmark": name, "scale": scale_name, "params": params, "stats": stats})
+        print(f"  {name:<28} p50={stats['p50_ms']:.3f}ms p95={stats['p95_ms']:.3f}ms", file=sys.stderr)
+
+    db = SessionLocal()
+    try:
+        curriculum = generate_curriculum(db, scale, seed)
+        transcripts = [generate_transcript(curriculum, i) for i in range(scale.students)]
+
+        # one session per synthetic student (reused between runs)
+        session_ids = []
+        for i in range(scale.students):
+            sid = student_id(curriculum, i)
+            row = db.query(AdvisingSession).filter_by(student_id_number=sid).order_by(AdvisingSession.session_id.desc()).first()
+            if row is None:
+                row = AdvisingSession(student_id_number=sid, curriculum_id=curriculum.curriculum_id, earned_credits=0)
+                db.add(row)
+                db.flush()
+            session_ids.append(int(row.session_id))
+        db.commit()
+
+        print(f"[{scale_name}] curriculum_id={curriculum.curriculum_id} students={scale.students}", file=sys.stderr)
+
+        # ----------------------------
+        # upload_transcript (replace + commit), cycling through students
+        # ----------------------------
+        uploads = iter(range(10 ** 9))
+
+        def upload():
+            i = next(uploads) % scale.students
+            replace_session_attempts(session_ids[i], curriculum.curriculum_id, transcripts[i], db)
+            db.commit()
+
+        # every session gets its attempts before the read benchmarks
+        for _ in range(scale.students):
+            upload()
+        record("upload_transcript", measure(upload, repeat), rows_per_transcript=round(statistics.fmean(len(t) for t in transcripts), 1))
+
+        # ----------------------------
+        # curriculum snapshot load (cold)
+        # ----------------------------
+        record("curriculum_snapshot_load", measure(lambda: load_curriculum_snapshot(curriculum.curriculum_id, db), max(3, repeat // 10)))
+
+        # ----------------------------
+        # build_recommendations (warm snapshot)
+        # ----------------------------
+        recs = iter(range(10 ** 9))
+        record("build_recommendations", measure(
+            lambda: build_recommendations(session_ids[next(recs) % scale.students], db, max_credits=18), repeat
+        ))
+
+        # ----------------------------
+        # build_next_semester_plan (pure, on real buckets)
+        # ----------------------------
+        snapshot = get_curriculum_snapshot(curriculum.curriculum_id, db)
+        half = curriculum.specialized_codes[: len(curriculum.specialized_codes) // 2]
+        passed = {c["course_id"] for c in snapshot.candidates if c["course_code"] in half}
+        group_id = curriculum.group_ids[0]
+        buckets = bucket_candidates(snapshot, classify_candidates(snapshot, passed, set(), 60), group_id)
+        # priority the engine would derive (no elective done yet: FOCUS_ON_CHOSEN_TRACK)
+        progress = build_elective_progress(snapshot.elective_rules, group_id, 0, 0) if snapshot.elective_rules else None
+        priority = elective_priority_state(progress, group_id)
+        record("build_next_semester_plan", measure(
+            lambda: build_next_semester_plan(buckets, priority, 18, snapshot.course_rank_by_code), repeat * 10
+        ), candidates=len(snapshot.candidates), elective_priority=priority)
+
+        # ----------------------------
+        # run_graduation_audit
+        # ----------------------------
+        audits = iter(range(10 ** 9))
+        record("run_graduation_audit", measure(
+            lambda: run_graduation_audit(session_ids[next(audits) % scale.students], db), repeat
+        ))
+
+        # ----------------------------
+        # is_passing (micro, 1000 calls per sample)
+        # ----------------------------
+        pairs = [(r.grade, "C") for t in transcripts[:20] for r in t][:1000]
+        record("is_passing_x1000", measure(lambda: [is_passing(g, req) for g, req in pairs], repeat), calls=len(pairs))
+
+    finally:
+        db.close()
+
+    return results
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Run backend benchmarks and print JSON results.")
+    parser.add_argument("--database-url", default=os.getenv("BENCH_DATABASE_URL"),
+                        help="local database to use (default: BENCH_DATABASE_URL)")
+    parser.add_argument("--scales", default="small,medium", help="comma separated: small, medium, large")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=50, help="samples per benchmark")
+    parser.add_argument("--output", help="write JSON here instead of stdout")
+    args = parser.parse_args(argv)
+
+    if not args.database_url:
+        parser.error("--database-url or BENCH_DATABASE_URL is required (the suite writes data)")
+    os.environ["DATABASE_URL"] = args.database_url
+
+    from .synthetic import SCALES
+    scales = [s.strip() for s in args.scales.split(",") if s.strip()]
+    unknown = [s for s in scales if s not in SCALES]
+    if unknown:
+        parser.error(f"unknown scales {unknown}, expected {list(SCALES)}")
+
+    results: List[Dict[str, Any]] = []
+    for scale_name in scales:
+        results.extend(run_scale(scale_name, args.seed, args.repeat))
+
+    report = {
+        "meta": {
+            "git_commit": git_commit(),
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "seed": args.seed,
+            "repeat": args.repeat,
+            "scales": scales,
+        },
+        "results": results,
+    }
+
+    out = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(out + "\n")
+    else:
+        print(out)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
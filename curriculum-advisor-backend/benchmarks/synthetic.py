@@ -0,0 +1,347 @@
+# benchmarks/synthetic.py
+
+from __future__ import annotations
+
+import random
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.schemas import TranscriptRow
+
+
+# ============================================================
+# Synthetic curricula shaped like BSCS653 (sql.sql)
+# ============================================================
+#
+# GE subcategories (language / humanities / social science / science),
+# Specialized core + major courses with prerequisite chains, credit
+# requirements and min grades, a Major Elective subcategory with explicit
+# groups plus "Selected Topic" code ranges, and a Free Electives bucket.
+# Everything is derived from (scale, seed), so the same arguments always
+# produce the same curriculum and transcripts.
+
+@dataclass(frozen=True)
+class Scale:
+    name: str
+    ge_courses: int
+    core_courses: int
+    major_courses: int
+    elective_groups: int
+    electives_per_group: int
+    # longest prerequisite chain among major courses
+    chain_depth: int
+    students: int
+
+
+SCALES: Dict[str, Scale] = {
+    # roughly BSCS653 itself
+    "small": Scale("small", ge_courses=18, core_courses=6, major_courses=20,
+                   elective_groups=3, electives_per_group=12, chain_depth=5, students=50),
+    "medium": Scale("medium", ge_courses=40, core_courses=12, major_courses=80,
+                    elective_groups=6, electives_per_group=30, chain_depth=10, students=200),
+    "large": Scale("large", ge_courses=80, core_courses=24, major_courses=320,
+                   elective_groups=12, electives_per_group=60, chain_depth=20, students=500),
+}
+
+GRADE_WEIGHTS: List[Tuple[str, int]] = [
+    ("A", 14), ("A-", 10), ("B+", 12), ("B", 14), ("B-", 8), ("C+", 8), ("C", 8),
+    ("C-", 4), ("D+", 3), ("D", 3), ("F", 5), ("W", 3), ("IP", 6), ("TR", 2),
+]
+
+# well clear of real student ID ranges (6530000 ..)
+STUDENT_ID_BASE = 90_000_000
+
+
+@dataclass
+class SyntheticCurriculum:
+    curriculum_id: int
+    scale: Scale
+    seed: int
+    # course codes in an order that respects prerequisites
+    specialized_codes: List[str]
+    ge_codes: List[str]
+    elective_codes: List[str]
+    seminar_codes: List[str]
+    prereqs_by_code: Dict[str, List[str]]
+    student_id_start: int
+    group_ids: List[int]
+
+
+def _code_prefix(scale: Scale, seed: int) -> str:
+    # codes are globally unique, so every (scale, seed) gets its own letters
+    letters = "ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+    n = seed * len(SCALES) + list(SCALES).index(scale.name)
+    return "Z" + letters[(n // 26) % 26] + letters[n % 26]
+
+
+def _scalar(db: Session, sql: str, params: dict):
+    return db.execute(text(sql), params).scalar()
+
+
+def _main_category_ids(db: Session) -> Dict[str, int]:
+    rows = db.execute(text("SELECT main_category_id, name FROM main_categories")).mappings().all()
+    return {r["name"]: int(r["main_category_id"]) for r in rows}
+
+
+def _add_course(db: Session, code: str, name: str, credits: int, seminar: bool = False) -> Tuple[int, int]:
+    course_id = _scalar(db, """
+        INSERT INTO courses (course_name, credits, is_ethics_seminar)
+        VALUES (:name, :credits, :seminar)
+        RETURNING course_id
+    """, {"name": name, "credits": credits, "seminar": seminar})
+    course_code_id = _scalar(db, """
+        INSERT INTO course_codes (course_code, course_id)
+        VALUES (:code, :cid)
+        RETURNING course_code_id
+    """, {"code": code, "cid": course_id})
+    return int(course_id), int(course_code_id)
+
+
+def _add_subcategory(db: Session, curriculum_id: int, main_category_id: int, name: str, required: int, order: int) -> int:
+    return int(_scalar(db, """
+        INSERT INTO curriculum_subcategories
+            (curriculum_id, main_category_id, name, required_credits, display_order)
+        VALUES (:cid, :mid, :name, :required, :ord)
+        RETURNING subcategory_id
+    """, {"cid": curriculum_id, "mid": main_category_id, "name": name, "required": required, "ord": order}))
+
+
+def _link(db: Session, subcategory_id: int, course_code_id: int) -> None:
+    db.execute(text("""
+        INSERT INTO subcategory_course_codes (subcategory_id, course_code_id)
+        VALUES (:sid, :ccid)
+    """), {"sid": subcategory_id, "ccid": course_code_id})
+
+
+def generate_curriculum(db: Session, scale: Scale, seed: int = 0) -> SyntheticCurriculum:
+    """
+    Inserts one synthetic curriculum (or reuses it when this scale/seed
+    already exists) and commits. Expects the database.sql + sql.sql schema
+    and main categories to be present.
+    """
+    rng = random.Random(f"{scale.name}:{seed}")
+    prefix = _code_prefix(scale, seed)
+    curriculum_code = f"BENCH_{scale.name.upper()}_{seed}"
+    student_id_start = STUDENT_ID_BASE + (seed * len(SCALES) + list(SCALES).index(scale.name)) * 1_000_000
+
+    existing = _scalar(db, "SELECT curriculum_id FROM curriculums WHERE curriculum_code = :code", {"code": curriculum_code})
+
+    ge_codes = [f"{prefix}1{n:03d}" for n in range(scale.ge_courses)]
+    core_codes = [f"{prefix}2{n:03d}" for n in range(scale.core_courses)]
+    major_codes = [f"{prefix}3{n:03d}" for n in range(scale.major_courses)]
+    # electives: 4000 + 100 * group + n (electives_per_group < 100)
+    elective_codes = [
+        f"{prefix}{4000 + 100 * g + n}"
+        for g in range(scale.elective_groups)
+        for n in range(scale.electives_per_group)
+    ]
+    seminar_codes = [f"{prefix}0{n:03d}" for n in range(3)]
+
+    # prerequisite chains: core -> major in layers of chain_depth
+    specialized_codes = core_codes + major_codes
+    prereqs_by_code: Dict[str, List[str]] = {}
+    layer_size = max(1, len(major_codes) // scale.chain_depth)
+    for i, code in enumerate(major_codes):
+        layer = i // layer_size
+        pool = core_codes if layer == 0 else major_codes[(layer - 1) * layer_size:layer * layer_size]
+        prereqs_by_code[code] = rng.sample(pool, k=min(len(pool), rng.randint(1, 2)))
+    for g in range(scale.elective_groups):
+        for n in range(0, scale.electives_per_group, 4):
+            code = elective_codes[g * scale.electives_per_group + n]
+            prereqs_by_code[code] = [rng.choice(major_codes[:layer_size * 2])]
+
+    result = SyntheticCurriculum(
+        curriculum_id=int(existing or 0),
+        scale=scale,
+        seed=seed,
+        specialized_codes=specialized_codes,
+        ge_codes=ge_codes,
+        elective_codes=elective_codes,
+        seminar_codes=seminar_codes,
+        prereqs_by_code=prereqs_by_code,
+        student_id_start=student_id_start,
+        group_ids=[],
+    )
+
+    if existing:
+        result.group_ids = [
+            int(g) for g in db.execute(text("""
+                SELECT group_id FROM major_elective_groups WHERE curriculum_id = :cid ORDER BY group_id
+            """), {"cid": existing}).scalars()
+        ]
+        return result
+
+    main = _main_category_ids(db)
+    ge_id, spec_id, fe_id = main["General Education"], main["Specialized"], main["Free Electives"]
+
+    elective_required = 3 * (scale.elective_groups + 8)
+    spec_required = 3 * (len(specialized_codes)) + elective_required
+    ge_required = 3 * (scale.ge_courses // 2)
+    total_required = ge_required + spec_required + 12
+
+    cid = int(_scalar(db, """
+        INSERT INTO curriculums (curriculum_code, major_id, total_required_credits)
+        VALUES (:code, (SELECT MIN(major_id) FROM majors), :total)
+        RETURNING curriculum_id
+    """, {"code": curriculum_code, "total": total_required}))
+    result.curriculum_id = cid
+
+    db.execute(text("""
+        INSERT INTO curriculum_id_ranges (curriculum_id, id_start, id_end)
+        VALUES (:cid, :start, :end)
+    """), {"cid": cid, "start": student_id_start, "end": student_id_start + 999_999})
+
+    for mid, required in ((ge_id, ge_required), (spec_id, spec_required), (fe_id, 12)):
+        db.execute(text("""
+            INSERT INTO curriculum_main_categories (curriculum_id, main_category_id, required_credits)
+            VALUES (:cid, :mid, :required)
+        """), {"cid": cid, "mid": mid, "required": required})
+
+    # --------------------------------------------------------
+    # General Education (4 subcategories, like BSCS653)
+    # --------------------------------------------------------
+    ge_subcats = [
+        _add_subcategory(db, cid, ge_id, name, 0, order)
+        for order, name in enumerate(
+            ["Language Courses", "Humanities Courses", "Social Science Courses", "Science and Mathematics Courses"], 1
+        )
+    ]
+    for i, code in enumerate(ge_codes):
+        _, ccid = _add_course(db, code, f"GE Course {code}", rng.choice([2, 3, 3]))
+        _link(db, ge_subcats[i % len(ge_subcats)], ccid)
+
+    # --------------------------------------------------------
+    # Specialized: core, major (chains), major electives
+    # --------------------------------------------------------
+    core_sub = _add_subcategory(db, cid, spec_id, "Core Courses", 3 * len(core_codes), 1)
+    major_sub = _add_subcategory(db, cid, spec_id, "Major Courses", 3 * len(major_codes), 2)
+    elective_sub = _add_subcategory(db, cid, spec_id, "Major Elective Courses", elective_required, 3)
+    fe_sub = _add_subcategory(db, cid, fe_id, "Free Electives", 12, 1)
+
+    course_ids: Dict[str, int] = {}
+    code_ids: Dict[str, int] = {}
+    for code in core_codes:
+        course_ids[code], code_ids[code] = _add_course(db, code, f"Core {code}", 3)
+        _link(db, core_sub, code_ids[code])
+    for code in major_codes:
+        course_ids[code], code_ids[code] = _add_course(db, code, f"Major {code}", 3)
+        _link(db, major_sub, code_ids[code])
+    for code in elective_codes:
+        course_ids[code], code_ids[code] = _add_course(db, code, f"Elective {code}", 3)
+        _link(db, elective_sub, code_ids[code])
+
+    for code, prereqs in prereqs_by_code.items():
+        for p in prereqs:
+            db.execute(text("""
+                INSERT INTO course_prerequisites (course_id, prerequisite_course_id)
+                VALUES (:cid, :pid)
+            """), {"cid": course_ids[code], "pid": course_ids[p]})
+
+    # min grades and credit requirements on a slice of the major courses
+    for code in major_codes[::5]:
+        db.execute(text("""
+            INSERT INTO curriculum_course_min_grades (curriculum_id, course_id, min_required_grade)
+            VALUES (:cid, :course, 'C')
+        """), {"cid": cid, "course": course_ids[code]})
+    for code in major_codes[-max(1, len(major_codes) // 10):]:
+        db.execute(text("""
+            INSERT INTO curriculum_course_credit_requirements (curriculum_id, course_id, min_earned_credits)
+            VALUES (:cid, :course, 90)
+        """), {"cid": cid, "course": course_ids[code]})
+
+    # elective groups: explicit codes + a "Selected Topic" range each
+    for g in range(scale.elective_groups):
+        group_id = int(_scalar(db, """
+            INSERT INTO major_elective_groups (curriculum_id, subcategory_id, name, min_courses, required_credits)
+            VALUES (:cid, :sid, :name, 5, 15)
+            RETURNING group_id
+        """, {"cid": cid, "sid": elective_sub, "name": f"Group {g + 1}"}))
+        result.group_ids.append(group_id)
+
+        group_codes = elective_codes[g * scale.electives_per_group:(g + 1) * scale.electives_per_group]
+        explicit, ranged = group_codes[: len(group_codes) * 3 // 4], group_codes[len(group_codes) * 3 // 4:]
+        for code in explicit:
+            db.execute(text("""
+                INSERT INTO major_elective_group_course_codes (group_id, course_code_id)
+                VALUES (:gid, :ccid)
+            """), {"gid": group_id, "ccid": code_ids[code]})
+        if ranged:
+            db.execute(text("""
+                INSERT INTO course_code_ranges (subcategory_id, prefix, number_start, number_end, group_id)
+                VALUES (:sid, :prefix, :start, :end, :gid)
+            """), {
+                "sid": elective_sub,
+                "prefix": prefix,
+                "start": int(ranged[0][len(prefix):]),
+                "end": int(ranged[-1][len(prefix):]),
+                "gid": group_id,
+            })
+
+    db.execute(text("""
+        INSERT INTO major_elective_rules (curriculum_id, min_from_chosen_group, min_from_all_groups)
+        VALUES (:cid, 5, 6)
+    """), {"cid": cid})
+
+    # seminars are global; three per synthetic curriculum keeps the shape
+    for code in seminar_codes:
+        _add_course(db, code, f"Professional Ethics Seminar {code}", 0, seminar=True)
+
+    # unknown codes fall back to FREE_ELECTIVE, linked to Free Electives
+    free_ccid = _scalar(db, "SELECT course_code_id FROM course_codes WHERE course_code = 'FREE_ELECTIVE'", {})
+    if free_ccid is None:
+        _, free_ccid = _add_course(db, "FREE_ELECTIVE", "Free Elective", 3)
+    _link(db, fe_sub, int(free_ccid))
+
+    db.commit()
+    return result
+
+
+# ============================================================
+# Synthetic transcripts
+# ============================================================
+
+def generate_transcript(curriculum: SyntheticCurriculum, student_index: int, progress: Optional[float] = None) -> List[TranscriptRow]:
+    """
+    One student's transcript. progress (0..1, random when None) is how far
+    through the program the student is; courses are taken in prerequisite
+    order, with a realistic share of F / W / IP grades and one unknown
+    code that maps to FREE_ELECTIVE.
+    """
+    rng = random.Random(f"{curriculum.scale.name}:{curriculum.seed}:{student_index}")
+    if progress is None:
+        progress = rng.random()
+
+    grades, weights = zip(*GRADE_WEIGHTS)
+    rows: List[TranscriptRow] = []
+
+    def take(codes: List[str], share: float):
+        for code in codes[: int(len(codes) * share)]:
+            rows.append(TranscriptRow(
+                course_code=code,
+                grade=rng.choices(grades, weights)[0],
+                term=f"{1 + len(rows) // 6}/{2020 + len(rows) // 12}"
+            ))
+
+    take(curriculum.ge_codes, min(1.0, progress * 1.3))
+    take(curriculum.specialized_codes, progress)
+    take(rng.sample(curriculum.elective_codes, len(curriculum.elective_codes)), progress * 0.3)
+    take(curriculum.seminar_codes, progress)
+
+    # at most one: every unknown code becomes the same FREE_ELECTIVE attempt,
+    # and attempts are unique per (session, course code)
+    if progress > 0.25:
+        rows.append(TranscriptRow(course_code="XFE9000", grade=rng.choice(["A", "B", "C"]), term=None))
+
+    # seminars are S / IP only
+    for r in rows:
+        if r.course_code in curriculum.seminar_codes:
+            r.grade = "S" if r.grade not in ("IP", "W") else "IP"
+
+    return rows
+
+
+def student_id(curriculum: SyntheticCurriculum, student_index: int) -> int:
+    return curriculum.student_id_start + student_index
@@ -0,0 +1,12 @@
+# tests/conftest.py
+"""
+app.config reads DATABASE_URL at import time. Pure tests never connect,
+so a placeholder is enough for them; database tests skip when only the
+placeholder is set (TEST_DATABASE_PLACEHOLDER).
+"""
+
+import os
+
+if not os.getenv("DATABASE_URL"):
+    os.environ["DATABASE_URL"] = "postgresql+psycopg2://localhost/curriculum_test"
+    os.environ["TEST_DATABASE_PLACEHOLDER"] = "1"
@@ -0,0 +1,89 @@
+# tests/test_compact.py
+"""
+Recommendation response shaping (pure, no database).
+"""
+
+import copy
+
+from app.services.compact import RECOMMENDATION_FIELDS, shape_recommendations, unknown_fields
+
+
+def course(code, name, credits=3):
+    return {"course_code": code, "course_name": name, "credits": credits, "subcategory_name": "Core"}
+
+
+RESULT = {
+    "session_id": 7,
+    "curriculum_id": 1,
+    "earned_credits": 60,
+    "passed_course_codes": ["CSX1001"],
+    "failed_course_codes": [],
+    "elective_progress": None,
+    "elective_priority": None,
+    "eligible_specialized_by_subcategory": {
+        "Other Specialized Courses": {
+            "eligible": [course("CSX2001", "Data Structures"), course("CSX2002", "Databases")],
+            "blocked_by_prerequisite": [course("CSX3001", "Compilers")],
+        },
+        "Major Electives": {
+            "tracks": {
+                "1": {"eligible": [course("CSX2001", "Data Structures"), course("ITX4001", "Cloud", 4)]},
+            },
+        },
+    },
+    "next_semester_plan": {"recommended_courses": [course("CSX2001", "Data Structures")], "total_credits": 3},
+}
+
+
+def test_unknown_fields():
+    assert unknown_fields(None) == []
+    assert unknown_fields(list(RECOMMENDATION_FIELDS)) == []
+    assert unknown_fields(["next_semester_plan", "plan", "courses"]) == ["plan", "courses"]
+
+
+def test_full_view_is_a_copy():
+    shaped = shape_recommendations(RESULT)
+
+    assert shaped == RESULT
+    assert shaped is not RESULT
+
+
+def test_fields_keep_session_id():
+    shaped = shape_recommendations(RESULT, fields=["next_semester_plan"])
+
+    assert shaped == {"session_id": 7, "next_semester_plan": RESULT["next_semester_plan"]}
+
+
+def test_compact_lists_codes_and_courses_once():
+    original = copy.deepcopy(RESULT)
+
+    shaped = shape_recommendations(RESULT, compact=True)
+
+    assert shaped["eligible_specialized_by_subcategory"] == {
+        "Other Specialized Courses": {
+            "eligible": ["CSX2001", "CSX2002"],
+            "blocked_by_prerequisite": ["CSX3001"],
+        },
+        "Major Electives": {"tracks": {"1": {"eligible": ["CSX2001", "ITX4001"]}}},
+    }
+    assert shaped["courses"] == {
+        "CSX2001": {"course_name": "Data Structures", "credits": 3},
+        "CSX2002": {"course_name": "Databases", "credits": 3},
+        "CSX3001": {"course_name": "Compilers", "credits": 3},
+        "ITX4001": {"course_name": "Cloud", "credits": 4},
+    }
+    # the plan keeps its full course dicts, and the cached result is untouched
+    assert shaped["next_semester_plan"] == RESULT["next_semester_plan"]
+    assert RESULT == original
+
+
+def test_compact_without_buckets_adds_no_courses():
+    shaped = shape_recommendations(RESULT, compact=True, fields=["next_semester_plan"])
+
+    assert "courses" not in shaped
+
+
+def test_errors_pass_through():
+    error = {"error": "Session not found"}
+
+    assert shape_recommendations(error, compact=True, fields=["next_semester_plan"]) is error
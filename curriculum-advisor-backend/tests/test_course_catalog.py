@@ -0,0 +1,61 @@
+# tests/test_course_catalog.py
+"""
+Course catalog ETag and keyset paging helpers (pure, no database).
+"""
+
+import pytest
+
+from app.services.course_catalog import catalog_etag, etag_matches, keyset_page, prefix_pattern
+
+
+@pytest.mark.parametrize("header, matches", [
+    (None, False),
+    ("", False),
+    ('"courses-7"', True),
+    ('W/"courses-7"', True),
+    ('"courses-6", "courses-7"', True),
+    ('"courses-6",W/"courses-8"', False),
+    ("*", True),
+    ("courses-7", False),
+])
+def test_etag_matches(header, matches):
+    assert etag_matches(header, catalog_etag(7)) is matches
+
+
+def test_prefix_pattern_escapes_like_wildcards():
+    assert prefix_pattern(None) is None
+    assert prefix_pattern("  ") is None
+    assert prefix_pattern(" CSX ") == "CSX%"
+    assert prefix_pattern("50%_off\\") == "50\\%\\_off\\\\%"
+
+
+def rows(*ids):
+    return [{"course_id": i, "course_name": f"C{i}"} for i in ids]
+
+
+def test_keyset_page_with_more_rows():
+    # the query asks for limit + 1 rows
+    page = keyset_page(rows(3, 5, 8), 2, "course_id")
+
+    assert [r["course_id"] for r in page["items"]] == [3, 5]
+    assert page["next_after"] == 5
+
+
+def test_keyset_last_page():
+    assert keyset_page(rows(3, 5), 2, "course_id") == {"items": rows(3, 5), "next_after": None}
+    assert keyset_page(rows(3), 2, "course_id")["next_after"] is None
+    assert keyset_page([], 2, "course_id") == {"items": [], "next_after": None}
+
+
+def test_keyset_pages_walk_the_whole_catalog():
+    catalog = rows(*range(1, 12))
+    seen, after = [], 0
+
+    while True:
+        page = keyset_page([r for r in catalog if r["course_id"] > after][:4 + 1], 4, "course_id")
+        seen.extend(r["course_id"] for r in page["items"])
+        if page["next_after"] is None:
+            break
+        after = page["next_after"]
+
+    assert seen == list(range(1, 12))
@@ -0,0 +1,59 @@
+# tests/test_elective_groups.py
+"""
+ElectiveGroupResolver (pure, no database).
+"""
+
+import random
+
+from app.services.elective_groups import ElectiveGroupResolver
+
+
+def test_explicit_mapping_wins_over_ranges():
+    resolver = ElectiveGroupResolver(explicit={7: 1}, ranges=[("CSX", 4000, 4999, 2)])
+
+    assert resolver.resolve(7, "CSX4100") == 1
+    assert resolver.resolve(8, "CSX4100") == 2
+
+
+def test_range_lookup():
+    resolver = ElectiveGroupResolver(ranges=[("csx ", 3000, 3999, 1), ("ITX", 4000, 4099, 2)])
+
+    assert resolver.resolve_range("CSX3000") == 1
+    assert resolver.resolve_range("csx3999") == 1
+    assert resolver.resolve_range("CSX4000") is None
+    assert resolver.resolve_range("ITX4099") == 2
+    assert resolver.resolve_range("MTH3000") is None
+    assert resolver.resolve_range("CSX-3000") is None
+
+
+def test_overlapping_ranges_latest_start_wins():
+    resolver = ElectiveGroupResolver(ranges=[
+        ("CSX", 4000, 4999, 1),
+        ("CSX", 4200, 4299, 2),
+        ("CSX", 4250, 4260, None),  # no group: skipped
+    ])
+
+    assert resolver.resolve_range("CSX4100") == 1
+    assert resolver.resolve_range("CSX4210") == 2
+    assert resolver.resolve_range("CSX4255") == 2
+    assert resolver.resolve_range("CSX4300") == 1
+    # a long earlier range still covers numbers past a short later one
+    assert resolver.resolve_range("CSX4950") == 1
+
+
+def test_random_overlaps_match_a_linear_scan():
+    rng = random.Random(3)
+
+    for _ in range(300):
+        ranges = []
+        for _ in range(rng.randint(0, 8)):
+            start = rng.randint(1000, 1100)
+            ranges.append(("CSX", start, start + rng.randint(0, 40), rng.choice([None, 1, 2, 3])))
+        # distinct (start, end) so "latest start, then latest end" is unambiguous
+        ranges = list({(r[1], r[2]): r for r in ranges}.values())
+        resolver = ElectiveGroupResolver(ranges=ranges)
+
+        for num in range(990, 1150):
+            covering = [r for r in ranges if r[1] <= num <= r[2] and r[3]]
+            expected = max(covering, key=lambda r: (r[1], r[2]))[3] if covering else None
+            assert resolver.resolve_range(f"CSX{num}") == expected
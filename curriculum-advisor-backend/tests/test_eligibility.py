@@ -0,0 +1,126 @@
+# tests/test_eligibility.py
+"""
+EligibilityIndex must classify exactly like the Python loop of
+classify_candidates (pure, no database).
+"""
+
+import random
+
+import pytest
+
+from app.services import curriculum_snapshot, eligibility
+from app.services.advising import classify_candidates
+from app.services.curriculum_snapshot import CurriculumSnapshot, SNAPSHOT_QUERIES, build_curriculum_snapshot
+from app.services.eligibility import REASONS, EligibilityIndex
+
+np = pytest.importorskip("numpy")
+
+
+def random_curriculum(rng, candidate_count):
+    """
+    Candidates 1..n; prerequisites among them plus some outside (1000+).
+    """
+    candidates = [
+        {"course_id": i, "min_credits_required": rng.choice([0, 0, 30, 60, 90])}
+        for i in range(1, candidate_count + 1)
+    ]
+    prereq_map = {}
+    for c in candidates:
+        pool = list(range(1, candidate_count + 1)) + [1000 + k for k in range(5)]
+        k = rng.choice([0, 0, 1, 2, 3])
+        prereqs = rng.sample(pool, min(k, len(pool)))
+        if prereqs:
+            prereq_map[c["course_id"]] = prereqs
+    return candidates, prereq_map
+
+
+def python_loop(candidates, prereq_map, passed, in_progress, earned):
+    snapshot = CurriculumSnapshot(curriculum_id=1, candidates=candidates, prereq_map=prereq_map)
+    return classify_candidates(snapshot, passed, in_progress, earned)
+
+
+def random_student(rng, candidate_count):
+    course_ids = list(range(1, candidate_count + 1)) + [1000 + k for k in range(5)] + [5000]
+    passed = {c for c in course_ids if rng.random() < 0.4}
+    in_progress = {c for c in course_ids if rng.random() < 0.1}
+    return passed, in_progress, rng.choice([0, 15, 30, 60, 89, 90, 140])
+
+
+def test_matches_python_loop_on_random_cases():
+    rng = random.Random(11)
+
+    for _ in range(2000):
+        candidates, prereq_map = random_curriculum(rng, rng.randint(0, 12))
+        index = EligibilityIndex(candidates, prereq_map)
+        passed, in_progress, earned = random_student(rng, len(candidates))
+
+        assert index.classify(passed, in_progress, earned) == python_loop(
+            candidates, prereq_map, passed, in_progress, earned
+        )
+
+
+def test_empty_candidates():
+    index = EligibilityIndex([], {})
+
+    assert index.classify({1}, set(), 30) == []
+    assert index.classify_codes(np.zeros((3, 0), dtype=bool), np.zeros((3, 0), dtype=bool), 0).shape == (3, 0)
+
+
+def test_candidates_without_prerequisites():
+    candidates = [{"course_id": 1, "min_credits_required": 0}, {"course_id": 2, "min_credits_required": 60}]
+    index = EligibilityIndex(candidates, {})
+
+    assert index.classify(set(), set(), 30) == ["eligible", "credit"]
+    assert index.classify({2}, set(), 30) == ["eligible", "completed"]
+
+
+def test_prerequisite_outside_the_candidates():
+    candidates = [{"course_id": 1, "min_credits_required": 0}]
+    index = EligibilityIndex(candidates, {1: [500]})
+
+    assert index.classify(set(), set(), 0) == ["prereq"]
+    assert index.classify({500}, set(), 0) == ["eligible"]
+    # ids the index does not know are ignored
+    assert index.classify({500, 9999}, {9998}, 0) == ["eligible"]
+
+
+def test_batched_masks_match_per_student_calls():
+    rng = random.Random(7)
+    candidates, prereq_map = random_curriculum(rng, 10)
+    index = EligibilityIndex(candidates, prereq_map)
+    students = [random_student(rng, 10) for _ in range(24)]
+
+    passed = np.stack([index.mask(p) for p, _, _ in students]).reshape(4, 6, index.size)
+    in_progress = np.stack([index.mask(i) for _, i, _ in students]).reshape(4, 6, index.size)
+    earned = np.array([e for _, _, e in students]).reshape(4, 6)
+
+    codes = index.classify_codes(passed, in_progress, earned).reshape(24, -1)
+
+    for row, (p, i, e) in zip(codes.tolist(), students):
+        assert [REASONS[c] for c in row] == python_loop(candidates, prereq_map, p, i, e)
+
+
+def test_snapshot_without_numpy_uses_the_python_loop(monkeypatch):
+    rows = {name: [] for name in SNAPSHOT_QUERIES}
+    rows["candidates"] = [
+        {
+            "course_code": f"CSX{i}", "course_code_id": i, "course_id": i, "course_name": f"C{i}",
+            "credits": 3, "subcategory_id": 1, "subcategory_name": "Core", "min_credits_required": 0,
+        }
+        for i in (1, 2, 3)
+    ]
+    rows["prerequisites"] = [{"course_id": 2, "prerequisite_course_id": 1}, {"course_id": 3, "prerequisite_course_id": 2}]
+
+    students = [set(), {1}, {1, 2}]
+
+    monkeypatch.setattr(curriculum_snapshot, "ELIGIBILITY_ENGINE", "numpy")
+    with_index = build_curriculum_snapshot(1, rows)
+    assert with_index.eligibility_index is not None
+    expected = [classify_candidates(with_index, passed, set(), 0) for passed in students]
+
+    monkeypatch.setattr(eligibility, "np", None)
+    without_numpy = build_curriculum_snapshot(1, rows)
+
+    assert without_numpy.eligibility_index is None
+    assert [classify_candidates(without_numpy, passed, set(), 0) for passed in students] == expected
+    assert expected == [["eligible", "prereq", "prereq"], ["completed", "eligible", "prereq"], ["completed", "completed", "eligible"]]
@@ -0,0 +1,59 @@
+# tests/test_grade_ranks.py
+"""
+grade_is_passing() (sql.sql) must agree with grading.is_passing.
+
+Needs a database with the database.sql + sql.sql schema:
+
+    DATABASE_URL=postgresql+psycopg2://... python -m pytest tests
+"""
+
+import os
+
+import pytest
+
+if os.getenv("TEST_DATABASE_PLACEHOLDER"):
+    pytest.skip("DATABASE_URL is not set", allow_module_level=True)
+
+from sqlalchemy.exc import OperationalError
+
+from app.db import SessionLocal
+from app.services.grade_ranks import (
+    GRADE_PAIRS_SQL,
+    check_grade_rank_consistency,
+    grade_check_values,
+)
+from app.services.grading import is_passing
+
+
+@pytest.fixture(scope="module")
+def db():
+    session = SessionLocal()
+    try:
+        session.execute(GRADE_PAIRS_SQL, {"student": ["A"], "required": ["D"]})
+    except OperationalError as e:
+        session.close()
+        pytest.skip(f"database not reachable: {e}")
+    yield session
+    session.close()
+
+
+def test_every_grade_pair_matches_is_passing(db):
+    values = grade_check_values()
+    student = [s for s in values for _ in values]
+    required = [r for _ in values for r in values]
+
+    rows = db.execute(GRADE_PAIRS_SQL, {"student": student, "required": required}).mappings().all()
+
+    assert len(rows) == len(values) ** 2
+    mismatches = [
+        (r["student_grade"], r["required_grade"], r["passing"])
+        for r in rows
+        if bool(r["passing"]) != is_passing(r["student_grade"], r["required_grade"])
+    ]
+    assert mismatches == []
+
+
+def test_session_aggregates_match_python(db):
+    result = check_grade_rank_consistency(db, sample_sessions=50)
+
+    assert result["mismatches"] == []
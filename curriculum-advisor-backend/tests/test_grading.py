@@ -0,0 +1,92 @@
+# tests/test_grading.py
+"""
+Python grade ranks vs the grade_ranks rows seeded in sql.sql (pure, no
+database: the INSERT is parsed). test_grade_ranks.py runs the same check
+through grade_is_passing() when a database is available.
+"""
+
+import re
+from pathlib import Path
+
+import pytest
+
+from app.services.grade_ranks import grade_check_values
+from app.services.grading import GRADE_RANK, SPECIAL_FAIL, SPECIAL_PASS, is_passing, normalize_grade
+
+SQL_PATH = Path(__file__).resolve().parents[2] / "sql.sql"
+
+ROW_PATTERN = re.compile(r"\('([^']+)',\s*(NULL|\d+),\s*(TRUE|FALSE),\s*(TRUE|FALSE)\)")
+
+
+@pytest.fixture(scope="module")
+def sql_grade_ranks():
+    if not SQL_PATH.exists():
+        pytest.skip(f"{SQL_PATH} not found")
+    sql = SQL_PATH.read_text(encoding="utf-8")
+    insert = sql[sql.index("INSERT INTO grade_ranks"):]
+    insert = insert[:insert.index(";")]
+    return {
+        grade: (None if rank == "NULL" else int(rank), always_pass == "TRUE", always_fail == "TRUE")
+        for grade, rank, always_pass, always_fail in ROW_PATTERN.findall(insert)
+    }
+
+
+def sql_is_passing(ranks, student_grade, required_grade):
+    """
+    grade_is_passing() from sql.sql, over the parsed rows.
+    """
+    sg = ranks.get(normalize_grade(student_grade))
+    rg = ranks.get(normalize_grade(required_grade))
+    if sg and sg[1]:
+        return True
+    if sg and sg[2]:
+        return False
+    if sg is None or sg[0] is None:
+        return False
+    required_rank = rg[0] if rg and rg[0] is not None else ranks["D"][0]
+    return sg[0] >= required_rank
+
+
+def test_letter_grades_are_strictly_ordered():
+    order = ["A", "A-", "B+", "B", "B-", "C+", "C", "C-", "D+", "D", "F"]
+
+    assert list(GRADE_RANK) == order
+    assert [GRADE_RANK[g] for g in order] == sorted(GRADE_RANK.values(), reverse=True)
+    assert len(set(GRADE_RANK.values())) == len(order)
+
+
+def test_sql_rows_match_python(sql_grade_ranks):
+    expected = {g: (rank, False, False) for g, rank in GRADE_RANK.items()}
+    expected.update({g: (None, True, False) for g in SPECIAL_PASS})
+    expected.update({g: (None, False, True) for g in SPECIAL_FAIL})
+
+    assert sql_grade_ranks == expected
+
+
+def test_every_grade_pair_matches(sql_grade_ranks):
+    values = grade_check_values()
+
+    mismatches = [
+        (s, r)
+        for s in values
+        for r in values
+        if sql_is_passing(sql_grade_ranks, s, r) != is_passing(s, r)
+    ]
+
+    assert mismatches == []
+
+
+@pytest.mark.parametrize("student, required, passing", [
+    ("C", "C", True),
+    ("C-", "C", False),
+    (" b+ ", "c", True),
+    ("D", "", True),
+    ("F", "X", False),
+    ("TR", "A", True),
+    ("S", "A", True),
+    ("IP", "D", False),
+    ("W", "F", False),
+    ("E", "D", False),
+])
+def test_is_passing(student, required, passing):
+    assert is_passing(student, required) is passing
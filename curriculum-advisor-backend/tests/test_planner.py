@@ -0,0 +1,122 @@
+# tests/test_planner.py
+"""
+simulate_graduation_roadmap on small in-memory curricula (pure, no
+database).
+"""
+
+from app.services.curriculum_snapshot import SNAPSHOT_QUERIES, build_curriculum_snapshot
+from app.services.planner import simulate_graduation_roadmap
+from app.services.seminars import SeminarProgress
+
+
+def candidate(course_id, code, credits=3):
+    return {
+        "course_code": code,
+        "course_code_id": course_id,
+        "course_id": course_id,
+        "course_name": code,
+        "credits": credits,
+        "subcategory_id": 1,
+        "subcategory_name": "Core",
+        "min_credits_required": 0,
+    }
+
+
+def snapshot(total, required_by_category, candidates=(), prerequisites=()):
+    rows = {name: [] for name in SNAPSHOT_QUERIES}
+    rows["curriculum"] = [{"total_required_credits": total}]
+    rows["required_by_category"] = [
+        {"main_category": cat, "required_credits": credits} for cat, credits in required_by_category.items()
+    ]
+    rows["candidates"] = list(candidates)
+    rows["prerequisites"] = [{"course_id": c, "prerequisite_course_id": p} for c, p in prerequisites]
+    rows["subcategory_links"] = [
+        {"course_code_id": c["course_code_id"], "subcategory_id": 1, "main_category": "Specialized"} for c in candidates
+    ] + [{"course_code_id": 50, "subcategory_id": 5, "main_category": "Free Electives"}]
+    return build_curriculum_snapshot(1, rows)
+
+
+def roadmap(snap, attempts=(), seminars=None, **kwargs):
+    return simulate_graduation_roadmap(
+        session_id=1,
+        snapshot=snap,
+        attempts=list(attempts),
+        chosen_group_id=None,
+        seminar_progress=seminars or SeminarProgress(),
+        **kwargs
+    )
+
+
+def codes(term):
+    return [c["course_code"] for c in term["courses"]]
+
+
+def test_reaches_graduation_with_ge_and_fe_slots():
+    snap = snapshot(12, {"Specialized": 6, "General Education": 3, "Free Electives": 3},
+                    [candidate(1, "CSX1001"), candidate(2, "CSX1002")])
+
+    result = roadmap(snap)
+
+    assert result["status"] == "GRADUATION_REACHED"
+    assert result["terms_needed"] == 1
+    assert codes(result["terms"][0]) == ["CSX1001", "CSX1002", "GE", "FE"]
+    assert result["projected_earned_credits"] == 12
+
+
+def test_prerequisites_unlock_the_next_term():
+    snap = snapshot(6, {"Specialized": 6}, [candidate(1, "CSX1001"), candidate(2, "CSX2001")], [(2, 1)])
+
+    result = roadmap(snap)
+
+    assert result["status"] == "GRADUATION_REACHED"
+    assert [codes(t) for t in result["terms"]] == [["CSX1001"], ["CSX2001"]]
+
+
+def test_incomplete_within_max_terms():
+    snap = snapshot(6, {"Specialized": 6}, [candidate(1, "CSX1001"), candidate(2, "CSX2001")], [(2, 1)])
+
+    result = roadmap(snap, max_terms=1)
+
+    assert result["status"] == "INCOMPLETE"
+    assert result["terms_needed"] is None
+    assert result["notes"] == ["Graduation not reached within 1 terms."]
+
+
+def test_stuck_when_nothing_can_be_planned():
+    # the only specialized course needs a prerequisite nobody can take
+    snap = snapshot(3, {"Specialized": 3}, [candidate(2, "CSX2001")], [(2, 99)])
+    passed_elsewhere = {
+        "course_id": 50, "course_code_id": 50, "grade": "A", "credits": 3, "is_ethics_seminar": False,
+    }
+
+    result = roadmap(snap, [passed_elsewhere])
+
+    assert result["status"] == "STUCK"
+    assert result["terms"] == []
+    assert "No further courses can be planned" in result["notes"][0]
+
+
+def test_free_elective_fill_reaches_the_credit_total():
+    snap = snapshot(12, {})
+
+    result = roadmap(snap, max_credits=9)
+
+    assert result["status"] == "GRADUATION_REACHED"
+    assert [(codes(t), t["total_credits"]) for t in result["terms"]] == [(["FE"], 9), (["FE"], 3)]
+
+
+def test_one_seminar_per_term():
+    seminars = SeminarProgress(
+        seminars=[
+            {"course_id": 70, "course_code": "BG14030", "course_name": "Seminar I", "credits": 0},
+            {"course_id": 71, "course_code": "BG14031", "course_name": "Seminar II", "credits": 0},
+            {"course_id": 72, "course_code": "BG14032", "course_name": "Seminar III", "credits": 0},
+        ],
+        required_total=3,
+        in_progress_codes={"BG14030"},
+    )
+
+    result = roadmap(snapshot(0, {}), seminars=seminars)
+
+    assert result["status"] == "GRADUATION_REACHED"
+    assert [codes(t) for t in result["terms"]] == [["BG14031"], ["BG14032"]]
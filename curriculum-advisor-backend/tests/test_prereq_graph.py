@@ -0,0 +1,77 @@
+# tests/test_prereq_graph.py
+"""
+PrerequisiteGraph and the snapshot builder on a prerequisite cycle (pure,
+no database).
+"""
+
+from app.services.advising import classify_candidates
+from app.services.curriculum_snapshot import SNAPSHOT_QUERIES, build_curriculum_snapshot
+from app.services.prereq_graph import CYCLIC_RANK, PrerequisiteGraph
+
+
+def candidate(course_id, code):
+    return {
+        "course_code": code,
+        "course_code_id": course_id * 10,
+        "course_id": course_id,
+        "course_name": code,
+        "credits": 3,
+        "subcategory_id": 1,
+        "subcategory_name": "Core",
+        "min_credits_required": 0,
+    }
+
+
+def snapshot_rows(candidates, prerequisites):
+    rows = {name: [] for name in SNAPSHOT_QUERIES}
+    rows["candidates"] = candidates
+    rows["prerequisites"] = [
+        {"course_id": c, "prerequisite_course_id": p} for c, p in prerequisites
+    ]
+    return rows
+
+
+def test_chain_ranks_and_closure():
+    graph = PrerequisiteGraph({2: [1], 3: [2]})
+
+    assert graph.topological_order == [1, 2, 3]
+    assert graph.ancestors[3] == {1, 2}
+    assert graph.descendants[1] == {2, 3}
+    assert graph.rank(1) == (2, 2)
+    assert graph.rank(3) == (0, 0)
+    assert graph.cyclic == frozenset()
+
+
+def test_cycle_is_marked_not_raised(caplog):
+    # 2 <-> 3 is a cycle, 4 waits on it, 1 -> 5 is fine
+    graph = PrerequisiteGraph({2: [3], 3: [2], 4: [3], 5: [1]})
+
+    assert graph.cyclic == {2, 3, 4}
+    assert graph.rank(2) == CYCLIC_RANK
+    assert graph.rank(4) == CYCLIC_RANK
+    assert graph.rank(1) == (1, 1)
+    assert "Prerequisite cycle" in caplog.text
+
+
+def test_snapshot_loads_with_a_cycle():
+    candidates = [candidate(1, "CSX1001"), candidate(2, "CSX2001"), candidate(3, "CSX3001")]
+    # 2 <-> 3 cycle inside the curriculum, 90 <-> 91 in another one
+    prerequisites = [(2, 3), (3, 2), (90, 91), (91, 90), (2, 1)]
+
+    snapshot = build_curriculum_snapshot(1, snapshot_rows(candidates, prerequisites))
+
+    assert set(snapshot.prereq_map) == {2, 3}
+    assert snapshot.prereq_graph.cyclic == {2, 3}
+    assert snapshot.course_rank_by_code["CSX2001"] == CYCLIC_RANK
+    assert snapshot.course_rank_by_code["CSX1001"] > CYCLIC_RANK
+    assert classify_candidates(snapshot, {1}, set(), 0) == ["completed", "prereq", "prereq"]
+
+
+def test_cycle_outside_the_curriculum_is_ignored():
+    candidates = [candidate(1, "CSX1001"), candidate(2, "CSX2001")]
+    prerequisites = [(2, 1), (90, 91), (91, 90)]
+
+    snapshot = build_curriculum_snapshot(1, snapshot_rows(candidates, prerequisites))
+
+    assert snapshot.prereq_graph.cyclic == frozenset()
+    assert snapshot.course_rank_by_code == {"CSX1001": (1, 1), "CSX2001": (0, 0)}
@@ -0,0 +1,95 @@
+# tests/test_progress_delta.py
+"""
+apply_progress_delta must equal a full summarize_session_progress
+recompute (pure, no database).
+"""
+
+from types import SimpleNamespace
+
+from app.services.curriculum_snapshot import SNAPSHOT_QUERIES, build_curriculum_snapshot
+from app.services.progress_summary import apply_progress_delta, summarize_session_progress
+from app.services.transcript import FREE_ELECTIVE_CODE, unknown_course_codes
+
+# course_code_id -> (course_id, credits, is_ethics_seminar, subcategory, main category)
+COURSES = {
+    11: (1, 3, False, 1, "Specialized"),
+    12: (2, 3, False, 1, "Specialized"),
+    13: (3, 4, False, 2, "General Education"),
+    14: (4, 0, True, None, None),
+    15: (5, 3, False, 3, "Free Electives"),  # FREE_ELECTIVE
+}
+
+
+def snapshot():
+    rows = {name: [] for name in SNAPSHOT_QUERIES}
+    rows["min_grades"] = [{"course_id": 2, "required_grade": "C"}]
+    rows["subcategory_links"] = [
+        {"course_code_id": ccid, "subcategory_id": sub, "main_category": main}
+        for ccid, (_, _, _, sub, main) in COURSES.items()
+        if sub is not None
+    ]
+    return build_curriculum_snapshot(1, rows)
+
+
+def attempt(course_code_id, grade):
+    course_id, credits, seminar, _, _ = COURSES[course_code_id]
+    return {
+        "course_code_id": course_code_id,
+        "course_id": course_id,
+        "credits": credits,
+        "is_ethics_seminar": seminar,
+        "grade": grade,
+    }
+
+
+TRANSCRIPT = [attempt(11, "B"), attempt(12, "C+"), attempt(13, "A")]
+
+
+def check_delta(before_rows, removed, added):
+    snap = snapshot()
+    after_rows = [r for r in before_rows if r not in removed] + added
+
+    summary = apply_progress_delta(snap, summarize_session_progress(snap, before_rows), removed, added)
+
+    assert summary == summarize_session_progress(snap, after_rows)
+
+
+def test_grade_change():
+    check_delta(TRANSCRIPT, [TRANSCRIPT[0]], [attempt(11, "A")])
+
+
+def test_removal():
+    check_delta(TRANSCRIPT, [TRANSCRIPT[2]], [])
+
+
+def test_pass_to_fail():
+    # C+ passes the C minimum of course 2, D does not
+    check_delta(TRANSCRIPT, [TRANSCRIPT[1]], [attempt(12, "D")])
+
+
+def test_unknown_code_becomes_free_elective():
+    check_delta(TRANSCRIPT, [], [attempt(15, "B")])
+
+
+def test_several_changes_at_once():
+    check_delta(TRANSCRIPT, [TRANSCRIPT[0], TRANSCRIPT[1]], [attempt(11, "F"), attempt(12, "B")])
+
+
+def test_removing_everything():
+    check_delta(TRANSCRIPT, list(TRANSCRIPT), [])
+
+
+def test_seminar_attempt_falls_back_to_a_recompute():
+    snap = snapshot()
+    summary = summarize_session_progress(snap, TRANSCRIPT)
+
+    assert apply_progress_delta(snap, summary, [], [attempt(14, "S")]) is None
+    assert apply_progress_delta(snap, summary, [attempt(14, "S")], []) is None
+
+
+def test_unknown_course_codes():
+    lookup = {"CSX1001": {}, FREE_ELECTIVE_CODE: {}}
+    rows = [SimpleNamespace(course_code=code) for code in ("CSX1001", "ABC123", "XYZ999", "ABC123")]
+
+    assert unknown_course_codes(rows, lookup) == ["ABC123", "XYZ999"]
+    assert unknown_course_codes(rows[:2], lookup) == ["ABC123"]
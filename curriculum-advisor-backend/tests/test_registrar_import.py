@@ -0,0 +1,110 @@
+# tests/test_registrar_import.py
+"""
+Registrar import parsing and term ordering (pure, no database: nothing
+is flushed).
+"""
+
+import pytest
+
+from app.services.registrar_import import RecordParser, RegistrarImport
+from app.services.transcript import term_rank
+
+
+def feed_all(parser, lines):
+    return [parser.feed(line) for line in lines]
+
+
+def test_csv_header_and_rows():
+    parser = RecordParser("csv")
+
+    results = feed_all(parser, [
+        "student_id_number, course_code ,grade,term\r\n",
+        "6530035,CSX3007,B+,1/2025\n",
+        "\n",
+        '6530035,"CSX3009",A,\n',
+    ])
+
+    assert [(n, err) for n, _, err in results] == [(1, None), (2, None), (3, None), (4, None)]
+    assert results[0][1] is None and results[2][1] is None
+    first, second = results[1][1], results[3][1]
+    assert (first.student_id_number, first.course_code, first.grade, first.term) == (6530035, "CSX3007", "B+", "1/2025")
+    assert (second.course_code, second.term) == ("CSX3009", None)
+
+
+def test_csv_without_term_column():
+    parser = RecordParser("csv")
+
+    _, row, error = feed_all(parser, ["student_id_number,course_code,grade", "1,CSX1001,A"])[1]
+
+    assert error is None and row.term is None
+
+
+def test_csv_bad_rows():
+    parser = RecordParser("csv")
+
+    results = feed_all(parser, [
+        "student_id_number,course_code,grade,term",
+        "1,CSX1001,A",
+        "abc,CSX1001,A,1/2025",
+    ])
+
+    assert results[1][2] == "Expected 4 columns, got 3"
+    assert results[2][1] is None and "student_id_number" in results[2][2]
+
+
+def test_ndjson_rows_and_errors():
+    parser = RecordParser("ndjson")
+
+    results = feed_all(parser, [
+        '{"student_id_number": 1, "course_code": "CSX1001", "grade": "A", "term": "2/2024"}',
+        "[1, 2]",
+        "{not json",
+        '{"student_id_number": 1, "grade": "A"}',
+    ])
+
+    assert results[0][1].term == "2/2024" and results[0][2] is None
+    assert results[1][2] == "Expected a JSON object"
+    assert results[2][2].startswith("Invalid JSON")
+    assert "course_code" in results[3][2]
+
+
+def test_unknown_format():
+    with pytest.raises(ValueError):
+        RecordParser("xml")
+
+
+def test_bad_rows_are_counted_and_good_rows_buffered():
+    importer = RegistrarImport("ndjson", chunk_size=2)
+
+    full = importer.feed_lines([
+        '{"student_id_number": 1, "course_code": "CSX1001", "grade": "A"}',
+        "",
+        "{bad",
+        '{"student_id_number": 2, "course_code": "CSX1001", "grade": "B"}',
+    ])
+
+    assert full is True
+    assert [line for line, _ in importer.pending] == [1, 4]
+    report = importer.report.as_dict()
+    assert (report["rows_read"], report["rows_failed"], report["rows_imported"]) == (3, 1, 0)
+    assert report["errors"][0]["line"] == 3
+
+
+@pytest.mark.parametrize("term, rank", [
+    ("1/2025", 202501),
+    (" 2/2024\n", 202402),
+    ("3/2024", 202403),
+    ("2025/1", None),
+    ("1/25", None),
+    ("x/2025", None),
+    ("", None),
+    (None, None),
+])
+def test_term_rank(term, rank):
+    assert term_rank(term) == rank
+
+
+def test_term_rank_orders_terms():
+    terms = ["1/2025", "2/2023", "3/2024", "1/2024"]
+
+    assert sorted(terms, key=term_rank) == ["2/2023", "1/2024", "3/2024", "1/2025"]
@@ -0,0 +1,120 @@
+# tests/test_transcript_delta.py
+"""
+apply_transcript_delta against a full recompute, on a real session.
+Every test rolls back. Needs a database with the database.sql + sql.sql
+schema and at least one session with attempts (see test_grade_ranks.py).
+"""
+
+import os
+
+import pytest
+
+if os.getenv("TEST_DATABASE_PLACEHOLDER"):
+    pytest.skip("DATABASE_URL is not set", allow_module_level=True)
+
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+
+from app.db import SessionLocal
+from app.schemas import TranscriptRow
+from app.services.curriculum_snapshot import get_curriculum_snapshot
+from app.services.progress_summary import summarize_session_progress
+from app.services.transcript import apply_transcript_delta, load_session_attempts
+
+BUSIEST_SESSION_SQL = text("""
+    SELECT a.session_id, s.curriculum_id
+    FROM session_course_attempts a
+    JOIN advising_sessions s ON s.session_id = a.session_id
+    GROUP BY a.session_id, s.curriculum_id
+    ORDER BY COUNT(*) DESC, a.session_id
+    LIMIT 1
+""")
+
+STORED_STATE_SQL = text("""
+    SELECT s.earned_credits AS session_earned, p.earned_credits, p.earned_by_category,
+           p.earned_by_subcategory, p.seminars_completed,
+           p.transcript_version = s.transcript_version AS fresh
+    FROM advising_sessions s
+    JOIN session_progress_summary p ON p.session_id = s.session_id
+    WHERE s.session_id = :sid
+""")
+
+
+@pytest.fixture
+def db():
+    session = SessionLocal()
+    try:
+        row = session.execute(BUSIEST_SESSION_SQL).mappings().first()
+    except OperationalError as e:
+        session.close()
+        pytest.skip(f"database not reachable: {e}")
+    if row is None:
+        session.close()
+        pytest.skip("no session with attempts")
+    session.info["sid"], session.info["cid"] = int(row["session_id"]), int(row["curriculum_id"])
+    yield session
+    session.rollback()
+    session.close()
+
+
+def assert_matches_recompute(db):
+    sid = db.info["sid"]
+    attempts = load_session_attempts(sid, db)
+    expected = summarize_session_progress(get_curriculum_snapshot(db.info["cid"], db), attempts)
+    stored = db.execute(STORED_STATE_SQL, {"sid": sid}).mappings().first()
+
+    assert stored["fresh"]
+    assert stored["session_earned"] == sum(int(a["credits_earned"]) for a in attempts)
+    assert {key: stored[key] for key in expected} == expected
+
+
+def non_seminar_attempts(db):
+    return [a for a in load_session_attempts(db.info["sid"], db) if not a["is_ethics_seminar"]]
+
+
+def test_grade_change_and_pass_to_fail(db):
+    first, second = non_seminar_attempts(db)[:2]
+
+    result = apply_transcript_delta(db.info["sid"], [
+        TranscriptRow(course_code=first["course_code"], grade="A", term="1/2025"),
+        TranscriptRow(course_code=second["course_code"], grade="F", term="1/2025"),
+    ], None, db)
+
+    assert "error" not in result
+    assert_matches_recompute(db)
+
+
+def test_removal(db):
+    course = non_seminar_attempts(db)[0]
+
+    result = apply_transcript_delta(db.info["sid"], [], [course["course_code"]], db)
+
+    assert result["rows_deleted"] == 1
+    assert_matches_recompute(db)
+
+
+def test_unknown_code_becomes_free_elective(db):
+    result = apply_transcript_delta(db.info["sid"], [TranscriptRow(course_code="ZZZ9001", grade="B", term="1/2025")], None, db)
+
+    assert "error" not in result
+    assert_matches_recompute(db)
+
+
+def test_two_unknown_codes_are_rejected(db):
+    result = apply_transcript_delta(db.info["sid"], [
+        TranscriptRow(course_code="ZZZ9001", grade="B", term="1/2025"),
+        TranscriptRow(course_code="ZZZ9002", grade="A", term="1/2025"),
+    ], None, db)
+
+    assert result["unknown_courses"] == ["ZZZ9001", "ZZZ9002"]
+
+
+def test_same_delta_twice_is_a_no_op(db):
+    course = non_seminar_attempts(db)[0]
+    rows = [TranscriptRow(course_code=course["course_code"], grade="B+", term="1/2025")]
+
+    apply_transcript_delta(db.info["sid"], rows, None, db)
+    again = apply_transcript_delta(db.info["sid"], rows, None, db)
+
+    assert (again["rows_upserted"], again["rows_unchanged"]) == (0, 1)
+    assert_matches_recompute(db)
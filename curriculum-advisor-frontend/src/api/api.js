@@ -35,9 +35,14 @@ export async function uploadTranscript(sessionId, rows) {
   return response.json();
 }
 
-export async function getRecommendations(sessionId, payload) {
+// minVersion: transcript_version returned by the last upload. Reads go to
+// a replica, which falls back to the primary until it has caught up.
+const minVersionQuery = (minVersion) =>
+  minVersion ? `?min_version=${minVersion}` : "";
+
+export async function getRecommendations(sessionId, payload, minVersion) {
   const response = await fetch(
-    `http://127.0.0.1:8000/advising-session/${sessionId}/recommendations`,
+    `http://127.0.0.1:8000/advising-session/${sessionId}/recommendations${minVersionQuery(minVersion)}`,
     {
       method: "POST",
       headers: { "Content-Type": "application/json" },
@@ -52,9 +57,27 @@ export async function getRecommendations(sessionId, payload) {
   return response.json();
 }
 
-export const getGraduationAudit = async (sessionId) => {
+// Recommendations + graduation audit in one request
+export async function getDashboard(sessionId, payload, minVersion) {
+  const response = await fetch(
+    `http://127.0.0.1:8000/advising-session/${sessionId}/dashboard${minVersionQuery(minVersion)}`,
+    {
+      method: "POST",
+      headers: { "Content-Type": "application/json" },
+      body: JSON.stringify(payload),
+    }
+  );
+
+  if (!response.ok) {
+    throw new Error("Failed to get dashboard");
+  }
+
+  return response.json();
+}
+
+export const getGraduationAudit = async (sessionId, minVersion) => {
   const res = await fetch(
-    `http://127.0.0.1:8000/advising-session/${sessionId}/graduation-audit`
+    `http://127.0.0.1:8000/advising-session/${sessionId}/graduation-audit${minVersionQuery(minVersion)}`
   );
 
   if (!res.ok) {
@@ -65,10 +88,21 @@ export const getGraduationAudit = async (sessionId) => {
 };
 
 // ----------------------------
-// Admin - Get Courses
+// Admin - Get Courses (one keyset page)
 // ----------------------------
-export const getAllCourses = async () => {
-  const res = await fetch("http://127.0.0.1:8000/admin/courses");
+// params: { after, limit, active, seminar, q }; returns
+// { courses, next_after, catalog_version }. The server sends an ETag with
+// Cache-Control: no-cache, so the browser revalidates and an unchanged
+// catalog comes back as 304 from its cache.
+export const getCourses = async (params = {}) => {
+  const query = new URLSearchParams();
+  Object.entries(params).forEach(([key, value]) => {
+    if (value !== undefined && value !== null && value !== "") {
+      query.set(key, value);
+    }
+  });
+
+  const res = await fetch(`http://127.0.0.1:8000/admin/courses?${query}`);
 
   if (!res.ok) throw new Error("Failed to fetch courses");
 
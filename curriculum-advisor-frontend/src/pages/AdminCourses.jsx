@@ -1,12 +1,16 @@
 import { useEffect, useState } from "react";
 import {
-  getAllCourses,
+  getCourses,
   createCourse,
   updateCourse,
 } from "../api/api";
 
+const PAGE_SIZE = 100;
+
 function AdminCourses() {
   const [courses, setCourses] = useState([]);
+  const [nextAfter, setNextAfter] = useState(null);
+  const [filters, setFilters] = useState({ q: "", active: "" });
   const [form, setForm] = useState({
     course_name: "",
     credits: 3,
@@ -15,14 +19,26 @@ function AdminCourses() {
   });
   const [editingId, setEditingId] = useState(null);
 
+  // first page for the current filters
   const loadCourses = async () => {
-    const data = await getAllCourses();
-    setCourses(data);
+    const data = await getCourses({ ...filters, limit: PAGE_SIZE });
+    setCourses(data.courses);
+    setNextAfter(data.next_after);
+  };
+
+  const loadMore = async () => {
+    const data = await getCourses({
+      ...filters,
+      limit: PAGE_SIZE,
+      after: nextAfter,
+    });
+    setCourses([...courses, ...data.courses]);
+    setNextAfter(data.next_after);
   };
 
   useEffect(() => {
     loadCourses();
-  }, []);
+  }, [filters]);
 
   const handleSubmit = async () => {
     if (!form.course_name) return;
@@ -127,6 +143,26 @@ function AdminCourses() {
       <div style={styles.card}>
         <h2 style={styles.sectionTitle}>All Courses</h2>
 
+        <div style={styles.filterGroup}>
+          <input
+            style={styles.input}
+            placeholder="Filter by name or course code prefix"
+            value={filters.q}
+            onChange={(e) => setFilters({ ...filters, q: e.target.value })}
+          />
+          <select
+            style={styles.select}
+            value={filters.active}
+            onChange={(e) =>
+              setFilters({ ...filters, active: e.target.value })
+            }
+          >
+            <option value="">All</option>
+            <option value="true">Active</option>
+            <option value="false">Inactive</option>
+          </select>
+        </div>
+
         <div style={styles.tableWrapper}>
           <table style={styles.table}>
             <thead>
@@ -170,6 +206,12 @@ function AdminCourses() {
             </tbody>
           </table>
         </div>
+
+        {nextAfter !== null && (
+          <button style={styles.loadMoreButton} onClick={loadMore}>
+            Load more
+          </button>
+        )}
       </div>
     </div>
   );
@@ -223,6 +265,19 @@ const styles = {
     fontSize: "14px",
   },
 
+  filterGroup: {
+    display: "flex",
+    gap: "12px",
+    marginBottom: "20px",
+  },
+
+  select: {
+    padding: "10px 12px",
+    borderRadius: "8px",
+    border: "1px solid #d1d5db",
+    fontSize: "14px",
+  },
+
   checkboxGroup: {
     display: "flex",
     gap: "20px",
@@ -273,6 +328,17 @@ const styles = {
     borderBottom: "1px solid #f1f5f9",
   },
 
+  loadMoreButton: {
+    marginTop: "20px",
+    padding: "8px 16px",
+    backgroundColor: "#f3f4f6",
+    color: "#111827",
+    border: "1px solid #e5e7eb",
+    borderRadius: "8px",
+    fontWeight: "500",
+    cursor: "pointer",
+  },
+
   editButton: {
     padding: "6px 12px",
     backgroundColor: "#e0e7ff",
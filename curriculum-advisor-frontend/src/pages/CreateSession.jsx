@@ -12,6 +12,7 @@ function CreateSession() {
       setLoading(true);
       const res = await createSession(studentId);
       localStorage.setItem("session_id", res.session_id);
+      localStorage.removeItem("transcript_version");
       window.location.href = "/upload";
     } catch (err) {
       console.error(err);
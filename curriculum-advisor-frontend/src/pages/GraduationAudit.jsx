@@ -8,7 +8,20 @@ function GraduationAudit() {
     const sessionId = localStorage.getItem("session_id");
     if (!sessionId) return;
 
-    getGraduationAudit(sessionId).then(setData);
+    // the copy stored by the upload page is shown right away, but the
+    // transcript may have changed since: always refetch and replace it
+    const stored = JSON.parse(localStorage.getItem("graduation_audit_result") || "null");
+    if (stored && String(stored.session_id) === sessionId) {
+      setData(stored);
+    }
+
+    const transcriptVersion = localStorage.getItem("transcript_version");
+    getGraduationAudit(sessionId, transcriptVersion).then((audit) => {
+      setData(audit);
+      if (!audit.error) {
+        localStorage.setItem("graduation_audit_result", JSON.stringify(audit));
+      }
+    });
   }, []);
 
   if (!data) {
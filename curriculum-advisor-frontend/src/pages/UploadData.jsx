@@ -1,7 +1,7 @@
 import { useState } from "react";
 import { useNavigate } from "react-router-dom";
 import * as XLSX from "xlsx";
-import { uploadTranscript, getRecommendations } from "../api/api";
+import { uploadTranscript, getDashboard } from "../api/api";
 
 function UploadData() {
   const navigate = useNavigate();
@@ -84,17 +84,27 @@ function UploadData() {
         throw new Error("Transcript file is required.");
 
       // Upload transcript
-      await uploadTranscript(sessionId, transcriptRows);
-
-      // Get recommendations
-      const result = await getRecommendations(sessionId, {
-        max_credits: 18,
-        offered_courses: offeredCourses,
-      });
+      const upload = await uploadTranscript(sessionId, transcriptRows);
+      localStorage.setItem("transcript_version", upload.transcript_version);
+
+      // Get recommendations + graduation audit (one data load), at least
+      // as new as the upload
+      const result = await getDashboard(
+        sessionId,
+        {
+          max_credits: 18,
+          offered_courses: offeredCourses,
+        },
+        upload.transcript_version
+      );
 
       localStorage.setItem(
         "recommendation_result",
-        JSON.stringify(result)
+        JSON.stringify(result.recommendations)
+      );
+      localStorage.setItem(
+        "graduation_audit_result",
+        JSON.stringify(result.graduation_audit)
       );
 
       navigate("/recommendations");
@@ -607,4 +607,140 @@ CREATE TABLE session_concentration_selection (
 
 
 CREATE INDEX idx_session_concentration_group_id
-  ON session_concentration_selection(group_id);
\ No newline at end of file
+  ON session_concentration_selection(group_id);
+
+-- Transcript version (recommendation result cache key)
+
+ALTER TABLE advising_sessions
+  ADD COLUMN transcript_version BIGINT NOT NULL DEFAULT 0;
+
+
+-- Per-session progress aggregates (written with the transcript)
+
+CREATE TABLE session_progress_summary (
+  session_id BIGINT PRIMARY KEY
+    REFERENCES advising_sessions(session_id)
+    ON DELETE CASCADE,
+
+  -- advising_sessions.transcript_version this row was computed from
+  transcript_version BIGINT NOT NULL DEFAULT 0,
+
+  earned_credits INT NOT NULL DEFAULT 0,
+
+  -- {"General Education": 30, ...}
+  earned_by_category JSONB NOT NULL DEFAULT '{}',
+
+  -- {"<subcategory_id>": 12, ...}
+  earned_by_subcategory JSONB NOT NULL DEFAULT '{}',
+
+  seminars_completed INT NOT NULL DEFAULT 0,
+
+  updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+
+
+-- Grade ranks (database-side mirror of app/services/grading.py)
+-- Keyed on TEXT: attempts store grade as TEXT and the transcript scale
+-- includes D+, which grade_enum does not.
+
+CREATE TABLE grade_ranks (
+  grade TEXT PRIMARY KEY,
+
+  -- GRADE_RANK; NULL for S / TR / W / IP
+  rank INT,
+
+  -- SPECIAL_PASS / SPECIAL_FAIL
+  always_pass BOOLEAN NOT NULL DEFAULT FALSE,
+  always_fail BOOLEAN NOT NULL DEFAULT FALSE
+);
+
+INSERT INTO grade_ranks (grade, rank, always_pass, always_fail) VALUES
+  ('A', 10, FALSE, FALSE),
+  ('A-', 9, FALSE, FALSE),
+  ('B+', 8, FALSE, FALSE),
+  ('B', 7, FALSE, FALSE),
+  ('B-', 6, FALSE, FALSE),
+  ('C+', 5, FALSE, FALSE),
+  ('C', 4, FALSE, FALSE),
+  ('C-', 3, FALSE, FALSE),
+  ('D+', 2, FALSE, FALSE),
+  ('D', 1, FALSE, FALSE),
+  ('F', 0, FALSE, FALSE),
+  ('S', NULL, TRUE, FALSE),
+  ('TR', NULL, TRUE, FALSE),
+  ('W', NULL, FALSE, TRUE),
+  ('IP', NULL, FALSE, TRUE);
+
+-- Same rules as grading.is_passing:
+-- S / TR pass, W / IP fail, unknown grades fail, unknown required grade = D
+CREATE OR REPLACE FUNCTION grade_is_passing(student_grade TEXT, required_grade TEXT)
+RETURNS BOOLEAN
+LANGUAGE SQL
+STABLE
+AS $$
+  SELECT CASE
+    WHEN sg.always_pass THEN TRUE
+    WHEN sg.always_fail THEN FALSE
+    WHEN sg.rank IS NULL THEN FALSE
+    ELSE sg.rank >= COALESCE(rg.rank, (SELECT rank FROM grade_ranks WHERE grade = 'D'))
+  END
+  FROM (SELECT 1) AS one
+  LEFT JOIN grade_ranks sg ON sg.grade = UPPER(BTRIM(student_grade, E' \t\r\n'))
+  LEFT JOIN grade_ranks rg ON rg.grade = UPPER(BTRIM(required_grade, E' \t\r\n')) AND rg.rank IS NOT NULL
+$$;
+
+
+-- Term offering catalog: which course codes run in a term ("1/2025", ...)
+-- Recommendations with a term only consider these candidates.
+
+CREATE TABLE term_offerings (
+  term TEXT NOT NULL,
+  course_code_id INTEGER NOT NULL REFERENCES course_codes(course_code_id) ON DELETE CASCADE,
+  PRIMARY KEY (term, course_code_id)
+);
+
+
+-- Course catalog version: bumped by every course create / update,
+-- used as the ETag of GET /admin/courses.
+
+CREATE TABLE course_catalog_version (
+  singleton BOOLEAN PRIMARY KEY DEFAULT TRUE CHECK (singleton),
+  version BIGINT NOT NULL DEFAULT 0
+);
+
+INSERT INTO course_catalog_version DEFAULT VALUES;
+
+-- /admin/courses prefix filters
+CREATE INDEX idx_courses_name_prefix
+  ON courses (LOWER(course_name) text_pattern_ops);
+
+CREATE INDEX idx_course_codes_course_id
+  ON course_codes(course_id);
+
+CREATE INDEX idx_course_codes_code_prefix
+  ON course_codes (course_code text_pattern_ops);
+
+
+-- Student ID ranges: no overlaps (a student ID maps to one curriculum).
+-- The exclusion constraint's GiST index also serves
+-- int8range(id_start, id_end, '[]') @> :student_id lookups.
+
+ALTER TABLE curriculum_id_ranges
+  ADD CONSTRAINT curriculum_id_ranges_no_overlap
+  EXCLUDE USING gist (int8range(id_start, id_end, '[]') WITH &&);
+
+
+-- Term ordering for attempt conflicts (same rule as transcript.term_rank):
+-- "<semester>/<year>" -> year * 100 + semester, anything else NULL.
+
+CREATE OR REPLACE FUNCTION term_rank(term TEXT)
+RETURNS INT
+LANGUAGE SQL
+IMMUTABLE
+AS $$
+  SELECT CASE
+    WHEN BTRIM(term, E' \t\r\n') ~ '^[0-9]+/[0-9]{4}$'
+    THEN SPLIT_PART(BTRIM(term, E' \t\r\n'), '/', 2)::INT * 100
+       + SPLIT_PART(BTRIM(term, E' \t\r\n'), '/', 1)::INT
+  END
+$$;